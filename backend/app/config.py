@@ -16,6 +16,22 @@ COVER_UPLOAD_ROOT = Path(
 )
 COVER_UPLOAD_ROOT.mkdir(parents=True, exist_ok=True)
 
+# Upload limits for images: cover images and section image assets (bytes)
+COVER_UPLOAD_MAX_BYTES = int(os.getenv("COVER_UPLOAD_MAX_BYTES", 25 * 1024 * 1024))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+# Resumable upload sessions untouched for this long are deleted
+UPLOAD_SESSION_TTL_SECONDS = float(os.getenv("UPLOAD_SESSION_TTL_SECONDS", 24 * 60 * 60))
+
+# Content-addressed image assets of all sections live in the upload root;
+# user ids cannot start with a dot, so the directory never clashes with one
+ASSET_ROOT = Path(
+    os.getenv("ASSET_DIR", COVER_UPLOAD_ROOT / ".assets")
+)
+ASSET_ROOT.mkdir(parents=True, exist_ok=True)
+
+# In-memory cache budget for decoded image assets
+ASSET_CACHE_MAX_BYTES = int(os.getenv("ASSET_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
 COVER_DOCX_ROOT = Path(
     os.getenv("COVER_DOCX_DIR", Path(tempfile.gettempdir()) / "cratool_cover_docx")
 )
@@ -56,6 +72,35 @@ FINAL_DOCX_ROOT = Path(
 )
 FINAL_DOCX_ROOT.mkdir(parents=True, exist_ok=True)
 
+# Maximum number of preview documents built concurrently (per process)
+PREVIEW_MAX_CONCURRENT_BUILDS = int(os.getenv("PREVIEW_MAX_CONCURRENT_BUILDS", 4))
+
+SBOM_UPLOAD_ROOT = Path(
+    os.getenv("SBOM_UPLOAD_DIR", Path(tempfile.gettempdir()) / "cratool_sbom_uploads")
+)
+SBOM_UPLOAD_ROOT.mkdir(parents=True, exist_ok=True)
+
+# Upload limit for SBOM files (bytes); files are parsed as a stream
+SBOM_UPLOAD_MAX_BYTES = int(os.getenv("SBOM_UPLOAD_MAX_BYTES", 200 * 1024 * 1024))
+
+CATALOGUE_UPLOAD_ROOT = Path(
+    os.getenv("CATALOGUE_UPLOAD_DIR", Path(tempfile.gettempdir()) / "cratool_catalogue_uploads")
+)
+CATALOGUE_UPLOAD_ROOT.mkdir(parents=True, exist_ok=True)
+
+# Upload limit for CC catalogue XML files (bytes); files are parsed as a stream
+CATALOGUE_UPLOAD_MAX_BYTES = int(os.getenv("CATALOGUE_UPLOAD_MAX_BYTES", 100 * 1024 * 1024))
+
+# Memory-mapped catalogue snapshot shared by all workers (unset reads the database)
+CATALOGUE_SNAPSHOT_PATH = Path(os.environ["CATALOGUE_SNAPSHOT_PATH"]) if os.getenv("CATALOGUE_SNAPSHOT_PATH") else None
+# How often a worker checks whether the snapshot file was replaced (seconds)
+CATALOGUE_SNAPSHOT_CHECK_SECONDS = float(os.getenv("CATALOGUE_SNAPSHOT_CHECK_SECONDS", 2))
+
+# Compiled HTML render plans kept for repeat conversions (0 disables the cache)
+HTML_FRAGMENT_CACHE_MAX_ENTRIES = int(os.getenv("HTML_FRAGMENT_CACHE_MAX_ENTRIES", 512))
+# Total serialized size of the cached render plans (bytes)
+HTML_FRAGMENT_CACHE_MAX_BYTES = int(os.getenv("HTML_FRAGMENT_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+
 
 # CORS configuration
 CORS_ORIGINS = os.getenv(
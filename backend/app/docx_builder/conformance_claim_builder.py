@@ -5,16 +5,14 @@ from docx import Document
 from docx.shared import Pt
 
 from .html_converter import append_html_to_document
+from .styles import add_heading
 
 
 def append_conformance_claim_section(document: Document, conformance_data: Any):
   """Append Section 3 (Conformance Claim) to the document."""
   document.add_page_break()
 
-  heading = document.add_paragraph()
-  run = heading.add_run("3. Conformance Claim")
-  run.font.size = Pt(20)
-  run.font.bold = True
+  heading = add_heading(document, "3. Conformance Claim", 1)
   heading.space_after = Pt(8)
 
   _add_standards_subsection(document, _get_nested(conformance_data, "standards_conformance"))
@@ -23,10 +21,7 @@ def append_conformance_claim_section(document: Document, conformance_data: Any):
 
 
 def _add_standards_subsection(document: Document, section_data: Any):
-  sub_heading = document.add_paragraph()
-  run = sub_heading.add_run("3.1 Standards Conformance")
-  run.font.size = Pt(18)
-  run.font.bold = True
+  sub_heading = add_heading(document, "3.1 Standards Conformance", 2)
   sub_heading.space_after = Pt(4)
 
   intro = document.add_paragraph("This product claims conformance to the following standards:")
@@ -95,10 +90,7 @@ def _render_other_checkbox(document: Document, include_other: bool, notes: str):
 
 
 def _add_regulatory_subsection(document: Document, html_content: Optional[str]):
-  heading = document.add_paragraph()
-  run = heading.add_run("3.2 Regulatory Conformance")
-  run.font.size = Pt(18)
-  run.font.bold = True
+  heading = add_heading(document, "3.2 Regulatory Conformance", 2)
   heading.space_before = Pt(10)
   heading.space_after = Pt(4)
 
@@ -113,10 +105,7 @@ def _add_regulatory_subsection(document: Document, html_content: Optional[str]):
 
 
 def _add_conformance_level_subsection(document: Document, html_content: Optional[str]):
-  heading = document.add_paragraph()
-  run = heading.add_run("3.3 Conformance Level")
-  run.font.size = Pt(18)
-  run.font.bold = True
+  heading = add_heading(document, "3.3 Conformance Level", 2)
   heading.space_before = Pt(10)
   heading.space_after = Pt(4)
 
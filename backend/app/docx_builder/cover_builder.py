@@ -8,11 +8,13 @@ from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from docx.shared import Mm, Pt
 
 from app.utils.formatters import format_cover_date
+from app.utils.image_variants import COVER_IMAGE_WIDTH_MM, get_cover_variant
 from .introduction_sections import IntroductionSectionsRenderer
 from .product_overview_builder import append_product_overview_section
 from .conformance_claim_builder import append_conformance_claim_section
 from .document_convention_builder import render_document_convention_to_document
 from .risk_management_builder import append_risk_management_section
+from .styles import register_styles
 
 COVER_HEADER_TEXT = "EN 40000-1-2-2025 Conformity Assessment"
 
@@ -35,7 +37,11 @@ def build_cover_document(
         product_identification_payload=getattr(payload, "product_identification", None),
         manufacturer_information_payload=getattr(payload, "manufacturer_information", None),
     )
-    append_product_overview_section(document, getattr(payload, "product_overview", None))
+    append_product_overview_section(
+        document,
+        getattr(payload, "product_overview", None),
+        getattr(payload, "user_id", None),
+    )
     append_conformance_claim_section(document, getattr(payload, "conformance_claim", None))
     
     # Add Document Convention section if present
@@ -83,6 +89,7 @@ def _create_a4_document() -> Document:
     section.bottom_margin = Mm(20)
     section.left_margin = Mm(25)
     section.right_margin = Mm(25)
+    register_styles(document)
     return document
 
 
@@ -137,10 +144,13 @@ class CoverDocumentRenderer:
     def _add_cover_image(self, image_file: Optional[Path]):
         if not image_file:
             return
+        # Embed the pre-sized print variant as-is, generating it for uploads
+        # that have none yet (falls back to the original)
+        image_file = get_cover_variant(image_file, "print")
         image_paragraph = self.document.add_paragraph()
         image_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
         run = image_paragraph.add_run()
-        run.add_picture(str(image_file), width=Mm(120))
+        run.add_picture(str(image_file), width=Mm(COVER_IMAGE_WIDTH_MM))
         image_paragraph.space_after = Pt(22)
 
     def _add_version_block(self, data: Any):
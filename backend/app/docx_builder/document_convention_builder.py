@@ -5,8 +5,13 @@ from typing import List, Optional, Sequence
 from docx import Document
 from docx.shared import Inches, Pt
 
+from .fragments import append_static
 from .html_converter import append_html_to_document
 from .section_builders import create_base_document
+from .styles import add_heading
+from .table_writer import append_bulk_table
+
+TERMINOLOGY_HEADERS = ["Term", "Definition", "Reference"]
 
 DEFAULT_TERMINOLOGY_ENTRIES = [
     {
@@ -87,26 +92,23 @@ def render_document_convention_to_document(
     if start_on_new_page:
         document.add_page_break()
     
-    heading = document.add_paragraph()
-    heading_run = heading.add_run("4. Document Conventions")
-    heading_run.font.size = Pt(20)
-    heading_run.font.bold = True
-    heading.space_after = Pt(8)
+    _append_heading(document, "4. Document Conventions", 1)
 
     _render_terminology_section(document, terminology_entries)
-    _render_evidence_notation_section(document, evidence_notation_html)
-    _render_requirement_notation_section(document, requirement_notation_html)
-    _render_assessment_verdicts_section(document, assessment_verdicts_html)
+    _render_html_subsection(document, "4.2 Evidence Notation", evidence_notation_html)
+    _render_html_subsection(document, "4.3 Requirement Notation", requirement_notation_html)
+    _render_html_subsection(document, "4.4 Assessment Verdicts", assessment_verdicts_html)
 
 
-def _render_terminology_section(document: Document, entries: Optional[Sequence[dict]]) -> None:
-    subheading = document.add_paragraph()
-    subheading_run = subheading.add_run("4.1 Terminology")
-    subheading_run.font.size = Pt(18)
-    subheading_run.font.bold = True
-    subheading.space_before = Pt(6)
-    subheading.space_after = Pt(6)
+def _append_heading(document: Document, text: str, level: int = 2) -> None:
+    append_static(
+        document,
+        ("document_convention.heading", text, level),
+        lambda target: add_heading(target, text, level),
+    )
+
 
+def _build_terminology_intro(document: Document) -> None:
     intro = document.add_paragraph(
         "All terms and definitions used in this report are consistent with:"
     )
@@ -119,62 +121,41 @@ def _render_terminology_section(document: Document, entries: Optional[Sequence[d
 
     document.add_paragraph()
 
-    table = document.add_table(rows=1, cols=3)
-    table.style = "Table Grid"
-
-    header_cells = table.rows[0].cells
-    for label, cell in zip(["Term", "Definition", "Reference"], header_cells):
-        paragraph = cell.paragraphs[0]
-        run = paragraph.add_run(label)
-        run.font.bold = True
-
-    normalized_entries = _normalize_terminology_entries(entries)
-    for entry in normalized_entries:
-        row_cells = table.add_row().cells
-        row_cells[0].text = entry["term"]
-        row_cells[1].text = entry["definition"]
-        row_cells[2].text = entry["reference"]
-
-    document.add_paragraph()
-
 
-def _render_evidence_notation_section(document: Document, html: Optional[str]) -> None:
-    heading = document.add_paragraph()
-    heading_run = heading.add_run("4.2 Evidence Notation")
-    heading_run.font.size = Pt(18)
-    heading_run.font.bold = True
-    heading.space_before = Pt(6)
-    heading.space_after = Pt(6)
+def _append_terminology_table(document: Document, entries: Sequence[dict]) -> None:
+    append_bulk_table(
+        document,
+        TERMINOLOGY_HEADERS,
+        ((entry["term"], entry["definition"], entry["reference"]) for entry in entries),
+    )
 
-    if html:
-        append_html_to_document(document, html)
 
+def _render_terminology_section(document: Document, entries: Optional[Sequence[dict]]) -> None:
+    _append_heading(document, "4.1 Terminology")
+    append_static(document, "document_convention.terminology_intro", _build_terminology_intro)
 
-def _render_requirement_notation_section(document: Document, html: Optional[str]) -> None:
-    heading = document.add_paragraph()
-    heading_run = heading.add_run("4.3 Requirement Notation")
-    heading_run.font.size = Pt(18)
-    heading_run.font.bold = True
-    heading.space_before = Pt(6)
-    heading.space_after = Pt(6)
+    normalized_entries = _normalize_terminology_entries(entries)
+    if normalized_entries:
+        _append_terminology_table(document, normalized_entries)
+    else:
+        append_static(
+            document,
+            "document_convention.default_terminology",
+            lambda target: _append_terminology_table(target, DEFAULT_TERMINOLOGY_ENTRIES),
+        )
 
-    if html:
-        append_html_to_document(document, html)
+    document.add_paragraph()
 
 
-def _render_assessment_verdicts_section(document: Document, html: Optional[str]) -> None:
-    heading = document.add_paragraph()
-    heading_run = heading.add_run("4.4 Assessment Verdicts")
-    heading_run.font.size = Pt(18)
-    heading_run.font.bold = True
-    heading.space_before = Pt(6)
-    heading.space_after = Pt(6)
+def _render_html_subsection(document: Document, title: str, html: Optional[str]) -> None:
+    _append_heading(document, title)
 
     if html:
         append_html_to_document(document, html)
 
 
 def _normalize_terminology_entries(entries: Optional[Sequence[dict]]) -> List[dict]:
+    """Normalize user entries; an empty result means the defaults apply."""
     normalized: List[dict] = []
     for entry in entries or []:
         term = _safe_get(entry, "term")
@@ -188,9 +169,7 @@ def _normalize_terminology_entries(entries: Optional[Sequence[dict]]) -> List[di
                     "reference": reference or "—",
                 }
             )
-    if normalized:
-        return normalized
-    return [dict(item) for item in DEFAULT_TERMINOLOGY_ENTRIES]
+    return normalized
 
 
 def _safe_get(entry: object, key: str) -> str:
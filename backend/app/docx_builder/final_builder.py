@@ -4,10 +4,14 @@ from pathlib import Path
 from docx import Document
 from docx.shared import Pt
 
+from app.utils.assurance_packages import normalize_eal
 from .section_builders import create_base_document, add_documentation_intro_section, add_section_with_html
 from .cover_builder import add_cover_to_document
+from .fragments import append_static
 from .html_converter import append_html_to_document
+from .requirements_builder import append_catalogue_requirements, append_eal_package, eal_package_available
 from .risk_management_builder import append_risk_management_section
+from .styles import add_heading
 
 
 def build_final_combined_document(payload, image_file: Path, output_dir: Path) -> Path:
@@ -78,7 +82,7 @@ def build_final_combined_document(payload, image_file: Path, output_dir: Path) -
             "2.",
             "Security Problem Definition",
             payload.spd_html,
-            heading_size=20,
+            heading_level=1,
             add_page_break=True
         )
     
@@ -89,7 +93,7 @@ def build_final_combined_document(payload, image_file: Path, output_dir: Path) -
             "3.",
             "Conformance Claims",
             payload.conformance_claims_html,
-            heading_size=20,
+            heading_level=1,
             add_page_break=True
         )
     
@@ -100,7 +104,7 @@ def build_final_combined_document(payload, image_file: Path, output_dir: Path) -
             "4.",
             "Security Objectives",
             payload.security_objectives_html,
-            heading_size=20,
+            heading_level=1,
             add_page_break=True
         )
     
@@ -116,24 +120,7 @@ def build_final_combined_document(payload, image_file: Path, output_dir: Path) -
     
     # Section 7: Product Summary Specification (TSS)
     if payload.tss_html:
-        document.add_page_break()
-        
-        tss_heading = document.add_paragraph()
-        tss_run = tss_heading.add_run("7. Product Summary Specification")
-        tss_run.font.size = Pt(20)
-        tss_run.font.bold = True
-        tss_heading.space_before = Pt(12)
-        tss_heading.space_after = Pt(8)
-        
-        intro_paragraph = document.add_paragraph(
-            (
-                "This section describes the Product security functions that satisfy the security functional requirements. "
-                "The Product also includes additional relevant security functions which are also described in the following "
-                "sections, as well as a mapping to the security functional requirements satisfied by the Product."
-            )
-        )
-        intro_paragraph.space_after = Pt(12)
-        
+        append_static(document, "final.tss_intro", _build_tss_intro)
         append_html_to_document(document, payload.tss_html)
     
     # Save document
@@ -143,10 +130,34 @@ def build_final_combined_document(payload, image_file: Path, output_dir: Path) -
     return output_path
 
 
+def _build_tss_intro(document: Document) -> None:
+    """Static opening of Section 7: page break, heading and intro paragraph."""
+    document.add_page_break()
+    add_heading(document, "7. Product Summary Specification", 1)
+    document.add_paragraph(
+        (
+            "This section describes the Product security functions that satisfy the security functional requirements. "
+            "The Product also includes additional relevant security functions which are also described in the following "
+            "sections, as well as a mapping to the security functional requirements satisfied by the Product."
+        )
+    )
+
+
+def _build_security_requirements_heading(document: Document) -> None:
+    document.add_page_break()
+    add_heading(document, "6. Security Requirements", 1)
+
+
 def _add_security_requirements_section(document: Document, payload):
     """
     Add Security Requirements section (SFR and SAR).
     
+    Requirements selected by catalogue id are rendered from the catalogue;
+    otherwise the client-rendered HTML previews are converted. When the
+    client sent no SAR content at all, a known ``selected_eal`` whose
+    components are all in the catalogue supplies the SARs from its cached,
+    pre-rendered package.
+    
     Args:
         document: Document to add to
         payload: FinalPreviewRequest with requirements data
@@ -154,25 +165,18 @@ def _add_security_requirements_section(document: Document, payload):
     security_section_added = False
     
     # Add SFR section
-    if payload.sfr_preview_html or (payload.sfr_list and len(payload.sfr_list) > 0):
-        document.add_page_break()
-        
-        security_heading = document.add_paragraph()
-        security_run = security_heading.add_run("6. Security Requirements")
-        security_run.font.size = Pt(20)
-        security_run.font.bold = True
-        security_heading.space_before = Pt(12)
-        security_heading.space_after = Pt(8)
+    if payload.sfr_requirements or payload.sfr_preview_html or (payload.sfr_list and len(payload.sfr_list) > 0):
+        append_static(document, "final.security_requirements", _build_security_requirements_heading)
         security_section_added = True
+        append_static(
+            document,
+            "final.sfr_heading",
+            lambda target: add_heading(target, "6.1 Security Functional Requirements", 2),
+        )
         
-        sfr_heading = document.add_paragraph()
-        sfr_run = sfr_heading.add_run("6.1 Security Functional Requirements")
-        sfr_run.font.size = Pt(18)
-        sfr_run.font.bold = True
-        sfr_heading.space_before = Pt(8)
-        sfr_heading.space_after = Pt(12)
-        
-        if payload.sfr_preview_html:
+        if payload.sfr_requirements:
+            append_catalogue_requirements(document, payload.sfr_requirements)
+        elif payload.sfr_preview_html:
             append_html_to_document(document, payload.sfr_preview_html)
         else:
             for sfr_item in payload.sfr_list:
@@ -181,26 +185,22 @@ def _add_security_requirements_section(document: Document, payload):
                     document.add_paragraph().space_after = Pt(12)
     
     # Add SAR section
-    if payload.sar_preview_html or (payload.sar_list and len(payload.sar_list) > 0):
+    eal_package = None
+    if not (payload.sar_requirements or payload.sar_preview_html or payload.sar_list):
+        if eal_package_available(payload.selected_eal):
+            eal_package = normalize_eal(payload.selected_eal)
+    if payload.sar_requirements or eal_package or payload.sar_preview_html or (payload.sar_list and len(payload.sar_list) > 0):
         if not security_section_added:
-            document.add_page_break()
-            
-            security_heading = document.add_paragraph()
-            security_run = security_heading.add_run("6. Security Requirements")
-            security_run.font.size = Pt(20)
-            security_run.font.bold = True
-            security_heading.space_before = Pt(12)
-            security_heading.space_after = Pt(8)
+            append_static(document, "final.security_requirements", _build_security_requirements_heading)
             security_section_added = True
         
-        sar_heading = document.add_paragraph()
-        sar_run = sar_heading.add_run("6.2 Security Assurance Requirements")
-        sar_run.font.size = Pt(18)
-        sar_run.font.bold = True
-        sar_heading.space_before = Pt(8)
-        sar_heading.space_after = Pt(12)
+        append_static(
+            document,
+            "final.sar_heading",
+            lambda target: add_heading(target, "6.2 Security Assurance Requirements", 2),
+        )
         
-        if payload.sar_preview_html:
+        if payload.sar_preview_html and not (payload.sar_requirements or eal_package):
             append_html_to_document(document, payload.sar_preview_html)
         else:
             # Add EAL if specified
@@ -210,7 +210,13 @@ def _add_security_requirements_section(document: Document, payload):
                 eal_run.font.bold = True
                 eal_para.space_after = Pt(12)
             
-            for sar_item in payload.sar_list:
-                if sar_item.get('preview'):
-                    append_html_to_document(document, sar_item['preview'])
-                    document.add_paragraph().space_after = Pt(12)
+            if payload.sar_requirements:
+                append_catalogue_requirements(document, payload.sar_requirements)
+            elif eal_package:
+                # Fixed catalogue content: spliced from the cached package fragment
+                append_eal_package(document, eal_package)
+            else:
+                for sar_item in payload.sar_list:
+                    if sar_item.get('preview'):
+                        append_html_to_document(document, sar_item['preview'])
+                        document.add_paragraph().space_after = Pt(12)
@@ -0,0 +1,91 @@
+"""Precompiled OOXML fragments for constant document content.
+
+Boilerplate such as headings, clause references, requirement quotes and
+default tables is built once with python-docx against a scratch document,
+detached as element trees and deep-copied into every generated document, so
+per-request work is limited to user content.
+
+Fragments must not reference document parts (images, hyperlinks, comments)
+and assume the standard page layout of ``create_base_document``.
+"""
+import copy
+import threading
+from typing import Callable, Dict, Hashable, Tuple
+
+from docx import Document
+from docx.oxml.ns import qn
+from docx.oxml.xmlchemy import BaseOxmlElement
+
+from .section_builders import create_base_document
+
+
+Fragment = Tuple[BaseOxmlElement, ...]
+
+_fragments: Dict[Hashable, Fragment] = {}
+_scratch: Dict[str, Document] = {}
+_lock = threading.RLock()
+
+
+def compile_fragment(build: Callable[[Document], None]) -> Fragment:
+    """
+    Run a python-docx builder against a scratch document and detach its output.
+
+    Args:
+        build: Callable that appends the fragment content to a document
+
+    Returns:
+        Tuple of detached body elements (paragraphs and tables)
+
+    Builders may append other cached fragments; nested compilation runs
+    on the same scratch document.
+    """
+    with _lock:
+        scratch = _scratch.get("document")
+        if scratch is None:
+            scratch = _scratch["document"] = create_base_document()
+        body = scratch.element.body
+        existing = set(body)
+        try:
+            build(scratch)
+        finally:
+            elements = tuple(
+                child for child in body
+                if child not in existing and child.tag != qn("w:sectPr")
+            )
+            for element in elements:
+                body.remove(element)
+    return elements
+
+
+def get_fragment(key: Hashable, build: Callable[[Document], None]) -> Fragment:
+    """
+    Get a precompiled fragment, compiling it on first use.
+
+    Args:
+        key: Cache key identifying the fragment content
+        build: Builder used when the fragment is not cached yet
+
+    Returns:
+        Cached fragment
+    """
+    fragment = _fragments.get(key)
+    if fragment is None:
+        fragment = _fragments.setdefault(key, compile_fragment(build))
+    return fragment
+
+
+def append_fragment(document: Document, fragment: Fragment) -> None:
+    """Deep-copy a fragment to the end of a document body."""
+    body = document.element.body
+    sect_pr = body.sectPr
+    for element in fragment:
+        clone = copy.deepcopy(element)
+        if sect_pr is not None:
+            sect_pr.addprevious(clone)
+        else:
+            body.append(clone)
+
+
+def append_static(document: Document, key: Hashable, build: Callable[[Document], None]) -> None:
+    """Append the cached fragment for ``key``, compiling it with ``build`` if needed."""
+    append_fragment(document, get_fragment(key, build))
@@ -1,190 +1,299 @@
-"""HTML to DOCX conversion utilities."""
-from io import BytesIO
-from typing import Optional, Dict
+"""HTML to DOCX conversion utilities.
+
+HTML is compiled into a ``RenderPlan`` (see ``render_plan``) once per
+distinct fragment; converting it into a document replays the cached plan.
+Inline base64 images are moved to the in-memory asset cache while compiling,
+so plans only carry ``asset://`` references.
+"""
+from typing import Optional, Dict, List
+
 from docx import Document
-from docx.shared import Mm, Pt
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-from lxml import html as lxml_html
-
-from app.utils.style_parser import (
-    collect_inline_styles, 
-    merge_styles, 
-    apply_styles_to_run,
-    parse_margin_left,
-    parse_text_alignment,
-    parse_image_alignment,
-)
+from docx.shared import Pt
+
+from app.utils.asset_store import intern_image_source
+from app.utils.style_parser import merge_styles
 from app.utils.converters import px_to_mm
-from app.utils.dimension_parser import extract_dimension_px, extract_table_column_widths
-from app.utils.image_handler import decode_base64_image
+from app.utils.dimension_parser import extract_table_column_widths
+from .html_fragments import ElementInfo, ParsedFragment, analyze_element, get_render_plan, parse_fragment
+from .render_plan import (
+    BLOCK_IMAGE,
+    BREAK,
+    IMAGE,
+    LIST_ITEM,
+    PARAGRAPH,
+    RUN,
+    TABLE,
+    RenderPlan,
+    encode_alignment,
+    encode_style,
+)
+
+
+DEFAULT_STYLES = {
+    "bold": False,
+    "italic": False,
+    "underline": False,
+    "strike": False,
+    "color": None,
+    "size": None,
+}
+
+
+class _InlineOps:
+    """
+    Inline op sequence of one paragraph (or table cell).
+
+    A list inside inline content is written as list item paragraphs into
+    the same op sequence; content after it continues in a new paragraph.
+    """
+
+    def __init__(self, ops: List[list], indent: Optional[float] = None, list_level: int = 0):
+        self.ops = ops
+        self.indent = indent
+        self.list_level = list_level
+        self.has_content = False
+        self._reopen = False
 
+    def _inline(self) -> None:
+        if self._reopen:
+            self.ops.append([PARAGRAPH, self.indent or None, None])
+            self._reopen = False
 
-def paragraph_has_content(paragraph) -> bool:
-    """Check if paragraph has any text content."""
-    if (paragraph.text or "").strip():
-        return True
-    for run in paragraph.runs:
-        if (getattr(run, "text", "") or "").strip():
-            return True
-    return False
+    def text(self, text: str, styles: Optional[Dict] = None) -> None:
+        self._inline()
+        self.ops.append([RUN, text, encode_style(styles) if styles else None])
+        if text.strip():
+            self.has_content = True
 
+    def line_break(self) -> None:
+        self._inline()
+        self.ops.append([BREAK])
 
-def append_inline_content(
-    paragraph,
+    def end_list(self) -> None:
+        """Continue after a list in a fresh paragraph."""
+        self.has_content = False
+        self._reopen = True
+
+    def image(self, src: str, info: ElementInfo, styles: Dict) -> None:
+        self._inline()
+        self.ops.append([
+            IMAGE,
+            intern_image_source(src),
+            px_to_mm(info.width_px) if info.width_px else None,
+            px_to_mm(info.height_px) if info.height_px else None,
+            encode_style(styles),
+        ])
+
+
+def _element_info(element, fragment: Optional[ParsedFragment]) -> ElementInfo:
+    """Pre-analyzed style info from the parsed fragment, or computed now."""
+    if fragment is not None:
+        return fragment.info_for(element)
+    return analyze_element(element)
+
+
+def _paragraph(block: List[list], indent: Optional[float] = None, alignment=None) -> _InlineOps:
+    block.append([PARAGRAPH, indent or None, encode_alignment(alignment)])
+    return _InlineOps(block, indent)
+
+
+def _compile_inline(
+    paragraph: _InlineOps,
     element,
     inherited_styles: Optional[Dict] = None,
     suppress_leading_break: bool = False,
+    fragment: Optional[ParsedFragment] = None,
 ):
     """
-    Append inline HTML content to a docx paragraph.
-    
+    Compile inline HTML content into the ops of a paragraph.
+
     Handles: text, images, line breaks, formatting tags (bold, italic, etc.),
     lists (ul, ol), and nested elements.
-    
+
     Args:
-        paragraph: python-docx Paragraph object
+        paragraph: Inline ops of the target paragraph
         element: lxml HTML element
         inherited_styles: Style dictionary from parent elements
+        fragment: Parsed fragment the element belongs to (skips style
+            extraction)
     """
-    styles = collect_inline_styles(element)
-    combined_styles = merge_styles(inherited_styles or {
-        "bold": False,
-        "italic": False,
-        "underline": False,
-        "strike": False,
-        "color": None,
-        "size": None,
-    }, styles)
-    
+    info = _element_info(element, fragment)
+    combined_styles = merge_styles(inherited_styles or DEFAULT_STYLES, info.styles)
+
     tag = (element.tag or "").lower()
-    
+
     # Handle images
     if tag == "img":
-        image_data = decode_base64_image(element.get("src", ""))
-        if image_data:
-            run = paragraph.add_run()
-            apply_styles_to_run(run, combined_styles)
-            image_stream = BytesIO(image_data)
-            
-            # Get dimensions
-            width_px = extract_dimension_px(element, "width")
-            height_px = extract_dimension_px(element, "height")
-            
-            kwargs = {}
-            if width_px:
-                kwargs["width"] = Mm(px_to_mm(width_px))
-            if not kwargs and height_px:
-                kwargs["height"] = Mm(px_to_mm(height_px))
-            
-            try:
-                run.add_picture(image_stream, **kwargs)
-            except Exception:
-                pass  # Skip invalid images
-        
+        paragraph.image(element.get("src", ""), info, combined_styles)
+
         # Handle tail text
         tail = element.tail or ""
         if tail:
-            run = paragraph.add_run(tail.replace("\xa0", " "))
-            apply_styles_to_run(run, combined_styles)
+            paragraph.text(tail.replace("\xa0", " "), combined_styles)
         return
-    
+
     # Handle line breaks
     if tag == "br":
-        run = paragraph.add_run()
-        run.add_break()
+        paragraph.line_break()
         tail = element.tail or ""
         if tail:
-            tail_run = paragraph.add_run(tail.replace("\xa0", " "))
-            apply_styles_to_run(tail_run, combined_styles)
+            paragraph.text(tail.replace("\xa0", " "), combined_styles)
         return
-    
+
     # Handle block-level elements inline (p, div)
     if tag in {"p", "div"}:
-        if paragraph_has_content(paragraph) and not suppress_leading_break:
-            paragraph.add_run().add_break()
-        
+        if paragraph.has_content and not suppress_leading_break:
+            paragraph.line_break()
+
         text_content = element.text or ""
         if text_content:
-            run = paragraph.add_run(text_content.replace("\xa0", " "))
-            apply_styles_to_run(run, combined_styles)
-        
+            paragraph.text(text_content.replace("\xa0", " "), combined_styles)
+
         for child in element:
-            append_inline_content(paragraph, child, combined_styles)
+            _compile_inline(paragraph, child, combined_styles, fragment=fragment)
             tail = child.tail or ""
             if tail:
-                tail_run = paragraph.add_run(tail.replace("\xa0", " "))
-                apply_styles_to_run(tail_run, combined_styles)
-        
+                paragraph.text(tail.replace("\xa0", " "), combined_styles)
+
         element_tail = element.tail or ""
         if element_tail:
-            tail_run = paragraph.add_run(element_tail.replace("\xa0", " "))
-            apply_styles_to_run(tail_run, combined_styles)
+            paragraph.text(element_tail.replace("\xa0", " "), combined_styles)
         return
-    
-    # Handle lists (ul, ol)
+
+    # Handle lists (ul, ol): real list paragraphs, e.g. in table cells
     if tag in {"ul", "ol"}:
-        items = [child for child in element if (child.tag or "").lower() == "li"]
-        for idx, child in enumerate(items, start=1):
-            if paragraph_has_content(paragraph):
-                paragraph.add_run().add_break()
-            
-            prefix = "• " if tag == "ul" else f"{idx}. "
-            prefix_run = paragraph.add_run(prefix)
-            apply_styles_to_run(prefix_run, combined_styles)
-            append_inline_content(paragraph, child, combined_styles)
-        
+        _compile_list(
+            paragraph.ops,
+            element,
+            paragraph.indent,
+            paragraph.list_level,
+            fragment=fragment,
+            inherited_styles=combined_styles,
+        )
+        paragraph.end_list()
+
         list_tail = element.tail or ""
         if list_tail:
-            tail_run = paragraph.add_run(list_tail.replace("\xa0", " "))
-            apply_styles_to_run(tail_run, combined_styles)
+            paragraph.text(list_tail.replace("\xa0", " "), combined_styles)
         return
-    
+
     # Handle list items
     if tag == "li":
         text_content = element.text or ""
         if text_content:
-            run = paragraph.add_run(text_content.replace("\xa0", " "))
-            apply_styles_to_run(run, combined_styles)
-        
+            paragraph.text(text_content.replace("\xa0", " "), combined_styles)
+
         for child in element:
-            append_inline_content(paragraph, child, combined_styles, suppress_leading_break=True)
+            _compile_inline(
+                paragraph, child, combined_styles, suppress_leading_break=True, fragment=fragment
+            )
             tail = child.tail or ""
             if tail:
-                tail_run = paragraph.add_run(tail.replace("\xa0", " "))
-                apply_styles_to_run(tail_run, combined_styles)
-        
+                paragraph.text(tail.replace("\xa0", " "), combined_styles)
+
         element_tail = element.tail or ""
         if element_tail:
-            tail_run = paragraph.add_run(element_tail.replace("\xa0", " "))
-            apply_styles_to_run(tail_run, combined_styles)
+            paragraph.text(element_tail.replace("\xa0", " "), combined_styles)
         return
-    
+
     # Default: handle as inline text with formatting
     text = element.text or ""
     if text:
-        run = paragraph.add_run(text.replace("\xa0", " "))
-        apply_styles_to_run(run, combined_styles)
-    
+        paragraph.text(text.replace("\xa0", " "), combined_styles)
+
     for child in element:
-        append_inline_content(paragraph, child, combined_styles)
+        _compile_inline(paragraph, child, combined_styles, fragment=fragment)
 
 
-def append_block_element(document: Document, element, inherited_indent: Optional[float] = None):
+def _list_start(element) -> int:
+    try:
+        return int(element.get("start") or 1)
+    except ValueError:
+        return 1
+
+
+def _compile_list(
+    block: List[list],
+    element,
+    indent: Optional[float],
+    level: int = 0,
+    fragment: Optional[ParsedFragment] = None,
+    inherited_styles: Optional[Dict] = None,
+):
+    """
+    Compile a list into numbered list item paragraphs.
+
+    Nested lists become items one level deeper; content following a nested
+    list inside the same item continues in a plain paragraph.
+
+    Args:
+        block: Op list the list's operations are appended to (a block or
+            the ops of a table cell)
+        element: lxml ``ul``/``ol`` element
+        indent: Left indent in points
+        level: Nesting level
+        fragment: Parsed fragment the element belongs to
+        inherited_styles: Styles of the enclosing inline content
     """
-    Append block-level HTML element to docx document.
-    
+    ordered = (element.tag or "").lower() == "ol"
+    # Position of the list's first op: unique within the block
+    list_id = len(block)
+    start = _list_start(element) if ordered else 1
+
+    for item in element:
+        if (item.tag or "").lower() != "li":
+            continue
+        block.append([LIST_ITEM, list_id, ordered, start, level, indent or None])
+        paragraph = _InlineOps(block, indent, level + 1)
+        styles = merge_styles(inherited_styles or DEFAULT_STYLES, _element_info(item, fragment).styles)
+
+        text_content = item.text or ""
+        if text_content:
+            paragraph.text(text_content.replace("\xa0", " "), styles)
+
+        for child in item:
+            if (child.tag or "").lower() in {"ul", "ol"}:
+                _compile_list(block, child, indent, level + 1, fragment=fragment, inherited_styles=inherited_styles)
+                paragraph = None
+            else:
+                if paragraph is None:
+                    paragraph = _paragraph(block, indent)
+                    paragraph.list_level = level + 1
+                _compile_inline(paragraph, child, styles, suppress_leading_break=True, fragment=fragment)
+
+            tail = child.tail or ""
+            if paragraph is None and not tail.strip():
+                continue
+            if tail:
+                if paragraph is None:
+                    paragraph = _paragraph(block, indent)
+                    paragraph.list_level = level + 1
+                paragraph.text(tail.replace("\xa0", " "), styles)
+
+
+def _compile_block(
+    block: List[list],
+    element,
+    inherited_indent: Optional[float] = None,
+    fragment: Optional[ParsedFragment] = None,
+):
+    """
+    Compile a block-level HTML element into render plan ops.
+
     Handles: headings (h1-h6), paragraphs, divs, lists, tables, line breaks.
-    
+
     Args:
-        document: python-docx Document object
+        block: Op list the element's operations are appended to
         element: lxml HTML element
         inherited_indent: Inherited left indent in points
+        fragment: Parsed fragment the element belongs to (skips style
+            extraction)
     """
     tag = (element.tag or "").lower()
-    style_attr = element.get("style")
-    margin_left = parse_margin_left(style_attr)
+    info = _element_info(element, fragment)
+    margin_left = info.margin_left
     indent = margin_left if margin_left is not None else inherited_indent
-    
+
     # Heading styles
     heading_map = {
         "h1": Pt(24),
@@ -194,28 +303,13 @@ def append_block_element(document: Document, element, inherited_indent: Optional
         "h5": Pt(14),
         "h6": Pt(12),
     }
-    
+
     if tag in heading_map:
-        paragraph = document.add_paragraph()
-        if indent:
-            paragraph.paragraph_format.left_indent = Pt(indent)
-        
-        # Apply text alignment
-        alignment = parse_text_alignment(element)
-        if alignment is not None:
-            paragraph.alignment = alignment
-        
-        base_styles = {
-            "bold": True,
-            "italic": False,
-            "underline": False,
-            "strike": False,
-            "color": None,
-            "size": heading_map[tag],
-        }
-        append_inline_content(paragraph, element, base_styles)
+        paragraph = _paragraph(block, indent, info.alignment)
+        base_styles = dict(DEFAULT_STYLES, bold=True, size=heading_map[tag])
+        _compile_inline(paragraph, element, base_styles, fragment=fragment)
         return
-    
+
     # Paragraph
     if tag == "p":
         # Check if paragraph is empty
@@ -223,74 +317,48 @@ def append_block_element(document: Document, element, inherited_indent: Optional
             (child.text or "") + (child.tail or "") for child in element
         )
         if not text_content.strip() and not element.findall("*"):
-            document.add_paragraph()
+            _paragraph(block)
             return
-        
-        paragraph = document.add_paragraph()
-        if indent:
-            paragraph.paragraph_format.left_indent = Pt(indent)
-        
+
         # Apply text alignment from paragraph
-        alignment = parse_text_alignment(element)
-        if alignment is not None:
-            paragraph.alignment = alignment
-        else:
+        alignment = info.alignment
+        if alignment is None:
             # Check if paragraph contains a single image and use its alignment
             children = list(element)
             if len(children) == 1 and (children[0].tag or "").lower() == "img" and not (element.text or "").strip():
-                img_alignment = parse_image_alignment(children[0])
-                if img_alignment is not None:
-                    paragraph.alignment = img_alignment
-        
-        append_inline_content(paragraph, element)
+                alignment = _element_info(children[0], fragment).image_alignment
+
+        paragraph = _paragraph(block, indent, alignment)
+        _compile_inline(paragraph, element, fragment=fragment)
         return
-    
+
     # Div / Section
     if tag in {"div", "section"}:
         child_indent = indent if indent is not None else inherited_indent
-        
+
         text = (element.text or "").strip()
         if text:
-            paragraph = document.add_paragraph(text)
-            if child_indent:
-                paragraph.paragraph_format.left_indent = Pt(child_indent)
-        
+            _paragraph(block, child_indent).text(text)
+
         for child in element:
-            append_block_element(document, child, child_indent)
-        
+            _compile_block(block, child, child_indent, fragment=fragment)
+
         tail = (element.tail or "").strip()
         if tail:
-            paragraph = document.add_paragraph(tail)
-            if child_indent:
-                paragraph.paragraph_format.left_indent = Pt(child_indent)
+            _paragraph(block, child_indent).text(tail)
         return
-    
+
     # Lists (ul, ol)
     if tag in {"ul", "ol"}:
-        items = [child for child in element if (child.tag or "").lower() == "li"]
-        for idx, child in enumerate(items, start=1):
-            paragraph = document.add_paragraph()
-            if indent:
-                paragraph.paragraph_format.left_indent = Pt(indent)
-            
-            prefix = "• " if tag == "ul" else f"{idx}. "
-            run = paragraph.add_run(prefix)
-            append_inline_content(paragraph, child, {
-                "bold": False,
-                "italic": False,
-                "underline": False,
-                "strike": False,
-                "color": None,
-                "size": None,
-            })
+        _compile_list(block, element, indent, fragment=fragment)
         return
-    
+
     # Tables
     if tag == "table":
         rows = [row for row in element.findall(".//tr")]
         if not rows:
             return
-        
+
         # Build table structure
         max_cells = 0
         table_rows = []
@@ -298,103 +366,87 @@ def append_block_element(document: Document, element, inherited_indent: Optional
             cells = [cell for cell in row if (cell.tag or "").lower() in {"th", "td"}]
             table_rows.append(cells)
             max_cells = max(max_cells, len(cells))
-        
+
         if max_cells == 0:
             return
-        
-        # Create docx table
-        table = document.add_table(rows=len(table_rows), cols=max_cells)
-        table.style = "Table Grid"
-        
-        # Fill table cells
+
+        # Fill table cells (header cells are bolded on replay)
+        plan_cells = []
         for row_index, cells in enumerate(table_rows):
             for col_index, cell in enumerate(cells):
-                if col_index >= max_cells:
-                    continue
-                
-                paragraph = table.cell(row_index, col_index).paragraphs[0]
-                paragraph.text = ""
-                append_inline_content(paragraph, cell)
-                
-                # Bold header cells
-                if (cell.tag or "").lower() == "th":
-                    for run in paragraph.runs:
-                        run.bold = True
-        
-        # Set column widths
-        column_widths = extract_table_column_widths(element, max_cells)
-        for idx, width_px in enumerate(column_widths):
-            if width_px is None or idx >= len(table.columns):
-                continue
-            
-            width_mm = px_to_mm(width_px)
-            column_length = Mm(width_mm)
-            table.columns[idx].width = column_length
-            for row in table.rows:
-                row.cells[idx].width = column_length
+                cell_ops = []
+                _compile_inline(_InlineOps(cell_ops), cell, fragment=fragment)
+                is_header = (cell.tag or "").lower() == "th"
+                plan_cells.append([row_index, col_index, is_header, cell_ops])
+
+        # Column widths
+        widths = [
+            [idx, px_to_mm(width_px)]
+            for idx, width_px in enumerate(extract_table_column_widths(element, max_cells))
+            if width_px is not None and idx < max_cells
+        ]
+        block.append([TABLE, len(table_rows), max_cells, plan_cells, widths])
         return
-    
+
     # Image (block-level)
     if tag == "img":
-        image_data = decode_base64_image(element.get("src", ""))
-        if image_data:
-            paragraph = document.add_paragraph()
-            if indent:
-                paragraph.paragraph_format.left_indent = Pt(indent)
-            
-            # Apply alignment for block-level images, including custom container styles
-            alignment = parse_image_alignment(element)
-            if alignment is not None:
-                paragraph.alignment = alignment
-            
-            run = paragraph.add_run()
-            image_stream = BytesIO(image_data)
-            
-            # Get dimensions
-            width_px = extract_dimension_px(element, "width")
-            height_px = extract_dimension_px(element, "height")
-            
-            kwargs = {}
-            if width_px:
-                kwargs["width"] = Mm(px_to_mm(width_px))
-            if not kwargs and height_px:
-                kwargs["height"] = Mm(px_to_mm(height_px))
-            
-            try:
-                run.add_picture(image_stream, **kwargs)
-            except Exception:
-                pass  # Skip invalid images
+        block.append([
+            BLOCK_IMAGE,
+            intern_image_source(element.get("src", "")),
+            indent or None,
+            encode_alignment(info.image_alignment),
+            px_to_mm(info.width_px) if info.width_px else None,
+            px_to_mm(info.height_px) if info.height_px else None,
+        ])
         return
-    
+
     # Line break
     if tag == "br":
-        document.add_paragraph()
+        _paragraph(block)
         return
-    
+
     # Fallback: treat unknown elements as paragraphs
-    paragraph = document.add_paragraph()
-    if indent:
-        paragraph.paragraph_format.left_indent = Pt(indent)
-    append_inline_content(paragraph, element)
+    paragraph = _paragraph(block, indent)
+    _compile_inline(paragraph, element, fragment=fragment)
+
+
+def compile_html_plan(html_content: str) -> RenderPlan:
+    """
+    Compile an HTML fragment into a render plan.
+
+    Args:
+        html_content: HTML string to compile
+
+    Returns:
+        Plan with one block per top-level element; content lxml cannot
+        parse becomes a single plain-text paragraph
+    """
+    try:
+        fragment = parse_fragment(html_content)
+    except (ValueError, TypeError):
+        # Fallback: add as plain text if parsing fails
+        return RenderPlan(blocks=(([PARAGRAPH, None, None], [RUN, html_content, None]),))
+
+    blocks = []
+    for child in fragment.root:
+        block = []
+        _compile_block(block, child, fragment=fragment)
+        blocks.append(block)
+    return RenderPlan(blocks=tuple(blocks))
 
 
 def append_html_to_document(document: Document, html_content: str):
     """
     Parse HTML and append to docx document.
-    
+
+    Render plans are cached by content digest, so repeated conversions of
+    the same HTML skip parsing, style extraction and tree walking.
+
     Args:
         document: python-docx Document object
         html_content: HTML string to parse and convert
     """
     if not html_content or not html_content.strip():
         return
-    
-    try:
-        fragment = lxml_html.fragment_fromstring(html_content, create_parent=True)
-    except (ValueError, TypeError):
-        # Fallback: add as plain text if parsing fails
-        paragraph = document.add_paragraph(html_content)
-        return
-    
-    for child in fragment:
-        append_block_element(document, child)
+
+    get_render_plan(html_content, compile_html_plan).replay(document)
@@ -0,0 +1,168 @@
+"""Parsing and caching of rich-text HTML fragments.
+
+The same rich-text HTML is converted many times: SFR/SAR previews arrive as
+``html_content`` and again inside ``sfr_list``/``sfr_preview_html`` of the
+final preview, and workspace sections are re-rendered on every preview.
+Fragments are parsed once with every element's style information extracted
+up front, compiled into a render plan, and the plan is kept in an LRU
+keyed by the SHA-256 of the HTML and bounded by entry count and total plan
+size. Cached plans are shared between requests and must be treated as
+read-only.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from lxml import html as lxml_html
+
+from app.config import HTML_FRAGMENT_CACHE_MAX_BYTES, HTML_FRAGMENT_CACHE_MAX_ENTRIES
+from app.utils.dimension_parser import extract_dimension_px
+from app.utils.style_parser import (
+    collect_inline_styles,
+    parse_image_alignment,
+    parse_margin_left,
+    parse_text_alignment,
+)
+from .render_plan import RenderPlan
+
+
+class ElementInfo(NamedTuple):
+    """Style information of one HTML element, extracted once."""
+    styles: Dict[str, Any]
+    margin_left: Optional[float]
+    alignment: Optional[WD_PARAGRAPH_ALIGNMENT]
+    image_alignment: Optional[WD_PARAGRAPH_ALIGNMENT]
+    width_px: Optional[float]
+    height_px: Optional[float]
+
+
+def analyze_element(element) -> ElementInfo:
+    """Extract the style information the converter needs for an element."""
+    is_image = (element.tag or "").lower() == "img"
+    return ElementInfo(
+        styles=collect_inline_styles(element),
+        margin_left=parse_margin_left(element.get("style")),
+        alignment=parse_text_alignment(element),
+        image_alignment=parse_image_alignment(element) if is_image else None,
+        width_px=extract_dimension_px(element, "width") if is_image else None,
+        height_px=extract_dimension_px(element, "height") if is_image else None,
+    )
+
+
+@dataclass
+class ParsedFragment:
+    """
+    A parsed HTML fragment with per-element analysis.
+
+    Attributes:
+        root: Parent element wrapping the fragment's top-level nodes
+        info: Analysis per element (keeps the element proxies alive, so
+            lookups while walking the tree hit the same objects)
+    """
+    root: Any
+    info: Dict[Any, ElementInfo]
+
+    def info_for(self, element) -> ElementInfo:
+        info = self.info.get(element)
+        return info if info is not None else analyze_element(element)
+
+
+def parse_fragment(html_content: str) -> ParsedFragment:
+    """
+    Parse an HTML fragment and analyze all of its elements.
+
+    Raises:
+        ValueError / TypeError: If lxml cannot parse the content
+    """
+    root = lxml_html.fragment_fromstring(html_content, create_parent=True)
+    info = {
+        element: analyze_element(element)
+        for element in root.iter()
+        # Comments and processing instructions are left to the converter
+        if isinstance(element.tag, str)
+    }
+    return ParsedFragment(root=root, info=info)
+
+
+class _FragmentCache:
+    """Thread-safe LRU of render plans keyed by content digest, bounded by count and size."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[RenderPlan, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, html_content: str, compile_plan: Callable[[str], RenderPlan]) -> RenderPlan:
+        key = hashlib.sha256(html_content.encode("utf-8", "surrogatepass")).hexdigest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        # Inline images of a plan live in the bounded asset cache; once one
+        # is evicted the plan is compiled again
+        if entry is not None and entry[0].assets_available():
+            with self._lock:
+                self.hits += 1
+            return entry[0]
+        with self._lock:
+            if entry is not None and self._entries.get(key) is entry:
+                del self._entries[key]
+                self._size -= entry[1]
+            self.misses += 1
+
+        plan = compile_plan(html_content)
+        if self.max_entries <= 0:
+            return plan
+        size = plan.size
+        if size > self.max_bytes:
+            return plan
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = (plan, size)
+                self._size += size
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+        return entry[0]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_cache = _FragmentCache(HTML_FRAGMENT_CACHE_MAX_ENTRIES, HTML_FRAGMENT_CACHE_MAX_BYTES)
+
+
+def get_render_plan(html_content: str, compile_plan: Callable[[str], RenderPlan]) -> RenderPlan:
+    """
+    Get the render plan for an HTML string.
+
+    Args:
+        html_content: HTML fragment
+        compile_plan: Compiler used when the plan is not cached yet
+
+    Returns:
+        Cached or freshly compiled plan
+    """
+    return _cache.get(html_content, compile_plan)
+
+
+def fragment_cache_stats() -> Dict[str, int]:
+    """Current size and hit/miss counters of the render plan cache."""
+    return _cache.stats()
@@ -9,6 +9,7 @@ from docx.oxml.ns import qn
 from docx.shared import Pt
 
 from .html_converter import append_html_to_document
+from .styles import add_clause_reference, add_heading
 
 PURPOSE_SCOPE_PHASES = [
     "Concept and planning",
@@ -49,10 +50,7 @@ class IntroductionSectionsRenderer:
         self._add_manufacturer_information_section(manufacturer_information_payload)
 
     def _add_intro_heading(self):
-        heading = self.document.add_paragraph()
-        heading_run = heading.add_run("1. Introduction")
-        heading_run.font.size = Pt(20)
-        heading_run.font.bold = True
+        heading = add_heading(self.document, "1. Introduction", 1)
         heading.space_after = Pt(8)
 
         intro_para = self.document.add_paragraph(
@@ -61,10 +59,7 @@ class IntroductionSectionsRenderer:
         intro_para.space_after = Pt(12)
 
     def _add_document_information_section(self, introduction_data: Any):
-        heading = self.document.add_paragraph()
-        heading_run = heading.add_run("1.1 Document Information")
-        heading_run.font.size = Pt(18)
-        heading_run.font.bold = True
+        heading = add_heading(self.document, "1.1 Document Information", 2)
         heading.space_before = Pt(6)
         heading.space_after = Pt(8)
 
@@ -97,14 +92,10 @@ class IntroductionSectionsRenderer:
     def _add_purpose_scope_section(self, introduction_data: Any, purpose_data: Any):
         self.document.add_page_break()
 
-        heading = self.document.add_paragraph()
-        heading_run = heading.add_run("1.2 Purpose and Scope")
-        heading_run.font.size = Pt(18)
-        heading_run.font.bold = True
+        heading = add_heading(self.document, "1.2 Purpose and Scope", 2)
         heading.space_after = Pt(8)
 
-        reference = self.document.add_paragraph("[Reference: Clause 1 - Scope]")
-        reference.runs[0].font.bold = True
+        reference = add_clause_reference(self.document, "[Reference: Clause 1 - Scope]")
         reference.space_after = Pt(10)
 
         product_name = _get_intro_value(introduction_data, "product_name")
@@ -173,10 +164,7 @@ class IntroductionSectionsRenderer:
     def _add_product_identification_section(self, introduction_data: Any, product_data: Any):
         self.document.add_page_break()
 
-        heading = self.document.add_paragraph()
-        heading_run = heading.add_run("1.3 Product Identification")
-        heading_run.font.size = Pt(18)
-        heading_run.font.bold = True
+        heading = add_heading(self.document, "1.3 Product Identification", 2)
         heading.space_after = Pt(8)
 
         fields = [
@@ -239,10 +227,7 @@ class IntroductionSectionsRenderer:
     def _add_manufacturer_information_section(self, manufacturer_data: Any):
         self.document.add_page_break()
 
-        heading = self.document.add_paragraph()
-        heading_run = heading.add_run("1.4 Manufacturer Information")
-        heading_run.font.size = Pt(18)
-        heading_run.font.bold = True
+        heading = add_heading(self.document, "1.4 Manufacturer Information", 2)
         heading.space_after = Pt(8)
 
         fields = [
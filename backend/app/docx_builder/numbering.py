@@ -0,0 +1,171 @@
+"""DOCX numbering definitions for HTML lists.
+
+Bulleted and ordered lists are rendered as real Word lists: each document
+gets one abstract numbering definition per list kind (added on first use
+and found again by name afterwards), every ordered HTML list gets its own
+``w:num`` instance so numbering restarts, bulleted lists share one, and list
+paragraphs reference it through ``w:numPr`` with the nesting level.
+
+All lists rendered into one document share a single ``ListNumbering``
+(see ``get_list_numbering``), so numbering instances are allocated from one
+counter however many HTML fragments are converted into the document.
+"""
+import copy
+import itertools
+import threading
+import weakref
+from functools import lru_cache
+from typing import Dict, Hashable, Optional
+
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+from docx.oxml.numbering import CT_Num
+
+
+LEVEL_COUNT = 9
+BULLET_SYMBOLS = ("•", "◦", "▪")
+INDENT_STEP_TWIPS = 720
+HANGING_TWIPS = 360
+
+_ABSTRACT_NAMES = {False: "HtmlBulletList", True: "HtmlOrderedList"}
+
+
+def _level_xml(ordered: bool, level: int) -> str:
+    if ordered:
+        number_format, text = "decimal", f"%{level + 1}."
+    else:
+        number_format, text = "bullet", BULLET_SYMBOLS[level % len(BULLET_SYMBOLS)]
+    return (
+        f'<w:lvl w:ilvl="{level}">'
+        f'<w:start w:val="1"/>'
+        f'<w:numFmt w:val="{number_format}"/>'
+        f'<w:lvlText w:val="{text}"/>'
+        f'<w:lvlJc w:val="left"/>'
+        f'<w:pPr><w:ind w:left="{INDENT_STEP_TWIPS * (level + 1)}" w:hanging="{HANGING_TWIPS}"/></w:pPr>'
+        f'</w:lvl>'
+    )
+
+
+@lru_cache(maxsize=2)
+def _abstract_num_template(ordered: bool):
+    levels = "".join(_level_xml(ordered, level) for level in range(LEVEL_COUNT))
+    return parse_xml(
+        f'<w:abstractNum {nsdecls("w")} w:abstractNumId="0">'
+        f'<w:multiLevelType w:val="hybridMultilevel"/>'
+        f'<w:name w:val="{_ABSTRACT_NAMES[ordered]}"/>'
+        f'{levels}'
+        f'</w:abstractNum>'
+    )
+
+
+def _find_abstract_num_id(numbering, ordered: bool) -> Optional[int]:
+    name = _ABSTRACT_NAMES[ordered]
+    for abstract_num in numbering.iterchildren(qn("w:abstractNum")):
+        name_element = abstract_num.find(qn("w:name"))
+        if name_element is not None and name_element.get(qn("w:val")) == name:
+            return int(abstract_num.get(qn("w:abstractNumId")))
+    return None
+
+
+def _add_abstract_num(numbering, ordered: bool) -> int:
+    existing = [int(item.get(qn("w:abstractNumId"))) for item in numbering.iterchildren(qn("w:abstractNum"))]
+    abstract_num_id = max(existing, default=-1) + 1
+
+    abstract_num = copy.deepcopy(_abstract_num_template(ordered))
+    abstract_num.set(qn("w:abstractNumId"), str(abstract_num_id))
+    # Abstract definitions must precede all w:num instances
+    first_num = numbering.find(qn("w:num"))
+    if first_num is not None:
+        first_num.addprevious(abstract_num)
+    else:
+        numbering.append(abstract_num)
+    return abstract_num_id
+
+
+class ListNumbering:
+    """
+    Numbering instances of the lists rendered into one document.
+
+    Args:
+        document: Target document (must have a numbering part, as documents
+            created from the default template do)
+    """
+
+    def __init__(self, document: Document):
+        self._numbering = document.part.numbering_part.element
+        self._abstract_ids: Dict[bool, int] = {}
+        self._num_ids: Dict[Optional[Hashable], int] = {}
+        self._next_num_id: Optional[int] = None
+        self._scopes = itertools.count()
+
+    def new_scope(self) -> int:
+        """Identifier that keeps list ids of one converted fragment apart from others."""
+        return next(self._scopes)
+
+    def _abstract_num_id(self, ordered: bool) -> int:
+        abstract_num_id = self._abstract_ids.get(ordered)
+        if abstract_num_id is None:
+            abstract_num_id = _find_abstract_num_id(self._numbering, ordered)
+            if abstract_num_id is None:
+                abstract_num_id = _add_abstract_num(self._numbering, ordered)
+            self._abstract_ids[ordered] = abstract_num_id
+        return abstract_num_id
+
+    def _add_num(self, abstract_num_id: int) -> CT_Num:
+        # CT_Numbering.add_num rescans every numId per call, which is
+        # quadratic for documents with many lists
+        if self._next_num_id is None:
+            existing = self._numbering.xpath("./w:num/@w:numId")
+            self._next_num_id = max((int(num_id) for num_id in existing), default=0) + 1
+        num = CT_Num.new(self._next_num_id, abstract_num_id)
+        self._next_num_id += 1
+        return self._numbering._insert_num(num)
+
+    def num_id(self, list_id: Hashable, ordered: bool, start: int, level: int) -> int:
+        """
+        Get the ``w:num`` instance of a list, creating it on first use.
+
+        Args:
+            list_id: Caller-chosen identifier of the HTML list, unique
+                within the document (e.g. ``(scope, position)``)
+            ordered: Whether the list is numbered
+            start: First number of an ordered list
+            level: Nesting level of the list
+
+        Returns:
+            Numbering instance id
+        """
+        key = list_id if ordered else None
+        num_id = self._num_ids.get(key)
+        if num_id is None:
+            num = self._add_num(self._abstract_num_id(ordered))
+            if ordered:
+                num.add_lvlOverride(ilvl=level).add_startOverride(start)
+            num_id = self._num_ids[key] = num.numId
+        return num_id
+
+    def apply(self, paragraph, list_id: Hashable, ordered: bool, start: int, level: int) -> None:
+        """Make a paragraph an item of a list at the given nesting level."""
+        level = min(level, LEVEL_COUNT - 1)
+        num_pr = paragraph._p.get_or_add_pPr().get_or_add_numPr()
+        num_pr.get_or_add_ilvl().val = level
+        num_pr.get_or_add_numId().val = self.num_id(list_id, ordered, start, level)
+
+
+_document_lists: "weakref.WeakKeyDictionary[object, ListNumbering]" = weakref.WeakKeyDictionary()
+_document_lists_lock = threading.Lock()
+
+
+def get_list_numbering(document: Document) -> ListNumbering:
+    """
+    Get the numbering context of a document, creating it on first use.
+
+    The context lives as long as the document's main part.
+    """
+    part = document.part
+    with _document_lists_lock:
+        lists = _document_lists.get(part)
+        if lists is None:
+            lists = _document_lists[part] = ListNumbering(document)
+        return lists
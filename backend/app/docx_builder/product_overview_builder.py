@@ -1,34 +1,39 @@
 """Product Overview section rendering."""
-from typing import Any, List
+from itertools import chain
+from typing import Any, Iterable, List, Optional
 
 from docx import Document
 from docx.shared import Pt
 
+from app.utils.sbom_store import iter_sbom_entries
 from .html_converter import append_html_to_document
+from .styles import add_clause_reference, add_heading
+from .table_writer import append_bulk_table
+
+COMPONENT_HEADERS = ("Component Name", "Type", "Version", "Supplier", "Purpose", "License")
+COMPONENT_FIELDS = ("component_name", "component_type", "version", "supplier", "purpose", "license")
 
 DESCRIPTION_PLACEHOLDER = (
     "[Provide a detailed description of the product highlighting physical, software, connectivity, user interface, and data processing characteristics.]"
 )
 
 
-def append_product_overview_section(document: Document, overview_data: Any):
-    """Append Section 2 - Product Overview."""
+def append_product_overview_section(document: Document, overview_data: Any, user_id: Optional[str] = None):
+    """
+    Append Section 2 - Product Overview.
+
+    Components of the referenced SBOM import are only included when the
+    import belongs to ``user_id``.
+    """
     document.add_page_break()
 
-    heading = document.add_paragraph()
-    heading_run = heading.add_run("2. Product Overview")
-    heading_run.font.size = Pt(20)
-    heading_run.font.bold = True
+    heading = add_heading(document, "2. Product Overview", 1)
     heading.space_after = Pt(10)
 
-    sub_heading = document.add_paragraph()
-    sub_run = sub_heading.add_run("2.1 Product Description")
-    sub_run.font.size = Pt(18)
-    sub_run.font.bold = True
+    sub_heading = add_heading(document, "2.1 Product Description", 2)
     sub_heading.space_after = Pt(6)
 
-    reference = document.add_paragraph("[Reference: Clause 6.2 - Product Context]")
-    reference.runs[0].font.bold = True
+    reference = add_clause_reference(document, "[Reference: Clause 6.2 - Product Context]")
     reference.space_after = Pt(10)
 
     intro = document.add_paragraph(
@@ -53,7 +58,7 @@ def append_product_overview_section(document: Document, overview_data: Any):
     # Begin architecture overview on a fresh page when content exists
     document.add_page_break()
     _add_architecture_section(document, overview_data)
-    _add_third_party_section(document, overview_data)
+    _add_third_party_section(document, overview_data, user_id)
 
 
 def _add_guidance_line(document: Document, title: str, description: str):
@@ -78,14 +83,10 @@ def _get_overview_value(source: Any, key: str) -> str:
 
 
 def _add_architecture_section(document: Document, overview_data: Any):
-    sub_heading = document.add_paragraph()
-    sub_run = sub_heading.add_run("2.2 Product Architecture Overview")
-    sub_run.font.size = Pt(18)
-    sub_run.font.bold = True
+    sub_heading = add_heading(document, "2.2 Product Architecture Overview", 2)
     sub_heading.space_after = Pt(6)
 
-    reference = document.add_paragraph("[Reference: Clause 6.2.1.5 - Product architecture overview]")
-    reference.runs[0].font.bold = True
+    reference = add_clause_reference(document, "[Reference: Clause 6.2.1.5 - Product architecture overview]")
     reference.space_after = Pt(6)
 
     intro = document.add_paragraph(
@@ -160,17 +161,13 @@ def _add_architecture_hint(document: Document, title: str, hint: str):
     detail.space_after = Pt(6)
 
 
-def _add_third_party_section(document: Document, overview_data: Any):
+def _add_third_party_section(document: Document, overview_data: Any, user_id: Optional[str]):
     section_data = _get_nested_value(overview_data, "third_party_components") or {}
     document.add_page_break()
-    heading = document.add_paragraph()
-    run = heading.add_run("2.3 Third-Party Components")
-    run.font.size = Pt(18)
-    run.font.bold = True
+    heading = add_heading(document, "2.3 Third-Party Components", 2)
     heading.space_after = Pt(4)
 
-    reference = document.add_paragraph("[Reference: Clause 7.11 - Third-party component cybersecurity management]")
-    reference.runs[0].font.bold = True
+    reference = add_clause_reference(document, "[Reference: Clause 7.11 - Third-party component cybersecurity management]")
     reference.space_after = Pt(6)
 
     intro = document.add_paragraph(
@@ -180,7 +177,12 @@ def _add_third_party_section(document: Document, overview_data: Any):
     intro.space_after = Pt(6)
 
     entries = _extract_third_party_entries(section_data)
-    if entries:
+    sbom_id = _get_overview_value(section_data, "sbom_id")
+    sbom_entries = iter_sbom_entries(sbom_id, user_id) if sbom_id and user_id else iter(())
+    first_sbom_entry = next(sbom_entries, None)
+    if entries or first_sbom_entry:
+        if first_sbom_entry:
+            entries = chain(entries, [first_sbom_entry], sbom_entries)
         _render_components_table(document, entries)
     else:
         placeholder = document.add_paragraph(
@@ -241,21 +243,10 @@ def _extract_third_party_entries(section_data: Any) -> List[dict]:
     return extracted
 
 
-def _render_components_table(document: Document, entries: List[dict]):
-    headers = ["Component Name", "Type", "Version", "Supplier", "Purpose", "License"]
-    table = document.add_table(rows=1, cols=len(headers))
-    table.style = "Table Grid"
-    header_cells = table.rows[0].cells
-    for idx, label in enumerate(headers):
-        paragraph = header_cells[idx].paragraphs[0]
-        run = paragraph.add_run(label)
-        run.font.bold = True
-
-    for entry in entries:
-        row_cells = table.add_row().cells
-        row_cells[0].text = entry.get("component_name") or ""
-        row_cells[1].text = entry.get("component_type") or ""
-        row_cells[2].text = entry.get("version") or ""
-        row_cells[3].text = entry.get("supplier") or ""
-        row_cells[4].text = entry.get("purpose") or ""
-        row_cells[5].text = entry.get("license") or ""
+def _render_components_table(document: Document, entries: Iterable[dict]):
+    # Entries may stream from the SBOM store; rows are written as they arrive
+    append_bulk_table(
+        document,
+        COMPONENT_HEADERS,
+        ([entry.get(field) or "" for field in COMPONENT_FIELDS] for entry in entries),
+    )
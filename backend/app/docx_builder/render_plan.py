@@ -0,0 +1,289 @@
+"""Serializable render plans for converted HTML.
+
+``html_converter`` compiles an HTML fragment into a flat list of document
+operations with every style already resolved. A plan is plain data (strings,
+numbers, lists), so it can be cached, stored as JSON on disk or in the
+database, compared with an earlier version and replayed against any
+document without touching the HTML again.
+
+A plan is a sequence of blocks, one per top-level HTML element; each block
+is a sequence of ops:
+
+- ``["p", indent_pt, alignment]``: start a paragraph
+- ``["li", list_id, ordered, start, level, indent_pt]``: start a list item
+  paragraph; ``list_id`` identifies the HTML list within the block
+- ``["r", text, style]``: add a run to the current paragraph
+- ``["br"]``: add a line-break run
+- ``["img", src, width_mm, height_mm, style]``: inline picture run
+- ``["bimg", src, indent_pt, alignment, width_mm, height_mm]``: picture in
+  its own paragraph
+- ``["tbl", rows, cols, cells, widths]``: table; ``cells`` holds
+  ``[row, col, is_header, ops]`` and ``widths`` ``[col, width_mm]``; a
+  cell's ``ops`` start in the cell's own paragraph and may add further
+  ``p`` and ``li`` paragraphs (lists inside cells)
+
+``style`` is ``[bold, italic, underline, strike, color_hex, size_emu]`` or
+None, and ``alignment`` is a ``WD_PARAGRAPH_ALIGNMENT`` value or None.
+Images are resolved when the plan is replayed; compiled plans reference
+them as ``asset://<sha256>`` rather than embedding data URIs; inline images
+are only held in the in-memory asset cache, so a plan whose images were
+evicted (``assets_available``) has to be compiled again. List items
+of every plan replayed into a document share the document's numbering
+context (``numbering.get_list_numbering``).
+"""
+import difflib
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from docx import Document
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from docx.shared import Emu, Mm, Pt
+
+from app.utils.asset_store import asset_available, parse_asset_reference, resolve_image_source
+from app.utils.style_parser import apply_styles_to_run, parse_color
+from .numbering import get_list_numbering
+from .styles import TABLE_HEADER
+
+
+PLAN_FORMAT_VERSION = 3
+
+PARAGRAPH = "p"
+RUN = "r"
+BREAK = "br"
+IMAGE = "img"
+BLOCK_IMAGE = "bimg"
+LIST_ITEM = "li"
+TABLE = "tbl"
+
+Op = Sequence[Any]
+Block = Sequence[Op]
+
+
+def encode_style(styles: Dict[str, Any]) -> Optional[list]:
+    """Encode a style dictionary (see ``style_parser``) as plan data."""
+    color = styles.get("color")
+    size = styles.get("size")
+    encoded = [
+        bool(styles.get("bold")),
+        bool(styles.get("italic")),
+        bool(styles.get("underline")),
+        bool(styles.get("strike")),
+        str(color) if color else None,
+        int(size) if size else None,
+    ]
+    return encoded if any(encoded) else None
+
+
+@lru_cache(maxsize=1024)
+def _decode_style(style: Tuple[Any, ...]) -> Dict[str, Any]:
+    bold, italic, underline, strike, color, size = style
+    return {
+        "bold": bold,
+        "italic": italic,
+        "underline": underline,
+        "strike": strike,
+        "color": parse_color(f"#{color}"),
+        "size": Emu(size) if size else None,
+    }
+
+
+def encode_alignment(alignment: Optional[WD_PARAGRAPH_ALIGNMENT]) -> Optional[int]:
+    return int(alignment) if alignment is not None else None
+
+
+def _format_paragraph(paragraph, indent: Optional[float], alignment: Optional[int]) -> None:
+    if indent:
+        paragraph.paragraph_format.left_indent = Pt(indent)
+    if alignment is not None:
+        paragraph.alignment = WD_PARAGRAPH_ALIGNMENT(alignment)
+
+
+def _apply_style(run, style: Optional[Sequence[Any]]) -> None:
+    if style:
+        apply_styles_to_run(run, _decode_style(tuple(style)))
+
+
+def _add_picture(run, image_data: bytes, width_mm: Optional[float], height_mm: Optional[float]) -> None:
+    kwargs = {}
+    if width_mm:
+        kwargs["width"] = Mm(width_mm)
+    if not kwargs and height_mm:
+        kwargs["height"] = Mm(height_mm)
+    try:
+        run.add_picture(BytesIO(image_data), **kwargs)
+    except Exception:
+        pass  # Skip invalid images
+
+
+def _replay_inline(paragraph, op: Op) -> None:
+    kind = op[0]
+    if kind == RUN:
+        _apply_style(paragraph.add_run(op[1]), op[2])
+    elif kind == BREAK:
+        paragraph.add_run().add_break()
+    elif kind == IMAGE:
+        image_data = resolve_image_source(op[1])
+        if image_data:
+            run = paragraph.add_run()
+            _apply_style(run, op[4])
+            _add_picture(run, image_data, op[2], op[3])
+
+
+def _replay_paragraphs(document: Document, container, ops: Sequence[Op], paragraph=None) -> None:
+    """
+    Replay paragraph, list item and inline ops into a document or table cell.
+
+    Args:
+        document: Document owning the numbering definitions
+        container: Document or table cell new paragraphs are added to
+        ops: Ops to replay
+        paragraph: Empty paragraph the first content goes into (a table
+            cell's own paragraph)
+    """
+    spare = paragraph is not None
+    scope = None
+    for op in ops:
+        kind = op[0]
+        if kind in (PARAGRAPH, LIST_ITEM):
+            if not spare:
+                paragraph = container.add_paragraph()
+            spare = False
+            if kind == PARAGRAPH:
+                _format_paragraph(paragraph, op[1], op[2])
+            else:
+                _, list_id, ordered, start, level, indent = op
+                _format_paragraph(paragraph, indent, None)
+                lists = get_list_numbering(document)
+                if scope is None:
+                    scope = lists.new_scope()
+                lists.apply(paragraph, (scope, list_id), ordered, start, level)
+        elif kind == BLOCK_IMAGE:
+            _, src, indent, alignment, width_mm, height_mm = op
+            image_data = resolve_image_source(src)
+            if image_data:
+                image_paragraph = container.add_paragraph()
+                _format_paragraph(image_paragraph, indent, alignment)
+                _add_picture(image_paragraph.add_run(), image_data, width_mm, height_mm)
+        elif kind == TABLE:
+            _replay_table(document, op)
+        else:
+            spare = False
+            _replay_inline(paragraph, op)
+
+
+def _replay_table(document: Document, op: Op) -> None:
+    _, rows, cols, cells, widths = op
+    table = document.add_table(rows=rows, cols=cols)
+    table.style = "Table Grid"
+
+    for row_index, col_index, is_header, cell_ops in cells:
+        cell = table.cell(row_index, col_index)
+        paragraph = cell.paragraphs[0]
+        paragraph.text = ""
+        _replay_paragraphs(document, cell, cell_ops, paragraph)
+        if is_header:
+            for cell_paragraph in cell.paragraphs:
+                for run in cell_paragraph.runs:
+                    run._r.style = TABLE_HEADER.style_id
+
+    for col_index, width_mm in widths:
+        column_length = Mm(width_mm)
+        table.columns[col_index].width = column_length
+        for row in table.rows:
+            row.cells[col_index].width = column_length
+
+
+def replay_block(document: Document, block: Block) -> None:
+    """Apply one block of a render plan to a document."""
+    _replay_paragraphs(document, document, block)
+
+
+@dataclass(frozen=True)
+class RenderPlan:
+    """
+    Compiled, replayable form of an HTML fragment.
+
+    Attributes:
+        blocks: One op sequence per top-level HTML element
+    """
+    blocks: Tuple[Block, ...]
+
+    def replay(self, document: Document) -> None:
+        """Append the plan's content to a document."""
+        for block in self.blocks:
+            replay_block(document, block)
+
+    @cached_property
+    def asset_digests(self) -> Tuple[str, ...]:
+        """Digests of the ``asset://`` images the plan references."""
+        digests = []
+
+        def collect(ops: Sequence[Op]) -> None:
+            for op in ops:
+                if op[0] in (IMAGE, BLOCK_IMAGE):
+                    digest = parse_asset_reference(op[1])
+                    if digest:
+                        digests.append(digest)
+                elif op[0] == TABLE:
+                    for cell in op[3]:
+                        collect(cell[3])
+
+        for block in self.blocks:
+            collect(block)
+        return tuple(dict.fromkeys(digests))
+
+    def assets_available(self) -> bool:
+        """Whether every referenced image can still be loaded."""
+        return all(asset_available(digest) for digest in self.asset_digests)
+
+    @property
+    def size(self) -> int:
+        """Length of the serialized plan, used to bound plan caches."""
+        return len(self.to_json())
+
+    def block_digests(self) -> List[str]:
+        """Content digest of each block, for change detection."""
+        return [
+            hashlib.sha256(json.dumps(block, separators=(",", ":")).encode("utf-8")).hexdigest()
+            for block in self.blocks
+        ]
+
+    def to_json(self) -> str:
+        """Serialize the plan for storage."""
+        return json.dumps(
+            {"version": PLAN_FORMAT_VERSION, "blocks": self.blocks},
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, data: str) -> "RenderPlan":
+        """
+        Load a plan stored with ``to_json``.
+
+        Raises:
+            ValueError: If the data is not a plan of the current format
+        """
+        payload = json.loads(data)
+        if not isinstance(payload, dict) or payload.get("version") != PLAN_FORMAT_VERSION:
+            raise ValueError("Unsupported render plan format")
+        return cls(blocks=tuple(payload["blocks"]))
+
+
+def diff_plans(old: RenderPlan, new: RenderPlan) -> List[Tuple[str, int, int, int, int]]:
+    """
+    Compare two plans block by block.
+
+    Args:
+        old: Previous plan
+        new: Current plan
+
+    Returns:
+        ``difflib`` opcodes ``(tag, old_start, old_end, new_start, new_end)``
+        excluding unchanged ranges
+    """
+    matcher = difflib.SequenceMatcher(a=old.block_digests(), b=new.block_digests(), autojunk=False)
+    return [opcode for opcode in matcher.get_opcodes() if opcode[0] != "equal"]
@@ -0,0 +1,189 @@
+"""Security requirement rendering from the requirement catalogue.
+
+Requirements selected by catalogue id (family table, component, optional
+element and parameter values) are written straight into the document from
+the cached family tables, without rendering them to HTML on the client and
+parsing that HTML back here.
+
+The assurance requirements of an EAL package are fixed catalogue data, so
+each package is rendered once into a fragment and reused until one of the
+assurance tables is invalidated.
+"""
+import threading
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from docx import Document
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.utils.assurance_packages import get_eal_package, normalize_eal
+from app.utils.catalogue import (
+    ASSURANCE_MODELS,
+    CatalogueComponent,
+    CatalogueElement,
+    catalogue_version,
+    get_catalogue_component,
+)
+from app.utils.element_templates import get_element_template
+from .fragments import Fragment, append_fragment, append_static, compile_fragment
+from .styles import add_heading
+
+REQUIREMENT_HEADING_LEVEL = 3
+
+ASSURANCE_TABLES = tuple(model.family_table for model in ASSURANCE_MODELS)
+
+
+def _get_value(source: Any, key: str):
+    if isinstance(source, dict):
+        return source.get(key)
+    return getattr(source, key, None)
+
+
+def _add_component_heading(document: Document, component: CatalogueComponent) -> None:
+    title = f"{component.component} {component.name}".strip()
+    append_static(
+        document,
+        ("requirements.heading", title),
+        lambda target: add_heading(target, title, REQUIREMENT_HEADING_LEVEL),
+    )
+
+
+def _add_missing_note(document: Document, reference: str) -> None:
+    paragraph = document.add_paragraph()
+    paragraph.add_run(f"[{reference} is not in the requirement catalogue]").italic = True
+
+
+def _add_element(document: Document, element: CatalogueElement, values: Sequence[str]) -> int:
+    """Write one element with its operations completed; returns the values used."""
+    template = get_element_template(element.element, element.text)
+    paragraph = document.add_paragraph()
+    paragraph.add_run(f"{element.element} ").bold = True
+    for text, is_value in template.segments(values):
+        run = paragraph.add_run(text)
+        if is_value:
+            run.italic = True
+    return len(template.slots)
+
+
+def append_catalogue_requirements(document: Document, requirements: Sequence[Any]) -> None:
+    """
+    Render catalogue-selected requirements into a document.
+
+    Each requirement names a family ``table``, a ``component`` and
+    optionally a single ``element``; its ``parameters`` complete the
+    operations of the rendered elements in order (blank values keep the
+    operation text). Element texts are filled through their compiled
+    templates. Consecutive requirements of the same component share one
+    heading.
+
+    Args:
+        document: Target document
+        requirements: ``CatalogueRequirementRef`` models or equivalent dicts
+    """
+    previous_component = None
+    for requirement in requirements:
+        table = _get_value(requirement, "table")
+        component_id = _get_value(requirement, "component") or ""
+        element_id = (_get_value(requirement, "element") or "").strip()
+
+        component = get_catalogue_component(table, component_id)
+        if component is None:
+            _add_missing_note(document, component_id)
+            previous_component = None
+            continue
+
+        if component is not previous_component:
+            _add_component_heading(document, component)
+            previous_component = component
+
+        if element_id:
+            element = component.element(element_id)
+            if element is None:
+                _add_missing_note(document, element_id)
+                continue
+            elements = (element,)
+        else:
+            elements = component.elements
+
+        values = list(_get_value(requirement, "parameters") or ())
+        for element in elements:
+            values = values[_add_element(document, element, values):]
+
+
+def _package_requirements(eal: str):
+    # Assurance component ids name their table: ADV_FSP.1 -> adv_db
+    return [
+        {"table": f"{component[:3].lower()}_db", "component": component}
+        for component in get_eal_package(eal)
+    ]
+
+
+class _EalPackageCache:
+    """Rendered EAL packages, keyed by EAL and checked against the assurance table versions."""
+
+    def __init__(self):
+        self._fragments: Dict[str, Tuple[Tuple[int, ...], Fragment]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, eal: str) -> Fragment:
+        version = catalogue_version(ASSURANCE_TABLES)
+        cached = self._fragments.get(eal)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        with self._lock:
+            cached = self._fragments.get(eal)
+            if cached is None or cached[0] != version:
+                fragment = compile_fragment(
+                    lambda target: append_catalogue_requirements(target, _package_requirements(eal))
+                )
+                cached = self._fragments[eal] = (version, fragment)
+        return cached[1]
+
+
+_eal_packages = _EalPackageCache()
+
+
+def eal_package_available(selected_eal: Optional[str]) -> bool:
+    """
+    Check that every component of an EAL package is in the catalogue.
+
+    A missing or unreadable catalogue (e.g. no ``catalogue_requirements``
+    table yet) counts as unavailable, so callers fall back to the client
+    previews instead of rendering missing-requirement notes.
+
+    Args:
+        selected_eal: EAL label, e.g. ``EAL2`` or ``EAL 4+``
+
+    Returns:
+        True if the label names an EAL package whose components all resolve
+    """
+    eal = normalize_eal(selected_eal)
+    if eal is None:
+        return False
+    try:
+        return all(
+            get_catalogue_component(requirement["table"], requirement["component"]) is not None
+            for requirement in _package_requirements(eal)
+        )
+    except SQLAlchemyError:
+        return False
+
+
+def append_eal_package(document: Document, selected_eal: Optional[str]) -> bool:
+    """
+    Append the assurance requirements of an EAL package.
+
+    The package is rendered from the assurance tables on first use and
+    spliced in from the cached fragment afterwards.
+
+    Args:
+        document: Target document
+        selected_eal: EAL label, e.g. ``EAL2`` or ``EAL 4+``
+
+    Returns:
+        False if the label names no EAL package (nothing is appended)
+    """
+    eal = normalize_eal(selected_eal)
+    if eal is None:
+        return False
+    append_fragment(document, _eal_packages.get(eal))
+    return True
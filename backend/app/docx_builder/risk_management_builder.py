@@ -1,11 +1,34 @@
-"""Risk Management Elements section builder."""
-from typing import Iterable, Optional
-import re
+"""Risk Management Elements section builder.
 
-from docx import Document
-from docx.shared import Pt
+Section 5 is described declaratively by ``RISK_MANAGEMENT_SPEC`` (see
+``section_spec``) and rendered by a renderer compiled once at import. The
+payload is read once per request into typed rows (``EvidenceRow``,
+``AssessmentRow``, table row tuples) that the table writers consume as-is.
+"""
+from functools import partial
+from typing import Callable, Iterable, List, NamedTuple, Optional
 
-from .html_converter import append_html_to_document
+from docx import Document
+from docx.shared import RGBColor
+
+from app.utils.html_text import html_to_text
+
+from .section_spec import (
+    HtmlBlock,
+    Heading,
+    InlineRequirement,
+    Items,
+    PageBreak,
+    QuoteRequirement,
+    Reference,
+    Section,
+    Text,
+    Verdict,
+    compile_spec,
+    extract_text as _extract_value,
+    render_spec,
+)
+from .table_writer import StaticRow, TableCell, append_bulk_table
 
 EVIDENCE_STATUS_LABELS = {
     "complete": "Complete",
@@ -28,12 +51,24 @@ OVERALL_VERDICT_LABELS = {
     "not_assessed": "Not Assessed",
 }
 
+VERDICT_COLORS = {
+    "pass": RGBColor(0, 128, 0),  # Green
+    "fail": RGBColor(255, 0, 0),  # Red
+    "partial": RGBColor(255, 165, 0),  # Orange
+}
+
 NC_SEVERITY_LABELS = {
     "minor": "Minor",
     "major": "Major",
     "critical": "Critical",
 }
 
+# Severity -> (font color, bold) for non-conformity table cells
+NC_SEVERITY_STYLES = {
+    "critical": ("FF0000", True),  # Red
+    "major": ("FFA500", False),  # Orange
+}
+
 # Product Context Assessment Requirements (Clause 6.2)
 PRODUCT_CONTEXT_REQUIREMENTS = [
     # 6.2.2 Input Documentation
@@ -104,218 +139,50 @@ def append_risk_management_section(
     """Append Section 5 - Risk Management Elements to the document."""
     if not payload:
         return
+    render_spec(_RISK_MANAGEMENT_RENDERER, document, payload, product_name=product_name)
 
-    general_html = _extract_value(payload, "general_approach_html")
-    product_context_payload = getattr(payload, "product_context", None)
-    product_function_payload = getattr(payload, "product_function", None)
-    operational_environment_payload = getattr(payload, "operational_environment", None)
-    product_architecture_payload = getattr(payload, "product_architecture", None)
-    product_user_description_payload = getattr(payload, "product_user_description", None)
-    product_context_assessment_payload = getattr(payload, "product_context_assessment", None)
-    risk_assessment_methodology_payload = getattr(payload, "risk_assessment_methodology", None)
-    has_product_context = _product_context_has_content(product_context_payload)
-    has_product_function = _product_function_has_content(product_function_payload)
-    has_operational_environment = _operational_environment_has_content(operational_environment_payload)
-    has_product_architecture = _product_architecture_has_content(product_architecture_payload)
-    has_product_user_description = _product_user_description_has_content(product_user_description_payload)
-    has_product_context_assessment = _product_context_assessment_has_content(product_context_assessment_payload)
-    has_risk_assessment_methodology = _risk_assessment_methodology_has_content(risk_assessment_methodology_payload)
-    risk_acceptance_criteria_payload = getattr(payload, "risk_acceptance_criteria", None)
-    has_risk_acceptance_criteria = _risk_acceptance_criteria_has_content(risk_acceptance_criteria_payload)
-    risk_acceptance_criteria_assessment_payload = getattr(payload, "risk_acceptance_criteria_assessment", None)
-    has_risk_acceptance_criteria_assessment = _risk_acceptance_criteria_assessment_has_content(risk_acceptance_criteria_assessment_payload)
-
-    if not general_html and not has_product_context and not has_product_function and not has_operational_environment and not has_product_architecture and not has_product_user_description and not has_product_context_assessment and not has_risk_assessment_methodology and not has_risk_acceptance_criteria and not has_risk_acceptance_criteria_assessment:
-        return
-
-    document.add_page_break()
-
-    # Section 5 heading
-    heading = document.add_paragraph()
-    heading_run = heading.add_run("5. RISK MANAGEMENT ELEMENTS")
-    heading_run.font.size = Pt(20)
-    heading_run.font.bold = True
-    heading.space_after = Pt(8)
-
-    # Main clause reference
-    reference = document.add_paragraph("[Reference: Clause 6 - Risk management elements]")
-    reference.runs[0].font.bold = True
-    reference.space_after = Pt(10)
-
-    if general_html:
-        # 5.1 subheading
-        subheading = document.add_paragraph()
-        subheading_run = subheading.add_run("5.1 General Approach to Risk Management")
-        subheading_run.font.size = Pt(18)
-        subheading_run.font.bold = True
-        subheading.space_before = Pt(6)
-        subheading.space_after = Pt(6)
-
-        # Clause reference for 5.1
-        clause_reference = document.add_paragraph("[Reference: Clause 6.1 - General]")
-        clause_reference.runs[0].font.bold = True
-        clause_reference.space_after = Pt(10)
-
-        # Intro paragraph with product name
-        intro_text = (
-            f"This section describes how {product_name} applies risk management throughout its lifecycle "
-            "to ensure an appropriate level of cybersecurity."
-        )
-        intro_para = document.add_paragraph(intro_text)
-        intro_para.space_after = Pt(10)
-
-        # Risk Management Framework Applied label
-        framework_label = document.add_paragraph()
-        framework_run = framework_label.add_run("Risk Management Framework Applied:")
-        framework_run.font.bold = True
-        framework_label.space_after = Pt(6)
-
-        # WYSIWYG content
-        append_html_to_document(document, general_html)
-
-    if has_product_context:
-        _append_product_context_section(document, product_context_payload, product_name)
-
-    if has_product_function:
-        _append_product_function_section(document, product_function_payload)
 
-    if has_operational_environment:
-        _append_operational_environment_section(document, operational_environment_payload)
+class EvidenceRow(NamedTuple):
+    """Normalized evidence entry, in table column order."""
+    reference: Optional[str]
+    title: Optional[str]
+    status_label: str
+    notes: str
 
-    if has_product_architecture:
-        _append_product_architecture_section(document, product_architecture_payload)
 
-    if has_product_user_description:
-        _append_product_user_description_section(document, product_user_description_payload)
+class AssessmentRow(NamedTuple):
+    """Normalized checklist assessment (comments stripped and truncated)."""
+    id: Optional[str]
+    status: str
+    evidence_ref: Optional[str]
+    comments: str
+    filled: bool
 
-    if has_product_context_assessment:
-        _append_product_context_assessment_section(document, product_context_assessment_payload)
 
-    if has_risk_assessment_methodology:
-        _append_risk_assessment_methodology_section(document, risk_assessment_methodology_payload)
+EVIDENCE_HEADERS = ["Evidence Reference", "Title / Artifact", "Status", "Notes"]
+HARDWARE_HEADERS = ["Component Name", "Function", "Interfaces", "Security Functions"]
+SOFTWARE_HEADERS = ["Type", "Function", "Third-Party", "Interfaces", "Security Functions"]
+RDPS_HEADERS = ["RDPS Component", "Provider", "Function", "Location", "Dev Responsibility", "Op Responsibility"]
+INTERFACE_HEADERS = ["Interface", "Component A", "Component B", "Protocol", "Authentication", "Data Exchanged"]
+CHECKLIST_HEADERS = ["ID", "Requirement", "Evidence", "Status", "Comments"]
+NON_CONFORMITY_HEADERS = ["NC ID", "Requirement", "Description", "Severity", "Corrective Action"]
 
-    if has_risk_acceptance_criteria:
-        _append_risk_acceptance_criteria_section(document, risk_acceptance_criteria_payload)
 
-    if has_risk_acceptance_criteria_assessment:
-        _append_risk_acceptance_criteria_assessment_section(document, risk_acceptance_criteria_assessment_payload)
-
-
-def _append_product_context_section(
-    document: Document, payload: Optional[object], product_name: str = "[Product Name]"
-) -> None:
-    from docx.shared import RGBColor
-    
-    # Start 5.2 Product Context on a new page
-    document.add_page_break()
-    
-    heading = document.add_paragraph()
-    heading_run = heading.add_run("5.2 Product Context")
-    heading_run.font.size = Pt(18)
-    heading_run.font.bold = True
-    heading.space_after = Pt(6)
+def _table(headers: List[str]) -> Callable[[Document, list], None]:
+    """Items writer for prepared items that are ready-made table rows."""
+    def write(document: Document, rows: list) -> None:
+        append_bulk_table(document, headers, rows)
+    return write
 
-    reference = document.add_paragraph("[Reference: Clause 6.2 - Product Context]")
-    reference.runs[0].font.bold = True
-    reference.space_after = Pt(10)
 
-    subsection = document.add_paragraph()
-    subsection_run = subsection.add_run("5.2.1 Intended Purpose and Reasonably Foreseeable Use")
-    subsection_run.font.size = Pt(16)
-    subsection_run.font.bold = True
-    subsection.space_before = Pt(6)
-    subsection.space_after = Pt(4)
-
-    clause_reference = document.add_paragraph(
-        "[Reference: Clause 6.2.1.2 - Product intended purpose and reasonable foreseeable use]"
-    )
-    clause_reference.runs[0].font.bold = True
-    clause_reference.space_after = Pt(8)
-
-    # Blue requirement section
-    req_para = document.add_paragraph()
-    req_run = req_para.add_run("Requirement [Clause 6.2.3]:")
-    req_run.font.color.rgb = RGBColor(0, 0, 255)
-    req_para.space_after = Pt(4)
-    
-    req_text = document.add_paragraph(
-        '"The product context shall be identified and recorded based on:'
-    )
-    req_text.runs[0].font.color.rgb = RGBColor(0, 0, 255)
-    req_text.space_after = Pt(2)
-    
-    bullets = [
-        "the product's IPRFU;",
-        "the product's functions;",
-        "the product's operational environment of use;",
-        "the product's architecture overview;",
-        "the product's user descriptions."
-    ]
-    for bullet in bullets:
-        bullet_para = document.add_paragraph(bullet, style='List Bullet')
-        bullet_para.runs[0].font.color.rgb = RGBColor(0, 0, 255)
-        bullet_para.space_after = Pt(2)
-    
-    closing_quote = document.add_paragraph('"')
-    closing_quote.runs[0].font.color.rgb = RGBColor(0, 0, 255)
-    closing_quote.space_after = Pt(12)
-
-    _append_product_context_block(
-        document,
-        "Intended Purpose:",
-        _extract_value(payload, "intended_purpose_html"),
-    )
-    _append_product_context_block(
-        document,
-        "Reasonably Foreseeable Use & Misuse:",
-        _extract_value(payload, "foreseeable_use_html"),
-    )
+def _rows(*fields: str) -> Callable[[Optional[Iterable[object]]], list]:
+    """Items preparer that extracts one text cell per field."""
+    def prepare(entries: Optional[Iterable[object]]) -> list:
+        return [tuple(_extract_value(entry, field) for field in fields) for entry in entries or []]
+    return prepare
 
-    _append_evidence_tracker(document, getattr(payload, "evidence_entries", None))
 
-
-def _append_product_context_block(document: Document, title: str, html_content: Optional[str]) -> None:
-    if not html_content:
-        return
-    subheading = document.add_paragraph()
-    subheading_run = subheading.add_run(title)
-    subheading_run.font.size = Pt(13)
-    subheading_run.font.bold = True
-    subheading.space_before = Pt(6)
-    subheading.space_after = Pt(4)
-    append_html_to_document(document, html_content)
-
-
-def _append_evidence_tracker(document: Document, payload: Optional[Iterable[object]]) -> None:
-    entries = _normalize_evidence_entries(payload)
-    if not entries:
-        return
-
-    heading = document.add_paragraph()
-    heading_run = heading.add_run("Evidence Reference:")
-    heading_run.font.size = Pt(13)
-    heading_run.font.bold = True
-    heading.space_before = Pt(10)
-    heading.space_after = Pt(4)
-
-    table = document.add_table(rows=1, cols=4)
-    table.style = "Table Grid"
-    headers = ["Evidence Reference", "Title / Artifact", "Status", "Notes"]
-    header_cells = table.rows[0].cells
-    for idx, label in enumerate(headers):
-        paragraph = header_cells[idx].paragraphs[0]
-        run = paragraph.add_run(label)
-        run.font.bold = True
-
-    for entry in entries:
-        row = table.add_row().cells
-        row[0].text = entry["reference"] or ""
-        row[1].text = entry["title"] or ""
-        row[2].text = entry["status_label"]
-        row[3].text = entry["notes"] or ""
-
-
-def _normalize_evidence_entries(payload: Optional[Iterable[object]]):
+def _normalize_evidence_entries(payload: Optional[Iterable[object]]) -> List[EvidenceRow]:
     if not payload:
         return []
     normalized = []
@@ -323,1177 +190,373 @@ def _normalize_evidence_entries(payload: Optional[Iterable[object]]):
         reference = _extract_value(entry, "reference_id")
         title = _extract_value(entry, "title")
         status = _extract_value(entry, "status") or "not_started"
-        notes = _strip_html(_extract_value(entry, "notes_html"))
+        notes = html_to_text(_extract_value(entry, "notes_html"))
         if not any([reference, title, notes]):
             continue
         normalized.append(
-            {
-                "reference": reference,
-                "title": title,
-                "status_label": EVIDENCE_STATUS_LABELS.get(status, status.replace("_", " ").title()),
-                "notes": notes,
-            }
+            EvidenceRow(
+                reference,
+                title,
+                EVIDENCE_STATUS_LABELS.get(status, status.replace("_", " ").title()),
+                notes,
+            )
         )
     return normalized
 
 
-def _product_context_has_content(payload: Optional[object]) -> bool:
-    if not payload:
-        return False
-    return any(
-        [
-            bool(_extract_value(payload, "intended_purpose_html")),
-            bool(_extract_value(payload, "specific_intended_uses_html")),
-            bool(_extract_value(payload, "foreseeable_use_html")),
-            bool(_normalize_evidence_entries(getattr(payload, "evidence_entries", None))),
-        ]
-    )
-
-
-def _product_function_has_content(payload: Optional[object]) -> bool:
-    if not payload:
-        return False
-    return any(
-        [
-            bool(_extract_value(payload, "primary_functions_html")),
-            bool(_extract_value(payload, "security_functions_html")),
-            bool(_normalize_evidence_entries(getattr(payload, "evidence_entries", None))),
-        ]
-    )
-
-
-def _operational_environment_has_content(payload: Optional[object]) -> bool:
-    if not payload:
-        return False
-    return any(
-        [
-            bool(_extract_value(payload, "physical_environment_html")),
-            bool(_extract_value(payload, "network_environment_html")),
-            bool(_extract_value(payload, "system_environment_html")),
-            bool(_extract_value(payload, "operational_constraints_html")),
-            bool(_extract_value(payload, "rdps_environment_html")),
-            bool(_normalize_evidence_entries(getattr(payload, "evidence_entries", None))),
-        ]
-    )
-
-
-def _product_architecture_has_content(payload: Optional[object]) -> bool:
-    if not payload:
-        return False
-    return any(
-        [
-            bool(_extract_value(payload, "architecture_description_html")),
-            bool(getattr(payload, "hardware_components", None)),
-            bool(getattr(payload, "software_components", None)),
-            bool(getattr(payload, "rdps_components", None)),
-            bool(getattr(payload, "component_interfaces", None)),
-            bool(_extract_value(payload, "architecture_diagram_html")),
-            bool(_normalize_evidence_entries(getattr(payload, "evidence_entries", None))),
-        ]
-    )
-
-
-def _product_user_description_has_content(payload: Optional[object]) -> bool:
-    if not payload:
-        return False
-    return any(
-        [
-            bool(_extract_value(payload, "user_description_html")),
-            getattr(payload, "no_rdps", False),
-            bool(_extract_value(payload, "rdps_considerations_html")),
-            bool(_normalize_evidence_entries(getattr(payload, "evidence_entries", None))),
-        ]
-    )
-
-
-def _product_context_assessment_has_content(payload: Optional[object]) -> bool:
-    """Check if Product Context Assessment section has content."""
-    if not payload:
-        return False
-    
-    # Check if any assessments have been filled in
-    assessments = getattr(payload, "assessments", None) or []
-    has_assessments = any(
-        _extract_value(a, "status") not in (None, "not_assessed") or
-        _extract_value(a, "evidence_id") or
-        _extract_value(a, "comments_html")
-        for a in assessments
-    )
-    
-    # Check if verdict is set
-    verdict = _extract_value(payload, "overall_verdict")
-    has_verdict = verdict and verdict != "not_assessed"
-    
-    # Check if summary has content
-    has_summary = bool(_extract_value(payload, "summary_of_findings_html"))
-    
-    # Check if there are non-conformities
-    non_conformities = getattr(payload, "non_conformities", None) or []
-    has_non_conformities = len(non_conformities) > 0
-    
-    return any([has_assessments, has_verdict, has_summary, has_non_conformities])
-
-
-def _risk_assessment_methodology_has_content(payload: Optional[object]) -> bool:
-    """Check if Risk Assessment Methodology section has content."""
-    if not payload:
-        return False
-    return any(
-        [
-            bool(_extract_value(payload, "methodology_description_html")),
-            bool(_extract_value(payload, "justification_html")),
-            bool(_extract_value(payload, "consistent_application_html")),
-            bool(_extract_value(payload, "individual_aggregate_risk_html")),
-            bool(_normalize_evidence_entries(getattr(payload, "evidence_entries", None))),
-        ]
-    )
-
-
-def _risk_acceptance_criteria_has_content(payload: Optional[object]) -> bool:
-    """Check if Risk Acceptance Criteria section has content."""
-    if not payload:
-        return False
-    return any(
-        [
-            bool(_extract_value(payload, "risk_acceptance_criteria_html")),
-            bool(_extract_value(payload, "regulatory_factors_html")),
-            bool(_extract_value(payload, "contractual_factors_html")),
-            bool(_extract_value(payload, "nature_of_known_risks_html")),
-            bool(_extract_value(payload, "nature_of_users_html")),
-            bool(_extract_value(payload, "nature_of_product_html")),
-            bool(_extract_value(payload, "state_of_the_art_html")),
-            bool(_normalize_evidence_entries(getattr(payload, "evidence_entries", None))),
-        ]
-    )
-
-
-def _risk_acceptance_criteria_assessment_has_content(payload: Optional[object]) -> bool:
-    """Check if Risk Acceptance Criteria Assessment section has content."""
-    if not payload:
-        return False
-    
-    # Check if any assessments have been filled in
-    assessments = getattr(payload, "assessments", None) or []
-    has_assessments = any(
-        _extract_value(a, "status") not in (None, "not_assessed") or
-        _extract_value(a, "evidence_id") or
-        _extract_value(a, "comments_html")
-        for a in assessments
-    )
-    
-    # Check if verdict is set
-    verdict = _extract_value(payload, "overall_verdict")
-    has_verdict = verdict and verdict != "not_assessed"
-    
-    # Check if summary has content
-    has_summary = bool(_extract_value(payload, "summary_of_findings_html"))
-    
-    # Check if there are non-conformities
-    non_conformities = getattr(payload, "non_conformities", None) or []
-    has_non_conformities = len(non_conformities) > 0
-    
-    return any([has_assessments, has_verdict, has_summary, has_non_conformities])
-
-
-def _append_product_function_section(document: Document, payload: Optional[object]) -> None:
-    if not payload:
-        return
-
-    # Start 5.2.2 Product Functions on a new page
-    document.add_page_break()
-
-    heading = document.add_paragraph()
-    heading_run = heading.add_run("5.2.2 Product Functions")
-    heading_run.font.size = Pt(16)
-    heading_run.font.bold = True
-    heading.space_after = Pt(6)
-
-    reference = document.add_paragraph("[Reference: Clause 6.2.1.3 - Product functions]")
-    reference.runs[0].font.bold = True
-    reference.space_after = Pt(10)
-
-    primary_html = _extract_value(payload, "primary_functions_html")
-    if primary_html:
-        append_html_to_document(document, primary_html)
-
-    security_html = _extract_value(payload, "security_functions_html")
-    if security_html:
-        security_label = document.add_paragraph()
-        security_run = security_label.add_run("Security Functions")
-        security_run.font.size = Pt(13)
-        security_run.font.bold = True
-        security_label.space_before = Pt(10)
-        security_label.space_after = Pt(6)
-        append_html_to_document(document, security_html)
-
-    _append_evidence_tracker(document, getattr(payload, "evidence_entries", None))
-
-
-def _append_operational_environment_section(document: Document, payload: Optional[object]) -> None:
-    from docx.shared import RGBColor
-    
-    if not payload:
-        return
-
-    # Start 5.2.3 Product Operational Environment on a new page
-    document.add_page_break()
-
-    heading = document.add_paragraph()
-    heading_run = heading.add_run("5.2.3 Product Operational Environment")
-    heading_run.font.size = Pt(16)
-    heading_run.font.bold = True
-    heading.space_after = Pt(6)
-
-    reference = document.add_paragraph("[Reference: Clause 6.2.1.4 - Product operational environment]")
-    reference.runs[0].font.bold = True
-    reference.space_after = Pt(10)
-
-    # Physical Environment
-    physical_html = _extract_value(payload, "physical_environment_html")
-    if physical_html:
-        _append_environment_block(document, "Physical Environment:", physical_html)
-
-    # Network Environment
-    network_html = _extract_value(payload, "network_environment_html")
-    if network_html:
-        _append_environment_block(document, "Network Environment:", network_html)
-
-    # System Environment
-    system_html = _extract_value(payload, "system_environment_html")
-    if system_html:
-        _append_environment_block(document, "System Environment:", system_html)
-
-    # Operational Constraints
-    constraints_html = _extract_value(payload, "operational_constraints_html")
-    if constraints_html:
-        _append_environment_block(document, "Operational Constraints:", constraints_html)
-
-    # RDPS Environment
-    rdps_html = _extract_value(payload, "rdps_environment_html")
-    if rdps_html:
-        rdps_label = document.add_paragraph()
-        rdps_run = rdps_label.add_run("RDPS Environment (if applicable):")
-        rdps_run.font.size = Pt(13)
-        rdps_run.font.bold = True
-        rdps_label.space_before = Pt(10)
-        rdps_label.space_after = Pt(4)
-
-        # Blue requirement text
-        req_para = document.add_paragraph()
-        req_run = req_para.add_run('Requirement [Clause 6.2.3]: ')
-        req_run.font.color.rgb = RGBColor(0, 0, 255)
-        req_run.font.italic = True
-        req_text = req_para.add_run(
-            '"If applicable, RDPS dependencies (e.g. a concise dependency map identifying operator, '
-            'data exchanged, trust/authentication, and defined degraded modes) shall be recorded."'
-        )
-        req_text.font.color.rgb = RGBColor(0, 0, 255)
-        req_text.font.italic = True
-        req_para.space_after = Pt(8)
-
-        append_html_to_document(document, rdps_html)
-
-    _append_evidence_tracker(document, getattr(payload, "evidence_entries", None))
-
-
-def _append_product_architecture_section(document: Document, payload: Optional[object]) -> None:
-    from docx.shared import RGBColor
-    
-    if not payload:
-        return
-
-    # Start 5.2.4 Product Architecture on a new page
-    document.add_page_break()
-
-    heading = document.add_paragraph()
-    heading_run = heading.add_run("5.2.4 Product Architecture Overview")
-    heading_run.font.size = Pt(16)
-    heading_run.font.bold = True
-    heading.space_after = Pt(6)
-
-    reference = document.add_paragraph("[Reference: Clause 6.2.3 - Product architecture]")
-    reference.runs[0].font.bold = True
-    reference.space_after = Pt(10)
-
-    # Architecture Description
-    arch_desc_html = _extract_value(payload, "architecture_description_html")
-    if arch_desc_html:
-        desc_label = document.add_paragraph()
-        desc_run = desc_label.add_run("Architecture Description:")
-        desc_run.font.size = Pt(13)
-        desc_run.font.bold = True
-        desc_label.space_before = Pt(6)
-        desc_label.space_after = Pt(4)
-        append_html_to_document(document, arch_desc_html)
-
-    # Hardware Components
-    no_hardware = getattr(payload, "no_hardware_components", False)
-    hardware_components = getattr(payload, "hardware_components", None) or []
-    
-    hw_label = document.add_paragraph()
-    hw_run = hw_label.add_run("Hardware Components:")
-    hw_run.font.size = Pt(13)
-    hw_run.font.bold = True
-    hw_label.space_before = Pt(10)
-    hw_label.space_after = Pt(4)
-
-    if no_hardware:
-        no_hw_para = document.add_paragraph("This product does not have any hardware component.")
-        no_hw_para.runs[0].font.italic = True
-        no_hw_para.space_after = Pt(8)
-    elif hardware_components:
-        _append_hardware_table(document, hardware_components)
-    else:
-        no_hw_para = document.add_paragraph("No hardware components specified.")
-        no_hw_para.runs[0].font.italic = True
-        no_hw_para.space_after = Pt(8)
-
-    # Software Components
-    software_components = getattr(payload, "software_components", None) or []
-    
-    sw_label = document.add_paragraph()
-    sw_run = sw_label.add_run("Software Components:")
-    sw_run.font.size = Pt(13)
-    sw_run.font.bold = True
-    sw_label.space_before = Pt(10)
-    sw_label.space_after = Pt(4)
-
-    if software_components:
-        _append_software_table(document, software_components)
-    else:
-        no_sw_para = document.add_paragraph("No software components specified.")
-        no_sw_para.runs[0].font.italic = True
-        no_sw_para.space_after = Pt(8)
-
-    # RDPS Components
-    no_rdps = getattr(payload, "no_rdps_components", False)
-    rdps_components = getattr(payload, "rdps_components", None) or []
-    
-    rdps_label = document.add_paragraph()
-    rdps_run = rdps_label.add_run("RDPS Components (if applicable):")
-    rdps_run.font.size = Pt(13)
-    rdps_run.font.bold = True
-    rdps_label.space_before = Pt(10)
-    rdps_label.space_after = Pt(4)
-
-    # Blue requirement text for RDPS
-    req_para = document.add_paragraph()
-    req_run = req_para.add_run("Requirement [Clause 6.2.3]: ")
-    req_run.font.color.rgb = RGBColor(0, 0, 255)
-    req_run.font.italic = True
-    req_text = req_para.add_run(
-        '"Where a product function relies on an RDPS, the manufacturer shall include the RDPS '
-        'in the product context determination. The product including its RDPS, third-party or not, '
-        'shall be treated as a single system."'
-    )
-    req_text.font.color.rgb = RGBColor(0, 0, 255)
-    req_text.font.italic = True
-    req_para.space_after = Pt(8)
-
-    if no_rdps:
-        no_rdps_para = document.add_paragraph("This product does not rely on any RDPS.")
-        no_rdps_para.runs[0].font.italic = True
-        no_rdps_para.space_after = Pt(8)
-    elif rdps_components:
-        _append_rdps_table(document, rdps_components)
-    else:
-        no_rdps_para = document.add_paragraph("No RDPS components specified.")
-        no_rdps_para.runs[0].font.italic = True
-        no_rdps_para.space_after = Pt(8)
-
-    # Component Interfaces
-    component_interfaces = getattr(payload, "component_interfaces", None) or []
-    
-    iface_label = document.add_paragraph()
-    iface_run = iface_label.add_run("Component Interfaces:")
-    iface_run.font.size = Pt(13)
-    iface_run.font.bold = True
-    iface_label.space_before = Pt(10)
-    iface_label.space_after = Pt(4)
-
-    if component_interfaces:
-        _append_interface_table(document, component_interfaces)
-    else:
-        no_iface_para = document.add_paragraph("No component interfaces specified.")
-        no_iface_para.runs[0].font.italic = True
-        no_iface_para.space_after = Pt(8)
-
-    # Architecture Diagram
-    arch_diagram_html = _extract_value(payload, "architecture_diagram_html")
-    if arch_diagram_html:
-        diagram_label = document.add_paragraph()
-        diagram_run = diagram_label.add_run("Architecture Diagram:")
-        diagram_run.font.size = Pt(13)
-        diagram_run.font.bold = True
-        diagram_label.space_before = Pt(10)
-        diagram_label.space_after = Pt(4)
-        append_html_to_document(document, arch_diagram_html)
-
-    _append_evidence_tracker(document, getattr(payload, "evidence_entries", None))
-
-
-def _append_hardware_table(document: Document, components: list) -> None:
-    table = document.add_table(rows=1, cols=4)
-    table.style = "Table Grid"
-    headers = ["Component Name", "Function", "Interfaces", "Security Functions"]
-    header_cells = table.rows[0].cells
-    for idx, label in enumerate(headers):
-        paragraph = header_cells[idx].paragraphs[0]
-        run = paragraph.add_run(label)
-        run.font.bold = True
-
-    for comp in components:
-        row = table.add_row().cells
-        row[0].text = _extract_value(comp, "component_name") or ""
-        row[1].text = _extract_value(comp, "function") or ""
-        row[2].text = _extract_value(comp, "interfaces") or ""
-        row[3].text = _extract_value(comp, "security_functions") or ""
-
-
-def _append_software_table(document: Document, components: list) -> None:
-    table = document.add_table(rows=1, cols=5)
-    table.style = "Table Grid"
-    headers = ["Type", "Function", "Third-Party", "Interfaces", "Security Functions"]
-    header_cells = table.rows[0].cells
-    for idx, label in enumerate(headers):
-        paragraph = header_cells[idx].paragraphs[0]
-        run = paragraph.add_run(label)
-        run.font.bold = True
-
-    for comp in components:
-        row = table.add_row().cells
-        row[0].text = _extract_value(comp, "type") or ""
-        row[1].text = _extract_value(comp, "function") or ""
+def _software_rows(components: Optional[Iterable[object]]) -> list:
+    rows = []
+    for comp in components or []:
         third_party = getattr(comp, "third_party", None) if hasattr(comp, "third_party") else comp.get("third_party", False)
-        row[2].text = "Yes" if third_party else "No"
-        row[3].text = _extract_value(comp, "interfaces") or ""
-        row[4].text = _extract_value(comp, "security_functions") or ""
-
-
-def _append_rdps_table(document: Document, components: list) -> None:
-    table = document.add_table(rows=1, cols=6)
-    table.style = "Table Grid"
-    headers = ["RDPS Component", "Provider", "Function", "Location", "Dev Responsibility", "Op Responsibility"]
-    header_cells = table.rows[0].cells
-    for idx, label in enumerate(headers):
-        paragraph = header_cells[idx].paragraphs[0]
-        run = paragraph.add_run(label)
-        run.font.bold = True
-
-    for comp in components:
-        row = table.add_row().cells
-        row[0].text = _extract_value(comp, "component") or ""
-        row[1].text = _extract_value(comp, "provider") or ""
-        row[2].text = _extract_value(comp, "function") or ""
-        row[3].text = _extract_value(comp, "location") or ""
-        row[4].text = _extract_value(comp, "development_responsibility") or ""
-        row[5].text = _extract_value(comp, "operation_responsibility") or ""
-
-
-def _append_interface_table(document: Document, interfaces: list) -> None:
-    table = document.add_table(rows=1, cols=6)
-    table.style = "Table Grid"
-    headers = ["Interface", "Component A", "Component B", "Protocol", "Authentication", "Data Exchanged"]
-    header_cells = table.rows[0].cells
-    for idx, label in enumerate(headers):
-        paragraph = header_cells[idx].paragraphs[0]
-        run = paragraph.add_run(label)
-        run.font.bold = True
-
-    for iface in interfaces:
-        row = table.add_row().cells
-        row[0].text = _extract_value(iface, "interface") or ""
-        row[1].text = _extract_value(iface, "component_a") or ""
-        row[2].text = _extract_value(iface, "component_b") or ""
-        row[3].text = _extract_value(iface, "protocol") or ""
-        row[4].text = _extract_value(iface, "authentication") or ""
-        row[5].text = _extract_value(iface, "data_exchanged") or ""
-
-
-def _append_environment_block(document: Document, title: str, html_content: Optional[str]) -> None:
-    if not html_content:
-        return
-    subheading = document.add_paragraph()
-    subheading_run = subheading.add_run(title)
-    subheading_run.font.size = Pt(13)
-    subheading_run.font.bold = True
-    subheading.space_before = Pt(10)
-    subheading.space_after = Pt(4)
-    append_html_to_document(document, html_content)
-
-
-def _extract_value(payload: object, field: str) -> Optional[str]:
-    if isinstance(payload, dict):
-        value = payload.get(field)
-    else:
-        value = getattr(payload, field, None)
-    if value and isinstance(value, str) and value.strip():
-        return value
-    return None
-
-
-def _strip_html(value: Optional[str]) -> str:
-    if not value:
-        return ""
-    return re.sub(r"<[^>]+>", " ", value).strip()
-
-
-def _append_product_user_description_section(document: Document, payload: Optional[object]) -> None:
-    """Append Section 5.2.5 Product User Description."""
-    from docx.shared import RGBColor
-    
-    if not payload:
-        return
-
-    # Start 5.2.5 Product User Description on a new page
-    document.add_page_break()
-
-    heading = document.add_paragraph()
-    heading_run = heading.add_run("5.2.5 Product User Description")
-    heading_run.font.size = Pt(16)
-    heading_run.font.bold = True
-    heading.space_after = Pt(6)
-
-    reference = document.add_paragraph("[Reference: Clause 6.2.1.6 - Product user description]")
-    reference.runs[0].font.bold = True
-    reference.space_after = Pt(10)
-
-    # User Description
-    user_desc_html = _extract_value(payload, "user_description_html")
-    if user_desc_html:
-        append_html_to_document(document, user_desc_html)
-
-    # RDPS Considerations
-    no_rdps = getattr(payload, "no_rdps", False)
-    rdps_label = document.add_paragraph()
-    rdps_run = rdps_label.add_run("RDPS Considerations:")
-    rdps_run.font.size = Pt(13)
-    rdps_run.font.bold = True
-    rdps_label.space_before = Pt(10)
-    rdps_label.space_after = Pt(4)
+        rows.append((
+            _extract_value(comp, "type"),
+            _extract_value(comp, "function"),
+            "Yes" if third_party else "No",
+            _extract_value(comp, "interfaces"),
+            _extract_value(comp, "security_functions"),
+        ))
+    return rows
 
-    if no_rdps:
-        no_rdps_para = document.add_paragraph("This product does not rely on any RDPS.")
-        no_rdps_para.runs[0].font.italic = True
-        no_rdps_para.space_after = Pt(8)
-    else:
-        rdps_html = _extract_value(payload, "rdps_considerations_html")
-        if rdps_html:
-            append_html_to_document(document, rdps_html)
-        else:
-            no_content_para = document.add_paragraph("No RDPS considerations specified.")
-            no_content_para.runs[0].font.italic = True
-            no_content_para.space_after = Pt(8)
 
-    # Evidence Reference
-    _append_evidence_tracker(document, getattr(payload, "evidence_entries", None))
-
-
-def _append_product_context_assessment_section(document: Document, payload: Optional[object]) -> None:
-    """Append Section 5.3 Product Context Assessment Summary."""
-    from docx.shared import RGBColor
-    
-    if not payload:
-        return
-
-    # Start 5.3 Product Context Assessment on a new page
-    document.add_page_break()
-
-    heading = document.add_paragraph()
-    heading_run = heading.add_run("5.3 Product Context Assessment Summary")
-    heading_run.font.size = Pt(18)
-    heading_run.font.bold = True
-    heading.space_after = Pt(6)
-
-    reference = document.add_paragraph("[Reference: Clause 6.2]")
-    reference.runs[0].font.bold = True
-    reference.space_after = Pt(10)
-
-    # Overall Verdict
-    verdict = _extract_value(payload, "overall_verdict") or "not_assessed"
-    verdict_label = OVERALL_VERDICT_LABELS.get(verdict, verdict.upper())
-    
-    verdict_heading = document.add_paragraph()
-    verdict_run = verdict_heading.add_run("Overall Verdict:")
-    verdict_run.font.size = Pt(13)
-    verdict_run.font.bold = True
-    verdict_heading.space_before = Pt(6)
-    verdict_heading.space_after = Pt(4)
-
-    verdict_para = document.add_paragraph()
-    verdict_value_run = verdict_para.add_run(verdict_label)
-    verdict_value_run.font.bold = True
-    verdict_value_run.font.size = Pt(12)
-    # Color code the verdict
-    if verdict == "pass":
-        verdict_value_run.font.color.rgb = RGBColor(0, 128, 0)  # Green
-    elif verdict == "fail":
-        verdict_value_run.font.color.rgb = RGBColor(255, 0, 0)  # Red
-    elif verdict == "partial":
-        verdict_value_run.font.color.rgb = RGBColor(255, 165, 0)  # Orange
-    verdict_para.space_after = Pt(10)
-
-    # Summary of Findings
-    summary_html = _extract_value(payload, "summary_of_findings_html")
-    if summary_html:
-        summary_heading = document.add_paragraph()
-        summary_run = summary_heading.add_run("Summary of Findings:")
-        summary_run.font.size = Pt(13)
-        summary_run.font.bold = True
-        summary_heading.space_before = Pt(10)
-        summary_heading.space_after = Pt(4)
-        append_html_to_document(document, summary_html)
-
-    # Assessment Checklist Table
-    assessments = getattr(payload, "assessments", None) or []
-    if assessments:
-        _append_assessment_checklist_table(document, assessments)
-
-    # Non-Conformities Table
-    non_conformities = getattr(payload, "non_conformities", None) or []
-    if non_conformities:
-        _append_non_conformities_table(document, non_conformities)
-
-
-def _append_assessment_checklist_table(document: Document, assessments: list) -> None:
-    """Append the assessment checklist table."""
-    checklist_heading = document.add_paragraph()
-    checklist_run = checklist_heading.add_run("Assessment Checklist:")
-    checklist_run.font.size = Pt(13)
-    checklist_run.font.bold = True
-    checklist_heading.space_before = Pt(10)
-    checklist_heading.space_after = Pt(4)
-
-    # Build a lookup map from assessments
-    assessment_map = {}
-    for a in assessments:
-        req_id = _extract_value(a, "id")
-        if req_id:
-            assessment_map[req_id] = a
-
-    # Create table with headers
-    table = document.add_table(rows=1, cols=5)
-    table.style = "Table Grid"
-    headers = ["ID", "Requirement", "Evidence", "Status", "Comments"]
-    header_cells = table.rows[0].cells
-    for idx, label in enumerate(headers):
-        paragraph = header_cells[idx].paragraphs[0]
-        run = paragraph.add_run(label)
-        run.font.bold = True
-
-    # Track current subsection for grouping
-    current_subsection = None
-
-    for req in PRODUCT_CONTEXT_REQUIREMENTS:
-        req_id = req["id"]
-        subsection = req["subsection"]
-        description = req["description"]
-
-        # Add subsection header row if subsection changed
-        if subsection != current_subsection:
-            current_subsection = subsection
-            subsection_label = req["label"]
-            header_row = table.add_row().cells
-            # Merge cells for subsection header
-            header_row[0].merge(header_row[4])
-            header_para = header_row[0].paragraphs[0]
-            header_run = header_para.add_run(f"{subsection} - {subsection_label}")
-            header_run.font.bold = True
-            header_run.font.italic = True
-
-        # Get assessment data for this requirement
-        assessment = assessment_map.get(req_id, {})
-        evidence_ref = _extract_value(assessment, "evidence_ref_id") or ""
-        status = _extract_value(assessment, "status") or "not_assessed"
-        status_label = ASSESSMENT_STATUS_LABELS.get(status, status)
-        comments_html = _extract_value(assessment, "comments_html") or ""
-        comments_text = _strip_html(comments_html)
+def _normalize_assessments(assessments: Optional[Iterable[object]]) -> List[AssessmentRow]:
+    normalized = []
+    for a in assessments or []:
+        status = _extract_value(a, "status")
+        comments_html = _extract_value(a, "comments_html")
+        comments_text = html_to_text(comments_html)
         # Truncate comments for table display
         if len(comments_text) > 100:
             comments_text = comments_text[:97] + "..."
-
-        # Add requirement row
-        row = table.add_row().cells
-        row[0].text = req_id
-        row[1].text = description
-        row[2].text = evidence_ref
-        row[3].text = status_label
-        row[4].text = comments_text
+        normalized.append(
+            AssessmentRow(
+                id=_extract_value(a, "id"),
+                status=status or "not_assessed",
+                evidence_ref=_extract_value(a, "evidence_ref_id"),
+                comments=comments_text,
+                filled=bool(
+                    status not in (None, "not_assessed")
+                    or _extract_value(a, "evidence_id")
+                    or comments_html
+                ),
+            )
+        )
+    return normalized
 
 
-def _append_non_conformities_table(document: Document, non_conformities: list) -> None:
-    """Append the non-conformities table."""
-    from docx.shared import RGBColor
-    
-    nc_heading = document.add_paragraph()
-    nc_run = nc_heading.add_run("Non-Conformities:")
-    nc_run.font.size = Pt(13)
-    nc_run.font.bold = True
-    nc_heading.space_before = Pt(10)
-    nc_heading.space_after = Pt(4)
+def _assessments_filled(assessments: List[AssessmentRow]) -> bool:
+    """Check if any checklist assessment has been filled in."""
+    return any(a.filled for a in assessments)
 
-    # Create table with headers
-    table = document.add_table(rows=1, cols=5)
-    table.style = "Table Grid"
-    headers = ["NC ID", "Requirement", "Description", "Severity", "Corrective Action"]
-    header_cells = table.rows[0].cells
-    for idx, label in enumerate(headers):
-        paragraph = header_cells[idx].paragraphs[0]
-        run = paragraph.add_run(label)
-        run.font.bold = True
 
-    for nc in non_conformities:
-        nc_id = _extract_value(nc, "id") or ""
-        requirement_id = _extract_value(nc, "requirement_id") or ""
-        description = _extract_value(nc, "description") or ""
+def _append_requirements_checklist(
+    document: Document, assessments: List[AssessmentRow], requirements: list
+) -> None:
+    """Append a requirement checklist table grouped by subsection."""
+    assessment_map = {a.id: a for a in assessments if a.id}
+
+    def rows():
+        # Track current subsection for grouping
+        current_subsection = None
+        for req in requirements:
+            req_id = req["id"]
+            subsection = req["subsection"]
+
+            # Add a merged subsection header row if subsection changed
+            if subsection != current_subsection:
+                current_subsection = subsection
+                yield StaticRow((
+                    TableCell(text=f"{subsection} - {req['label']}", bold=True, italic=True, span=5),
+                ))
+
+            assessment = assessment_map.get(req_id)
+            status = assessment.status if assessment else "not_assessed"
+            evidence = assessment.evidence_ref if assessment else None
+            comments_text = assessment.comments if assessment else ""
+
+            row = (req_id, req["description"], evidence, ASSESSMENT_STATUS_LABELS.get(status, status), comments_text)
+            # Unassessed rows are constant boilerplate
+            if status == "not_assessed" and not evidence and not comments_text:
+                yield StaticRow(row)
+            else:
+                yield row
+
+    append_bulk_table(document, CHECKLIST_HEADERS, rows())
+
+
+def _non_conformity_rows(non_conformities: Optional[Iterable[object]]) -> list:
+    """Normalize non-conformities into rows with color-coded severities."""
+    rows = []
+    for nc in non_conformities or []:
         severity = _extract_value(nc, "severity") or "minor"
-        severity_label = NC_SEVERITY_LABELS.get(severity, severity.title())
-        corrective_action = _extract_value(nc, "corrective_action") or ""
-
-        row = table.add_row().cells
-        row[0].text = nc_id
-        row[1].text = requirement_id
-        row[2].text = description
-        
-        # Add severity with color coding
-        severity_para = row[3].paragraphs[0]
-        severity_run = severity_para.add_run(severity_label)
-        if severity == "critical":
-            severity_run.font.color.rgb = RGBColor(255, 0, 0)  # Red
-            severity_run.font.bold = True
-        elif severity == "major":
-            severity_run.font.color.rgb = RGBColor(255, 165, 0)  # Orange
-        
-        row[4].text = corrective_action
-
-
-def _append_risk_assessment_methodology_section(document: Document, payload: Optional[object]) -> None:
-    """Append Section 5.3.1 Risk Assessment and Treatment Methodology."""
-    from docx.shared import RGBColor
-    
-    if not payload:
-        return
-
-    # Start 5.3 Risk Acceptance Criteria and Risk Management Methodology on a new page
-    document.add_page_break()
-
-    # Section 5.3 heading
-    heading_53 = document.add_paragraph()
-    heading_53_run = heading_53.add_run("5.3 Risk Acceptance Criteria and Risk Management Methodology")
-    heading_53_run.font.size = Pt(18)
-    heading_53_run.font.bold = True
-    heading_53.space_after = Pt(6)
-
-    reference_53 = document.add_paragraph("[Reference: Clause 6.3 - Risk acceptance criteria and risk management methodology]")
-    reference_53.runs[0].font.bold = True
-    reference_53.space_after = Pt(10)
-
-    intro_para = document.add_paragraph(
-        "This section describes the criteria used to determine whether risks are acceptable "
-        "and the methodology used to assess and treat risks."
+        color, bold = NC_SEVERITY_STYLES.get(severity, (None, False))
+        rows.append((
+            _extract_value(nc, "id"),
+            _extract_value(nc, "requirement_id"),
+            _extract_value(nc, "description"),
+            TableCell(text=NC_SEVERITY_LABELS.get(severity, severity.title()), bold=bold, color=color),
+            _extract_value(nc, "corrective_action"),
+        ))
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Section 5 layout
+# ---------------------------------------------------------------------------
+
+def _evidence(label: str = "Evidence Reference:") -> Items:
+    return Items(
+        "evidence_entries",
+        _table(EVIDENCE_HEADERS),
+        label=label,
+        prepare=_normalize_evidence_entries,
     )
-    intro_para.space_after = Pt(12)
-
-    # Section 5.3.1 heading
-    heading = document.add_paragraph()
-    heading_run = heading.add_run("5.3.1 Risk Assessment and Treatment Methodology")
-    heading_run.font.size = Pt(16)
-    heading_run.font.bold = True
-    heading.space_after = Pt(6)
-
-    reference = document.add_paragraph("[Reference: Clause 6.3.1 - General]")
-    reference.runs[0].font.bold = True
-    reference.space_after = Pt(10)
-
-    # Blue requirement section
-    req_para = document.add_paragraph()
-    req_run = req_para.add_run("Requirement [Clause 6.3.3]:")
-    req_run.font.color.rgb = RGBColor(0, 0, 255)
-    req_para.space_after = Pt(4)
-    
-    req_text = document.add_paragraph(
-        '"A risk assessment and treatment methodology covering how risks are defined and measured shall be defined.'
-    )
-    req_text.runs[0].font.color.rgb = RGBColor(0, 0, 255)
-    req_text.space_after = Pt(2)
-    
-    req_text2 = document.add_paragraph("This methodology shall be:")
-    req_text2.runs[0].font.color.rgb = RGBColor(0, 0, 255)
-    req_text2.space_after = Pt(2)
-    
-    bullets = [
-        "Applied consistently on the product throughout its lifecycle;",
-        "Justified for the product;",
-        "Aligned with the state of the art and current values of society for the product;",
-        "Applied to both individual risks and aggregate risks."
-    ]
-    for bullet in bullets:
-        bullet_para = document.add_paragraph(bullet, style='List Bullet')
-        bullet_para.runs[0].font.color.rgb = RGBColor(0, 0, 255)
-        bullet_para.space_after = Pt(2)
-    
-    closing_quote = document.add_paragraph('"')
-    closing_quote.runs[0].font.color.rgb = RGBColor(0, 0, 255)
-    closing_quote.space_after = Pt(12)
-
-    # Risk Methodology Description
-    methodology_html = _extract_value(payload, "methodology_description_html")
-    if methodology_html:
-        method_label = document.add_paragraph()
-        method_run = method_label.add_run("Risk Methodology Description:")
-        method_run.font.size = Pt(13)
-        method_run.font.bold = True
-        method_label.space_before = Pt(6)
-        method_label.space_after = Pt(4)
-        append_html_to_document(document, methodology_html)
-
-    # Justification for Methodology
-    justification_html = _extract_value(payload, "justification_html")
-    if justification_html:
-        just_label = document.add_paragraph()
-        just_run = just_label.add_run("Justification for Methodology:")
-        just_run.font.size = Pt(13)
-        just_run.font.bold = True
-        just_label.space_before = Pt(10)
-        just_label.space_after = Pt(4)
-        append_html_to_document(document, justification_html)
-
-    # Consistent Application
-    consistent_html = _extract_value(payload, "consistent_application_html")
-    if consistent_html:
-        cons_label = document.add_paragraph()
-        cons_run = cons_label.add_run("Consistent Application:")
-        cons_run.font.size = Pt(13)
-        cons_run.font.bold = True
-        cons_label.space_before = Pt(10)
-        cons_label.space_after = Pt(4)
-        append_html_to_document(document, consistent_html)
-
-    # Individual and Aggregate Risk
-    aggregate_html = _extract_value(payload, "individual_aggregate_risk_html")
-    if aggregate_html:
-        agg_label = document.add_paragraph()
-        agg_run = agg_label.add_run("Individual and Aggregate Risk:")
-        agg_run.font.size = Pt(13)
-        agg_run.font.bold = True
-        agg_label.space_before = Pt(10)
-        agg_label.space_after = Pt(4)
-        append_html_to_document(document, aggregate_html)
-
-    # Evidence Reference
-    _append_evidence_tracker(document, getattr(payload, "evidence_entries", None))
 
 
-def _append_risk_acceptance_criteria_section(document: Document, payload: Optional[object]) -> None:
-    """Append Section 5.3.2 Risk Acceptance Criteria."""
-    from docx.shared import RGBColor
-    
-    if not payload:
-        return
-
-    # Start 5.3.2 Risk Acceptance Criteria on a new page
-    document.add_page_break()
-
-    # Section 5.3.2 heading
-    heading = document.add_paragraph()
-    heading_run = heading.add_run("5.3.2 Risk Acceptance Criteria")
-    heading_run.font.size = Pt(16)
-    heading_run.font.bold = True
-    heading.space_after = Pt(6)
-
-    reference = document.add_paragraph("[Reference: Clause 6.3.3]")
-    reference.runs[0].font.bold = True
-    reference.space_after = Pt(10)
-
-    # Blue requirement section
-    req_para = document.add_paragraph()
-    req_run = req_para.add_run("Requirement [Clause 6.3.3]:")
-    req_run.font.color.rgb = RGBColor(0, 0, 255)
-    req_para.space_after = Pt(4)
-    
-    req_text = document.add_paragraph(
-        '"The risk acceptance criteria shall be defined and documented considering at least the assumptions and expectations regarding the:'
+def _assessment_summary(requirements: list) -> tuple:
+    return (
+        HtmlBlock("summary_of_findings_html", label="Summary of Findings:"),
+        Items(
+            "assessments",
+            partial(_append_requirements_checklist, requirements=requirements),
+            label="Assessment Checklist:",
+            prepare=_normalize_assessments,
+            probe=_assessments_filled,
+        ),
+        Items(
+            "non_conformities",
+            _table(NON_CONFORMITY_HEADERS),
+            label="Non-Conformities:",
+            prepare=_non_conformity_rows,
+        ),
     )
-    req_text.runs[0].font.color.rgb = RGBColor(0, 0, 255)
-    req_text.space_after = Pt(2)
-    
-    bullets = [
-        "relevant regulatory factors;",
-        "relevant contractual factors;",
-        "nature of known risks;",
-        "nature of the users;",
-        "the nature of the product; and,",
-        "state of the art and current values of society."
-    ]
-    for bullet in bullets:
-        bullet_para = document.add_paragraph(bullet, style='List Bullet')
-        bullet_para.runs[0].font.color.rgb = RGBColor(0, 0, 255)
-        bullet_para.space_after = Pt(2)
-    
-    closing_quote = document.add_paragraph('"')
-    closing_quote.runs[0].font.color.rgb = RGBColor(0, 0, 255)
-    closing_quote.space_after = Pt(12)
-
-    # Risk Acceptance Criteria
-    criteria_html = _extract_value(payload, "risk_acceptance_criteria_html")
-    if criteria_html:
-        criteria_label = document.add_paragraph()
-        criteria_run = criteria_label.add_run("Risk Acceptance Criteria:")
-        criteria_run.font.size = Pt(13)
-        criteria_run.font.bold = True
-        criteria_label.space_before = Pt(6)
-        criteria_label.space_after = Pt(4)
-        append_html_to_document(document, criteria_html)
-
-    # Regulatory Factors
-    regulatory_html = _extract_value(payload, "regulatory_factors_html")
-    if regulatory_html:
-        reg_label = document.add_paragraph()
-        reg_run = reg_label.add_run("2. Regulatory Factors:")
-        reg_run.font.size = Pt(13)
-        reg_run.font.bold = True
-        reg_label.space_before = Pt(10)
-        reg_label.space_after = Pt(4)
-        append_html_to_document(document, regulatory_html)
-
-    # Contractual Factors
-    contractual_html = _extract_value(payload, "contractual_factors_html")
-    if contractual_html:
-        contract_label = document.add_paragraph()
-        contract_run = contract_label.add_run("3. Contractual Factors:")
-        contract_run.font.size = Pt(13)
-        contract_run.font.bold = True
-        contract_label.space_before = Pt(10)
-        contract_label.space_after = Pt(4)
-        append_html_to_document(document, contractual_html)
-
-    # Nature of Known Risks
-    known_risks_html = _extract_value(payload, "nature_of_known_risks_html")
-    if known_risks_html:
-        risks_label = document.add_paragraph()
-        risks_run = risks_label.add_run("4. Nature of Known Risks:")
-        risks_run.font.size = Pt(13)
-        risks_run.font.bold = True
-        risks_label.space_before = Pt(10)
-        risks_label.space_after = Pt(4)
-        append_html_to_document(document, known_risks_html)
-
-    # Nature of the Users
-    users_html = _extract_value(payload, "nature_of_users_html")
-    if users_html:
-        users_label = document.add_paragraph()
-        users_run = users_label.add_run("5. Nature of the Users:")
-        users_run.font.size = Pt(13)
-        users_run.font.bold = True
-        users_label.space_before = Pt(10)
-        users_label.space_after = Pt(4)
-        append_html_to_document(document, users_html)
-
-    # Nature of the Product
-    product_html = _extract_value(payload, "nature_of_product_html")
-    if product_html:
-        product_label = document.add_paragraph()
-        product_run = product_label.add_run("6. Nature of the Product:")
-        product_run.font.size = Pt(13)
-        product_run.font.bold = True
-        product_label.space_before = Pt(10)
-        product_label.space_after = Pt(4)
-        append_html_to_document(document, product_html)
-
-    # State of the Art
-    state_art_html = _extract_value(payload, "state_of_the_art_html")
-    if state_art_html:
-        state_label = document.add_paragraph()
-        state_run = state_label.add_run("7. State of the Art and Current Values of Society:")
-        state_run.font.size = Pt(13)
-        state_run.font.bold = True
-        state_label.space_before = Pt(10)
-        state_label.space_after = Pt(4)
-        append_html_to_document(document, state_art_html)
-
-    # Evidence Reference
-    _append_evidence_tracker(document, getattr(payload, "evidence_entries", None))
-
 
-def _append_risk_acceptance_criteria_assessment_section(document: Document, payload: Optional[object]) -> None:
-    """Append Section 5.3.3 Risk Acceptance Criteria Assessment Summary."""
-    from docx.shared import RGBColor
-    
-    if not payload:
-        return
-
-    # Start 5.3.3 Risk Acceptance Criteria Assessment on a new page
-    document.add_page_break()
-
-    heading = document.add_paragraph()
-    heading_run = heading.add_run("5.3.3 Risk Acceptance Criteria - Assessment Summary")
-    heading_run.font.size = Pt(18)
-    heading_run.font.bold = True
-    heading.space_after = Pt(6)
-
-    reference = document.add_paragraph("[Reference: Clause 6.3]")
-    reference.runs[0].font.bold = True
-    reference.space_after = Pt(10)
-
-    intro_para = document.add_paragraph(
-        "The following table provides a comprehensive checklist for assessing conformance "
-        "with risk acceptance criteria and methodology requirements."
-    )
-    intro_para.space_after = Pt(12)
-
-    # Overall Verdict
-    verdict = _extract_value(payload, "overall_verdict") or "not_assessed"
-    verdict_label = OVERALL_VERDICT_LABELS.get(verdict, verdict.upper())
-    
-    verdict_heading = document.add_paragraph()
-    verdict_run = verdict_heading.add_run("Overall Verdict for Clause 6.3:")
-    verdict_run.font.size = Pt(13)
-    verdict_run.font.bold = True
-    verdict_heading.space_before = Pt(6)
-    verdict_heading.space_after = Pt(4)
-
-    verdict_para = document.add_paragraph()
-    verdict_value_run = verdict_para.add_run(verdict_label)
-    verdict_value_run.font.bold = True
-    verdict_value_run.font.size = Pt(12)
-    # Color code the verdict
-    if verdict == "pass":
-        verdict_value_run.font.color.rgb = RGBColor(0, 128, 0)  # Green
-    elif verdict == "fail":
-        verdict_value_run.font.color.rgb = RGBColor(255, 0, 0)  # Red
-    elif verdict == "partial":
-        verdict_value_run.font.color.rgb = RGBColor(255, 165, 0)  # Orange
-    verdict_para.space_after = Pt(10)
-
-    # Summary of Findings
-    summary_html = _extract_value(payload, "summary_of_findings_html")
-    if summary_html:
-        summary_heading = document.add_paragraph()
-        summary_run = summary_heading.add_run("Summary of Findings:")
-        summary_run.font.size = Pt(13)
-        summary_run.font.bold = True
-        summary_heading.space_before = Pt(10)
-        summary_heading.space_after = Pt(4)
-        append_html_to_document(document, summary_html)
-
-    # Assessment Checklist Table
-    assessments = getattr(payload, "assessments", None) or []
-    if assessments:
-        _append_risk_acceptance_criteria_assessment_checklist_table(document, assessments)
-
-    # Non-Conformities Table
-    non_conformities = getattr(payload, "non_conformities", None) or []
-    if non_conformities:
-        _append_risk_acceptance_criteria_non_conformities_table(document, non_conformities)
-
-
-def _append_risk_acceptance_criteria_assessment_checklist_table(document: Document, assessments: list) -> None:
-    """Append the risk acceptance criteria assessment checklist table."""
-    checklist_heading = document.add_paragraph()
-    checklist_run = checklist_heading.add_run("Assessment Checklist:")
-    checklist_run.font.size = Pt(13)
-    checklist_run.font.bold = True
-    checklist_heading.space_before = Pt(10)
-    checklist_heading.space_after = Pt(4)
-
-    # Build a lookup map from assessments
-    assessment_map = {}
-    for a in assessments:
-        req_id = _extract_value(a, "id")
-        if req_id:
-            assessment_map[req_id] = a
-
-    # Create table with headers
-    table = document.add_table(rows=1, cols=5)
-    table.style = "Table Grid"
-    headers = ["ID", "Requirement", "Evidence", "Status", "Comments"]
-    header_cells = table.rows[0].cells
-    for idx, label in enumerate(headers):
-        paragraph = header_cells[idx].paragraphs[0]
-        run = paragraph.add_run(label)
-        run.font.bold = True
-
-    # Track current subsection for grouping
-    current_subsection = None
-
-    for req in RISK_ACCEPTANCE_CRITERIA_REQUIREMENTS:
-        req_id = req["id"]
-        subsection = req["subsection"]
-        description = req["description"]
-
-        # Add subsection header row if subsection changed
-        if subsection != current_subsection:
-            current_subsection = subsection
-            subsection_label = req["label"]
-            header_row = table.add_row().cells
-            # Merge cells for subsection header
-            header_row[0].merge(header_row[4])
-            header_para = header_row[0].paragraphs[0]
-            header_run = header_para.add_run(f"{subsection} - {subsection_label}")
-            header_run.font.bold = True
-            header_run.font.italic = True
-
-        # Get assessment data for this requirement
-        assessment = assessment_map.get(req_id, {})
-        evidence_ref = _extract_value(assessment, "evidence_ref_id") or ""
-        status = _extract_value(assessment, "status") or "not_assessed"
-        status_label = ASSESSMENT_STATUS_LABELS.get(status, status)
-        comments_html = _extract_value(assessment, "comments_html") or ""
-        comments_text = _strip_html(comments_html)
-        # Truncate comments for table display
-        if len(comments_text) > 100:
-            comments_text = comments_text[:97] + "..."
-
-        # Add requirement row
-        row = table.add_row().cells
-        row[0].text = req_id
-        row[1].text = description
-        row[2].text = evidence_ref
-        row[3].text = status_label
-        row[4].text = comments_text
-
-
-def _append_risk_acceptance_criteria_non_conformities_table(document: Document, non_conformities: list) -> None:
-    """Append the risk acceptance criteria non-conformities table."""
-    from docx.shared import RGBColor
-    
-    nc_heading = document.add_paragraph()
-    nc_run = nc_heading.add_run("Non-Conformities:")
-    nc_run.font.size = Pt(13)
-    nc_run.font.bold = True
-    nc_heading.space_before = Pt(10)
-    nc_heading.space_after = Pt(4)
-
-    # Create table with headers
-    table = document.add_table(rows=1, cols=5)
-    table.style = "Table Grid"
-    headers = ["NC ID", "Requirement", "Description", "Severity", "Corrective Action"]
-    header_cells = table.rows[0].cells
-    for idx, label in enumerate(headers):
-        paragraph = header_cells[idx].paragraphs[0]
-        run = paragraph.add_run(label)
-        run.font.bold = True
-
-    for nc in non_conformities:
-        nc_id = _extract_value(nc, "id") or ""
-        requirement_id = _extract_value(nc, "requirement_id") or ""
-        description = _extract_value(nc, "description") or ""
-        severity = _extract_value(nc, "severity") or "minor"
-        severity_label = NC_SEVERITY_LABELS.get(severity, severity.title())
-        corrective_action = _extract_value(nc, "corrective_action") or ""
 
-        row = table.add_row().cells
-        row[0].text = nc_id
-        row[1].text = requirement_id
-        row[2].text = description
-        
-        # Add severity with color coding
-        severity_para = row[3].paragraphs[0]
-        severity_run = severity_para.add_run(severity_label)
-        if severity == "critical":
-            severity_run.font.color.rgb = RGBColor(255, 0, 0)  # Red
-            severity_run.font.bold = True
-        elif severity == "major":
-            severity_run.font.color.rgb = RGBColor(255, 165, 0)  # Orange
-        
-        row[4].text = corrective_action
+RDPS_DEPENDENCY_REQUIREMENT = InlineRequirement(
+    "6.2.3",
+    '"If applicable, RDPS dependencies (e.g. a concise dependency map identifying operator, '
+    'data exchanged, trust/authentication, and defined degraded modes) shall be recorded."',
+)
+
+RDPS_SINGLE_SYSTEM_REQUIREMENT = InlineRequirement(
+    "6.2.3",
+    '"Where a product function relies on an RDPS, the manufacturer shall include the RDPS '
+    'in the product context determination. The product including its RDPS, third-party or not, '
+    'shall be treated as a single system."',
+)
+
+RISK_MANAGEMENT_SPEC = Section(None, (
+    PageBreak(),
+    Heading("5. RISK MANAGEMENT ELEMENTS", 1),
+    Reference("[Reference: Clause 6 - Risk management elements]"),
+
+    # 5.1 General Approach to Risk Management
+    HtmlBlock("general_approach_html", intro=(
+        Heading("5.1 General Approach to Risk Management", 2),
+        Reference("[Reference: Clause 6.1 - General]"),
+        Text(
+            "This section describes how {product_name} applies risk management throughout its lifecycle "
+            "to ensure an appropriate level of cybersecurity.",
+            template=True,
+        ),
+        Heading("Risk Management Framework Applied:"),
+    )),
+
+    # 5.2 Product Context / 5.2.1 Intended Purpose and Reasonably Foreseeable Use
+    Section("product_context", (
+        PageBreak(),
+        Heading("5.2 Product Context", 2),
+        Reference("[Reference: Clause 6.2 - Product Context]"),
+        Heading("5.2.1 Intended Purpose and Reasonably Foreseeable Use", 3),
+        Reference("[Reference: Clause 6.2.1.2 - Product intended purpose and reasonable foreseeable use]"),
+        QuoteRequirement(
+            "6.2.3",
+            ('"The product context shall be identified and recorded based on:',),
+            (
+                "the product's IPRFU;",
+                "the product's functions;",
+                "the product's operational environment of use;",
+                "the product's architecture overview;",
+                "the product's user descriptions.",
+            ),
+        ),
+        HtmlBlock("intended_purpose_html", label="Intended Purpose:"),
+        HtmlBlock("foreseeable_use_html", label="Reasonably Foreseeable Use & Misuse:"),
+        _evidence(),
+    ), content_fields=("specific_intended_uses_html",)),
+
+    # 5.2.2 Product Functions
+    Section("product_function", (
+        PageBreak(),
+        Heading("5.2.2 Product Functions", 3),
+        Reference("[Reference: Clause 6.2.1.3 - Product functions]"),
+        HtmlBlock("primary_functions_html"),
+        HtmlBlock("security_functions_html", label="Security Functions"),
+        _evidence(),
+    )),
+
+    # 5.2.3 Product Operational Environment
+    Section("operational_environment", (
+        PageBreak(),
+        Heading("5.2.3 Product Operational Environment", 3),
+        Reference("[Reference: Clause 6.2.1.4 - Product operational environment]"),
+        HtmlBlock("physical_environment_html", label="Physical Environment:"),
+        HtmlBlock("network_environment_html", label="Network Environment:"),
+        HtmlBlock("system_environment_html", label="System Environment:"),
+        HtmlBlock("operational_constraints_html", label="Operational Constraints:"),
+        HtmlBlock(
+            "rdps_environment_html",
+            label="RDPS Environment (if applicable):",
+            intro=(RDPS_DEPENDENCY_REQUIREMENT,),
+        ),
+        _evidence(),
+    )),
+
+    # 5.2.4 Product Architecture Overview
+    Section("product_architecture", (
+        PageBreak(),
+        Heading("5.2.4 Product Architecture Overview", 3),
+        Reference("[Reference: Clause 6.2.3 - Product architecture]"),
+        HtmlBlock("architecture_description_html", label="Architecture Description:"),
+        Items(
+            "hardware_components",
+            _table(HARDWARE_HEADERS),
+            prepare=_rows("component_name", "function", "interfaces", "security_functions"),
+            label="Hardware Components:",
+            label_always=True,
+            none_flag="no_hardware_components",
+            none_note="This product does not have any hardware component.",
+            empty_note="No hardware components specified.",
+        ),
+        Items(
+            "software_components",
+            _table(SOFTWARE_HEADERS),
+            prepare=_software_rows,
+            label="Software Components:",
+            label_always=True,
+            empty_note="No software components specified.",
+        ),
+        Items(
+            "rdps_components",
+            _table(RDPS_HEADERS),
+            prepare=_rows(
+                "component", "provider", "function", "location",
+                "development_responsibility", "operation_responsibility",
+            ),
+            label="RDPS Components (if applicable):",
+            label_always=True,
+            intro=(RDPS_SINGLE_SYSTEM_REQUIREMENT,),
+            none_flag="no_rdps_components",
+            none_note="This product does not rely on any RDPS.",
+            empty_note="No RDPS components specified.",
+        ),
+        Items(
+            "component_interfaces",
+            _table(INTERFACE_HEADERS),
+            prepare=_rows("interface", "component_a", "component_b", "protocol", "authentication", "data_exchanged"),
+            label="Component Interfaces:",
+            label_always=True,
+            empty_note="No component interfaces specified.",
+        ),
+        HtmlBlock("architecture_diagram_html", label="Architecture Diagram:"),
+        _evidence(),
+    )),
+
+    # 5.2.5 Product User Description
+    Section("product_user_description", (
+        PageBreak(),
+        Heading("5.2.5 Product User Description", 3),
+        Reference("[Reference: Clause 6.2.1.6 - Product user description]"),
+        HtmlBlock("user_description_html"),
+        HtmlBlock(
+            "rdps_considerations_html",
+            label="RDPS Considerations:",
+            label_always=True,
+            none_flag="no_rdps",
+            none_note="This product does not rely on any RDPS.",
+            empty_note="No RDPS considerations specified.",
+        ),
+        _evidence(),
+    )),
+
+    # 5.3 Product Context Assessment Summary
+    Section("product_context_assessment", (
+        PageBreak(),
+        Heading("5.3 Product Context Assessment Summary", 2),
+        Reference("[Reference: Clause 6.2]"),
+        Verdict("Overall Verdict:", OVERALL_VERDICT_LABELS, VERDICT_COLORS),
+        *_assessment_summary(PRODUCT_CONTEXT_REQUIREMENTS),
+    )),
+
+    # 5.3 Risk Acceptance Criteria and Risk Management Methodology / 5.3.1
+    Section("risk_assessment_methodology", (
+        PageBreak(),
+        Heading("5.3 Risk Acceptance Criteria and Risk Management Methodology", 2),
+        Reference("[Reference: Clause 6.3 - Risk acceptance criteria and risk management methodology]"),
+        Text(
+            "This section describes the criteria used to determine whether risks are acceptable "
+            "and the methodology used to assess and treat risks."
+        ),
+        Heading("5.3.1 Risk Assessment and Treatment Methodology", 3),
+        Reference("[Reference: Clause 6.3.1 - General]"),
+        QuoteRequirement(
+            "6.3.3",
+            (
+                '"A risk assessment and treatment methodology covering how risks are defined and measured shall be defined.',
+                "This methodology shall be:",
+            ),
+            (
+                "Applied consistently on the product throughout its lifecycle;",
+                "Justified for the product;",
+                "Aligned with the state of the art and current values of society for the product;",
+                "Applied to both individual risks and aggregate risks.",
+            ),
+        ),
+        HtmlBlock("methodology_description_html", label="Risk Methodology Description:"),
+        HtmlBlock("justification_html", label="Justification for Methodology:"),
+        HtmlBlock("consistent_application_html", label="Consistent Application:"),
+        HtmlBlock("individual_aggregate_risk_html", label="Individual and Aggregate Risk:"),
+        _evidence(),
+    )),
+
+    # 5.3.2 Risk Acceptance Criteria
+    Section("risk_acceptance_criteria", (
+        PageBreak(),
+        Heading("5.3.2 Risk Acceptance Criteria", 3),
+        Reference("[Reference: Clause 6.3.3]"),
+        QuoteRequirement(
+            "6.3.3",
+            ('"The risk acceptance criteria shall be defined and documented considering at least the assumptions and expectations regarding the:',),
+            (
+                "relevant regulatory factors;",
+                "relevant contractual factors;",
+                "nature of known risks;",
+                "nature of the users;",
+                "the nature of the product; and,",
+                "state of the art and current values of society.",
+            ),
+        ),
+        HtmlBlock("risk_acceptance_criteria_html", label="Risk Acceptance Criteria:"),
+        HtmlBlock("regulatory_factors_html", label="2. Regulatory Factors:"),
+        HtmlBlock("contractual_factors_html", label="3. Contractual Factors:"),
+        HtmlBlock("nature_of_known_risks_html", label="4. Nature of Known Risks:"),
+        HtmlBlock("nature_of_users_html", label="5. Nature of the Users:"),
+        HtmlBlock("nature_of_product_html", label="6. Nature of the Product:"),
+        HtmlBlock("state_of_the_art_html", label="7. State of the Art and Current Values of Society:"),
+        _evidence(),
+    )),
+
+    # 5.3.3 Risk Acceptance Criteria - Assessment Summary
+    Section("risk_acceptance_criteria_assessment", (
+        PageBreak(),
+        Heading("5.3.3 Risk Acceptance Criteria - Assessment Summary", 2),
+        Reference("[Reference: Clause 6.3]"),
+        Text(
+            "The following table provides a comprehensive checklist for assessing conformance "
+            "with risk acceptance criteria and methodology requirements."
+        ),
+        Verdict("Overall Verdict for Clause 6.3:", OVERALL_VERDICT_LABELS, VERDICT_COLORS),
+        *_assessment_summary(RISK_ACCEPTANCE_CRITERIA_REQUIREMENTS),
+    )),
+))
+
+_RISK_MANAGEMENT_RENDERER = compile_spec(RISK_MANAGEMENT_SPEC)
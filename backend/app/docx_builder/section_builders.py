@@ -5,11 +5,13 @@ from docx import Document
 from docx.shared import Mm, Pt
 
 from .html_converter import append_html_to_document
+from .styles import add_heading, register_styles
 
 
 def create_base_document() -> Document:
     """
-    Create a base document with standard page settings.
+    Create a base document with standard page settings and the shared
+    named styles.
     
     Returns:
         Configured Document object
@@ -22,6 +24,7 @@ def create_base_document() -> Document:
     section.bottom_margin = Mm(20)
     section.left_margin = Mm(25)
     section.right_margin = Mm(25)
+    register_styles(document)
     return document
 
 
@@ -72,10 +75,7 @@ def build_tss_preview_document(html_content: str, user_id: str, output_dir: Path
     document = create_base_document()
     
     # Add section heading
-    heading = document.add_paragraph()
-    heading_run = heading.add_run("6. Product Summary Specification")
-    heading_run.font.size = Pt(20)
-    heading_run.font.bold = True
+    heading = add_heading(document, "6. Product Summary Specification", 1)
     heading.space_after = Pt(8)
     
     # Add introduction
@@ -105,10 +105,7 @@ def add_documentation_intro_section(document: Document, intro_text: str = None):
         document: Document to add to
         intro_text: Optional custom intro text
     """
-    heading = document.add_paragraph()
-    heading_run = heading.add_run("1. CRA Documentation Introduction")
-    heading_run.font.size = Pt(20)
-    heading_run.font.bold = True
+    heading = add_heading(document, "1. CRA Documentation Introduction", 1)
     heading.space_after = Pt(12)
     
     # Default intro text
@@ -129,7 +126,7 @@ def add_section_with_html(
     section_number: str,
     section_title: str,
     html_content: str,
-    heading_size: int = 18,
+    heading_level: int = 2,
     add_page_break: bool = False
 ):
     """
@@ -140,16 +137,13 @@ def add_section_with_html(
         section_number: Section number (e.g., "1.1", "2")
         section_title: Section title
         html_content: HTML content for section
-        heading_size: Font size for heading in points
+        heading_level: Heading style level (1-4)
         add_page_break: Whether to add page break before section
     """
     if add_page_break:
         document.add_page_break()
     
-    heading = document.add_paragraph()
-    heading_run = heading.add_run(f"{section_number} {section_title}")
-    heading_run.font.size = Pt(heading_size)
-    heading_run.font.bold = True
+    heading = add_heading(document, f"{section_number} {section_title}", heading_level)
     heading.space_before = Pt(12)
     heading.space_after = Pt(8)
     
@@ -0,0 +1,477 @@
+"""Declarative section layout engine.
+
+A document section is described once as a tree of nodes (headings, clause
+references, blue requirement quotes, HTML fields, item tables) and compiled
+into a renderer that is reused across requests. Rendering is two-phase: a
+single analysis pass reads the payload into a compact ``SectionData`` tree
+(non-blank text, flags, prepared item rows and precomputed emptiness), and
+the render pass consumes only that tree. Static nodes (headings, clause
+references, requirement quotes) are compiled once into OOXML fragments and
+deep-copied into each document; their formatting comes from the named
+styles in ``styles``.
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field as dataclass_field
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from docx import Document
+from docx.shared import Pt, RGBColor
+
+from .fragments import append_static, get_fragment
+from .html_converter import append_html_to_document
+from .styles import REQUIREMENT_QUOTE, add_clause_reference, add_heading, add_styled_run
+
+
+LABEL_LEVEL = 4
+
+
+def get_field(payload: object, field: str) -> Any:
+    """Read a field from a dict or attribute-style payload."""
+    if isinstance(payload, dict):
+        return payload.get(field)
+    return getattr(payload, field, None)
+
+
+def extract_text(payload: object, field: str) -> Optional[str]:
+    """Read a string field, treating blank strings as missing."""
+    value = get_field(payload, field)
+    if value and isinstance(value, str) and value.strip():
+        return value
+    return None
+
+
+@dataclass
+class SectionData:
+    """
+    Normalized payload of one section, built in a single analysis pass.
+
+    Attributes:
+        text: Non-blank text fields read by the section's nodes
+        flags: Boolean flags (e.g. ``no_rdps``)
+        items: Prepared item lists per field
+        sections: Child section data keyed by compiled child section
+        has_content: Whether any payload-driven node has something to show
+    """
+    text: Dict[str, str] = dataclass_field(default_factory=dict)
+    flags: Dict[str, bool] = dataclass_field(default_factory=dict)
+    items: Dict[str, list] = dataclass_field(default_factory=dict)
+    sections: Dict["CompiledSection", "SectionData"] = dataclass_field(default_factory=dict)
+    has_content: bool = False
+
+    def read_text(self, payload: object, field: str) -> Optional[str]:
+        value = extract_text(payload, field)
+        if value:
+            self.text[field] = value
+        return value
+
+    def read_flag(self, payload: object, field: Optional[str]) -> bool:
+        if not field:
+            return False
+        self.flags[field] = bool(get_field(payload, field))
+        return self.flags[field]
+
+
+class RenderContext:
+    """Per-render state: target document and template variables."""
+
+    def __init__(self, document: Document, variables: Optional[Dict[str, Any]] = None):
+        self.document = document
+        self.variables = variables or {}
+
+
+class Node(ABC):
+    """Base layout node."""
+    static = False
+
+    def analyze(self, payload: object, data: SectionData) -> bool:
+        """Read what the node needs into ``data``; return True if it has content."""
+        return False
+
+    @abstractmethod
+    def render(self, ctx: RenderContext, data: SectionData) -> None:
+        """Write the node from the analysed ``data``."""
+
+    def precompile(self) -> None:
+        """Compile the fragments this node renders from."""
+
+
+class StaticNode(Node):
+    """
+    Node that does not depend on the payload.
+
+    Static nodes never count as content and always render identically:
+    they implement ``build`` and are rendered from a precompiled fragment
+    keyed by the node itself.
+    """
+    static = True
+
+    def render(self, ctx: RenderContext, data: SectionData) -> None:
+        append_static(ctx.document, self, self.build)
+
+    @abstractmethod
+    def build(self, document: Document) -> None:
+        """Write the node with python-docx."""
+
+    def precompile(self) -> None:
+        if self.static:
+            get_fragment(self, self.build)
+
+
+@dataclass(frozen=True)
+class PageBreak(StaticNode):
+    static = True
+
+    def build(self, document):
+        document.add_page_break()
+
+
+@dataclass(frozen=True)
+class Heading(StaticNode):
+    """
+    Section heading or field label.
+
+    With ``level`` (1-4) the paragraph uses the matching heading style;
+    without it the text is a bold body-size label.
+    """
+    text: str
+    level: Optional[int] = None
+    static = True
+
+    def build(self, document):
+        if self.level:
+            add_heading(document, self.text, self.level)
+        else:
+            document.add_paragraph().add_run(self.text).font.bold = True
+
+
+@dataclass(frozen=True)
+class Reference(StaticNode):
+    """Clause reference line, e.g. ``[Reference: Clause 6.2]``."""
+    text: str
+    static = True
+
+    def build(self, document):
+        add_clause_reference(document, self.text)
+
+
+@dataclass(frozen=True)
+class Text(StaticNode):
+    """
+    Plain paragraph.
+
+    With ``template`` set, the text is formatted with the render variables
+    (e.g. ``{product_name}``) and the node is no longer static.
+    """
+    text: str
+    italic: bool = False
+    template: bool = False
+
+    @property
+    def static(self):
+        return not self.template
+
+    def render(self, ctx, data):
+        if self.template:
+            self._add(ctx.document, self.text.format(**ctx.variables))
+        else:
+            super().render(ctx, data)
+
+    def build(self, document):
+        self._add(document, self.text)
+
+    def _add(self, document, text):
+        paragraph = document.add_paragraph(text)
+        if self.italic:
+            paragraph.runs[0].font.italic = True
+
+
+@dataclass(frozen=True)
+class QuoteRequirement(StaticNode):
+    """Blue ``Requirement [Clause …]:`` block with quoted lines and bullets."""
+    clause: str
+    lines: Tuple[str, ...]
+    bullets: Tuple[str, ...] = ()
+    static = True
+
+    def build(self, document):
+        add_styled_run(document.add_paragraph(), f"Requirement [Clause {self.clause}]:", REQUIREMENT_QUOTE)
+
+        for line in self.lines:
+            add_styled_run(document.add_paragraph(), line, REQUIREMENT_QUOTE)
+        for bullet in self.bullets:
+            add_styled_run(document.add_paragraph(style="List Bullet"), bullet, REQUIREMENT_QUOTE)
+        add_styled_run(document.add_paragraph(), '"', REQUIREMENT_QUOTE)
+
+
+@dataclass(frozen=True)
+class InlineRequirement(StaticNode):
+    """Single italic blue paragraph: ``Requirement [Clause …]: "<quote>"``."""
+    clause: str
+    quote: str
+    static = True
+
+    def build(self, document):
+        paragraph = document.add_paragraph()
+        for text in (f"Requirement [Clause {self.clause}]: ", self.quote):
+            add_styled_run(paragraph, text, REQUIREMENT_QUOTE).font.italic = True
+
+
+def _render_all(nodes: Sequence[Node], ctx: RenderContext, data: SectionData) -> None:
+    for node in nodes:
+        node.render(ctx, data)
+
+
+def _precompile_block(block) -> None:
+    # Label, intro and fallback notes of a labelled block are static
+    nodes = list(block.intro)
+    if block.label:
+        nodes.append(Heading(block.label, LABEL_LEVEL))
+    for note in (block.none_note, block.empty_note):
+        if note:
+            nodes.append(Text(note, italic=True))
+    for node in nodes:
+        node.precompile()
+
+
+@dataclass(frozen=True)
+class HtmlBlock(Node):
+    """
+    Rich-text field with an optional label and intro nodes.
+
+    The block is shown when the field has HTML (or ``label_always`` is set).
+    ``none_flag`` replaces the body with ``none_note`` (and counts as
+    content); ``empty_note`` is shown when there is no HTML.
+    """
+    field: str
+    label: Optional[str] = None
+    intro: Tuple[Node, ...] = ()
+    label_always: bool = False
+    none_flag: Optional[str] = None
+    none_note: Optional[str] = None
+    empty_note: Optional[str] = None
+
+    def analyze(self, payload, data):
+        html = data.read_text(payload, self.field)
+        flagged = data.read_flag(payload, self.none_flag)
+        return bool(html) or flagged
+
+    def precompile(self):
+        _precompile_block(self)
+
+    def render(self, ctx, data):
+        html = data.text.get(self.field)
+        flagged = bool(self.none_flag and data.flags.get(self.none_flag))
+        if not (html or flagged or self.label_always):
+            return
+        if self.label:
+            Heading(self.label, LABEL_LEVEL).render(ctx, data)
+        _render_all(self.intro, ctx, data)
+        if flagged:
+            Text(self.none_note, italic=True).render(ctx, data)
+        elif html:
+            append_html_to_document(ctx.document, html)
+        elif self.empty_note:
+            Text(self.empty_note, italic=True).render(ctx, data)
+
+
+@dataclass(frozen=True)
+class Items(Node):
+    """
+    List field rendered by a writer (usually a table).
+
+    Args:
+        field: Payload attribute holding the list
+        writer: Callable ``(document, items)`` that renders the items
+        label: Label shown above the items
+        label_always: Show the label (and notes) even without items
+        intro: Nodes rendered after the label
+        prepare: Normalizes the raw list into rows (e.g. drops empty
+            entries); runs once per render during analysis
+        probe: Content test on the prepared items (default: non-empty);
+            ``none_flag`` does not count as content
+        empty_note / none_flag / none_note: Italic fallbacks
+    """
+    field: str
+    writer: Callable[[Document, list], None]
+    label: Optional[str] = None
+    label_always: bool = False
+    intro: Tuple[Node, ...] = ()
+    prepare: Optional[Callable[[Any], list]] = None
+    probe: Optional[Callable[[list], bool]] = None
+    empty_note: Optional[str] = None
+    none_flag: Optional[str] = None
+    none_note: Optional[str] = None
+
+    def analyze(self, payload, data):
+        raw = get_field(payload, self.field)
+        items = data.items[self.field] = self.prepare(raw) if self.prepare else list(raw or [])
+        data.read_flag(payload, self.none_flag)
+        return bool(self.probe(items) if self.probe else items)
+
+    def precompile(self):
+        _precompile_block(self)
+
+    def render(self, ctx, data):
+        items = data.items.get(self.field) or []
+        if not (items or self.label_always):
+            return
+        if self.label:
+            Heading(self.label, LABEL_LEVEL).render(ctx, data)
+        _render_all(self.intro, ctx, data)
+        if self.none_flag and data.flags.get(self.none_flag):
+            Text(self.none_note, italic=True).render(ctx, data)
+        elif items:
+            self.writer(ctx.document, items)
+        elif self.empty_note:
+            Text(self.empty_note, italic=True).render(ctx, data)
+
+
+@dataclass(frozen=True)
+class Verdict(Node):
+    """Labelled, color-coded verdict value (e.g. PASS / FAIL)."""
+    label: str
+    labels: Dict[str, str]
+    colors: Dict[str, RGBColor]
+    field: str = "overall_verdict"
+    unset: str = "not_assessed"
+
+    def analyze(self, payload, data):
+        verdict = data.read_text(payload, self.field)
+        return bool(verdict and verdict != self.unset)
+
+    def precompile(self):
+        Heading(self.label, LABEL_LEVEL).precompile()
+
+    def render(self, ctx, data):
+        verdict = data.text.get(self.field) or self.unset
+        Heading(self.label, LABEL_LEVEL).render(ctx, data)
+
+        run = ctx.document.add_paragraph().add_run(self.labels.get(verdict, verdict.upper()))
+        run.font.bold = True
+        run.font.size = Pt(12)
+        if verdict in self.colors:
+            run.font.color.rgb = self.colors[verdict]
+
+
+@dataclass(frozen=True, eq=False)
+class Section(Node):
+    """
+    Group of nodes rendered only when one of them has content.
+
+    Sections compare and hash by identity, so a spec tree can key the
+    compiled-section cache without hashing its whole subtree.
+
+    Args:
+        field: Attribute of the parent payload holding this section's
+            payload (None to reuse the parent payload)
+        children: Child nodes in render order
+        content_fields: Extra text fields that count as content without
+            being rendered by any child
+    """
+    field: Optional[str]
+    children: Tuple[Node, ...]
+    content_fields: Tuple[str, ...] = ()
+
+    def payload_for(self, parent: object) -> object:
+        return parent if self.field is None else get_field(parent, self.field)
+
+    def analyze(self, parent, data):
+        return CompiledSection.compile(self).analyze(parent, data)
+
+    def render(self, ctx, data):
+        CompiledSection.compile(self).render(ctx, data)
+
+
+class CompiledSection(Node):
+    """
+    Section with static children filtered out of the analysis pass.
+
+    Compiled sections are cached per spec node and precompile the fragments
+    of their static nodes, so the tree is analysed once per process and
+    reused by every request. The cache holds the (immutable) spec itself,
+    so a cached entry can never be matched by a different spec.
+    """
+    _cache: Dict[Section, "CompiledSection"] = {}
+
+    def __init__(self, spec: Section):
+        self.spec = spec
+        self.children = tuple(
+            CompiledSection.compile(child) if isinstance(child, Section) else child
+            for child in spec.children
+        )
+        self.analyzers = tuple(child for child in self.children if not child.static)
+        for child in self.children:
+            child.precompile()
+
+    @classmethod
+    def compile(cls, spec: Section) -> "CompiledSection":
+        compiled = cls._cache.get(spec)
+        if compiled is None:
+            compiled = cls._cache[spec] = cls(spec)
+        return compiled
+
+    def analyze(self, parent, data):
+        payload = self.spec.payload_for(parent)
+        if not payload:
+            return False
+
+        section = data.sections[self] = SectionData()
+        has_content = any(extract_text(payload, field) for field in self.spec.content_fields)
+        for child in self.analyzers:
+            # Every child is analysed (no short-circuit) so rendering never
+            # has to go back to the payload
+            has_content = child.analyze(payload, section) or has_content
+        section.has_content = has_content
+        return has_content
+
+    def render(self, ctx, data):
+        section = data.sections.get(self)
+        if section is None or not section.has_content:
+            return
+        _render_all(self.children, ctx, section)
+
+
+def compile_spec(spec: Section) -> CompiledSection:
+    """Compile a section spec into a reusable renderer."""
+    return CompiledSection.compile(spec)
+
+
+def analyze_spec(compiled: CompiledSection, payload: object) -> SectionData:
+    """
+    Build the normalized representation of a payload in one pass.
+
+    Args:
+        compiled: Renderer from ``compile_spec``
+        payload: Root payload
+
+    Returns:
+        Root holder whose ``sections`` maps ``compiled`` to its section data
+    """
+    root = SectionData()
+    root.has_content = compiled.analyze(payload, root)
+    return root
+
+
+def render_spec(
+    compiled: CompiledSection,
+    document: Document,
+    payload: object,
+    **variables: Any,
+) -> bool:
+    """
+    Render a compiled spec into a document.
+
+    Args:
+        compiled: Renderer from ``compile_spec``
+        document: Target document
+        payload: Root payload
+        **variables: Values for ``Text(..., template=True)`` nodes
+
+    Returns:
+        True if anything was rendered
+    """
+    data = analyze_spec(compiled, payload)
+    if not data.has_content:
+        return False
+    compiled.render(RenderContext(document, variables), data)
+    return True
@@ -0,0 +1,146 @@
+"""Named paragraph and character styles shared by the document builders.
+
+Section headings, clause reference lines, blue requirement quotes and table
+header labels are defined once per document in ``styles.xml`` and referenced
+by style id (``w:pStyle`` / ``w:rStyle``) instead of repeating the same
+direct run formatting on every run. ``register_styles`` is applied by the
+document factories, so every generated document (and the scratch document
+static fragments are compiled against) carries the definitions.
+"""
+import copy
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.text.paragraph import Paragraph
+from docx.text.run import Run
+
+
+@dataclass(frozen=True)
+class NamedStyle:
+    """
+    Definition of a document style.
+
+    Attributes:
+        style_id: ``w:styleId`` referenced by paragraphs and runs
+        name: Style name shown in Word
+        kind: ``paragraph`` or ``character``
+        size: Font size in points (None keeps the body size)
+        bold: Bold font
+        italic: Italic font
+        color: Font color as a 6-digit hex string
+        outline_level: Outline level (0-based) of heading styles
+        builtin: Redefines one of Word's built-in styles
+    """
+    style_id: str
+    name: str
+    kind: str = "paragraph"
+    size: Optional[int] = None
+    bold: bool = False
+    italic: bool = False
+    color: Optional[str] = None
+    outline_level: Optional[int] = None
+    builtin: bool = False
+
+
+HEADING_1 = NamedStyle("Heading1", "heading 1", size=20, bold=True, outline_level=0, builtin=True)
+HEADING_2 = NamedStyle("Heading2", "heading 2", size=18, bold=True, outline_level=1, builtin=True)
+HEADING_3 = NamedStyle("Heading3", "heading 3", size=16, bold=True, outline_level=2, builtin=True)
+HEADING_4 = NamedStyle("Heading4", "heading 4", size=13, bold=True, outline_level=3, builtin=True)
+CLAUSE_REFERENCE = NamedStyle("ClauseReference", "Clause Reference", bold=True)
+REQUIREMENT_QUOTE = NamedStyle("RequirementQuote", "Requirement Quote", kind="character", color="0000FF")
+TABLE_HEADER = NamedStyle("TableHeader", "Table Header", kind="character", bold=True)
+
+HEADING_STYLES = {1: HEADING_1, 2: HEADING_2, 3: HEADING_3, 4: HEADING_4}
+
+DOCUMENT_STYLES = (
+    HEADING_1,
+    HEADING_2,
+    HEADING_3,
+    HEADING_4,
+    CLAUSE_REFERENCE,
+    REQUIREMENT_QUOTE,
+    TABLE_HEADER,
+)
+
+
+def _style_xml(style: NamedStyle) -> str:
+    paragraph = style.kind == "paragraph"
+    attributes = f'w:type="{style.kind}" w:styleId="{style.style_id}"'
+    if not style.builtin:
+        attributes += ' w:customStyle="1"'
+
+    parts = [f'<w:name w:val="{style.name}"/>']
+    if paragraph:
+        parts.append('<w:basedOn w:val="Normal"/><w:next w:val="Normal"/>')
+    else:
+        parts.append('<w:basedOn w:val="DefaultParagraphFont"/>')
+    parts.append("<w:qFormat/>")
+
+    if paragraph and style.outline_level is not None:
+        parts.append(f'<w:pPr><w:keepNext/><w:outlineLvl w:val="{style.outline_level}"/></w:pPr>')
+
+    run_properties = ""
+    if style.bold:
+        run_properties += "<w:b/><w:bCs/>"
+    if style.italic:
+        run_properties += "<w:i/><w:iCs/>"
+    if style.color:
+        run_properties += f'<w:color w:val="{style.color}"/>'
+    if style.size:
+        run_properties += f'<w:sz w:val="{style.size * 2}"/><w:szCs w:val="{style.size * 2}"/>'
+    if run_properties:
+        parts.append(f"<w:rPr>{run_properties}</w:rPr>")
+
+    return f'<w:style {nsdecls("w")} {attributes}>{"".join(parts)}</w:style>'
+
+
+@lru_cache(maxsize=None)
+def _style_template(style: NamedStyle):
+    return parse_xml(_style_xml(style))
+
+
+def register_styles(document: Document) -> None:
+    """
+    Define the shared named styles in a document.
+
+    Existing definitions with the same style id (e.g. the default
+    template's built-in headings) are replaced.
+
+    Args:
+        document: Target document
+    """
+    styles = document.styles.element
+    for style in DOCUMENT_STYLES:
+        existing = styles.get_by_id(style.style_id)
+        if existing is not None:
+            styles.remove(existing)
+        styles.append(copy.deepcopy(_style_template(style)))
+
+
+def add_styled_paragraph(document: Document, text: str, style: NamedStyle) -> Paragraph:
+    """Append a paragraph with a named paragraph style."""
+    paragraph = document.add_paragraph(text)
+    paragraph._p.style = style.style_id
+    return paragraph
+
+
+def add_heading(document: Document, text: str, level: int) -> Paragraph:
+    """Append a section heading (``level`` 1-4)."""
+    return add_styled_paragraph(document, text, HEADING_STYLES[level])
+
+
+def add_clause_reference(document: Document, text: str) -> Paragraph:
+    """Append a clause reference line, e.g. ``[Reference: Clause 6.2]``."""
+    return add_styled_paragraph(document, text, CLAUSE_REFERENCE)
+
+
+def add_styled_run(paragraph: Paragraph, text: str, style: NamedStyle) -> Run:
+    """Append a run with a named character style."""
+    run = paragraph.add_run(text)
+    run._r.style = style.style_id
+    return run
+
@@ -0,0 +1,178 @@
+"""Bulk table writer that emits DOCX tables in a single linear pass.
+
+``table.add_row().cells`` rebuilds python-docx's cell list for the whole row
+on every access and ``cell.text`` re-parses run XML for every assignment, so
+large tables grow quadratically. This writer appends ``w:tr``/``w:tc``
+elements directly to the table element instead. Constant rows can be passed
+as ``StaticRow`` and are built once, then deep-copied.
+"""
+import copy
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence, Tuple, Union
+
+from docx import Document
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.table import Table
+from lxml import etree
+
+from .styles import TABLE_HEADER
+
+
+@dataclass(frozen=True)
+class TableCell:
+    """
+    A table cell with optional formatting.
+
+    Attributes:
+        text: Cell text (newlines become line breaks, tabs become tabs)
+        bold: Bold run
+        italic: Italic run
+        color: Font color as a 6-digit hex string (e.g. 'FF0000')
+        fill: Background shading as a 6-digit hex string
+        span: Number of grid columns the cell spans
+        style: Character style id of the run (see ``styles``)
+    """
+    text: str = ""
+    bold: bool = False
+    italic: bool = False
+    color: Optional[str] = None
+    fill: Optional[str] = None
+    span: int = 1
+    style: Optional[str] = None
+
+
+CellValue = Union[str, None, TableCell]
+
+
+@dataclass(frozen=True)
+class StaticRow:
+    """
+    A table row whose content never changes (e.g. checklist group headings).
+
+    Its ``w:tr`` element is compiled once per column layout and deep-copied
+    into every table that uses it.
+    """
+    values: Tuple[CellValue, ...]
+
+
+def _sub(parent, tag: str, **attrs):
+    element = etree.SubElement(parent, qn(tag))
+    for name, value in attrs.items():
+        element.set(qn(f"w:{name}"), value)
+    return element
+
+
+def _append_text(run, text: str) -> None:
+    # Mirrors python-docx run.text: '\n' -> <w:br/>, '\t' -> <w:tab/>
+    for line_index, line in enumerate(text.split("\n")):
+        if line_index:
+            _sub(run, "w:br")
+        for part_index, part in enumerate(line.split("\t")):
+            if part_index:
+                _sub(run, "w:tab")
+            if part:
+                t = _sub(run, "w:t")
+                t.text = part
+                if part != part.strip():
+                    t.set("{http://www.w3.org/XML/1998/namespace}space", "preserve")
+
+
+def _append_cell(tr, value: CellValue, width: int) -> int:
+    cell = value if isinstance(value, TableCell) else TableCell(text=value or "")
+
+    tc = _sub(tr, "w:tc")
+    tc_pr = _sub(tc, "w:tcPr")
+    _sub(tc_pr, "w:tcW", type="dxa", w=str(width))
+    if cell.span > 1:
+        _sub(tc_pr, "w:gridSpan", val=str(cell.span))
+    if cell.fill:
+        _sub(tc_pr, "w:shd", val="clear", color="auto", fill=cell.fill)
+
+    paragraph = _sub(tc, "w:p")
+    if cell.text:
+        run = _sub(paragraph, "w:r")
+        if cell.style or cell.bold or cell.italic or cell.color:
+            r_pr = _sub(run, "w:rPr")
+            if cell.style:
+                _sub(r_pr, "w:rStyle", val=cell.style)
+            if cell.bold:
+                _sub(r_pr, "w:b")
+            if cell.italic:
+                _sub(r_pr, "w:i")
+            if cell.color:
+                _sub(r_pr, "w:color", val=cell.color)
+        _append_text(run, cell.text)
+    return max(cell.span, 1)
+
+
+def _append_row(tbl, values: Sequence[CellValue], widths: Sequence[int]) -> None:
+    tr = _sub(tbl, "w:tr")
+    column = 0
+    for value in values:
+        if column >= len(widths):
+            break
+        span = value.span if isinstance(value, TableCell) else 1
+        width = sum(widths[column:column + span])
+        column += _append_cell(tr, value, width)
+    # Pad short rows so every row covers the full grid
+    while column < len(widths):
+        column += _append_cell(tr, "", widths[column])
+
+
+@lru_cache(maxsize=4096)
+def _compile_static_row(row: StaticRow, widths: Tuple[int, ...]):
+    holder = OxmlElement("w:tbl")
+    _append_row(holder, row.values, widths)
+    return holder[0]
+
+
+def append_bulk_table(
+    document: Document,
+    headers: Sequence[str],
+    rows: Iterable[Sequence[CellValue]],
+    *,
+    style: Optional[str] = "Table Grid",
+    bold_header: bool = True,
+    header_fill: Optional[str] = None,
+) -> Table:
+    """
+    Append a table with a header row and body rows in one pass.
+
+    Args:
+        document: Target document
+        headers: Header labels (defines the column count)
+        rows: Iterable of row values (or StaticRow); each value is a
+            string, None or a TableCell for formatted, shaded or spanning
+            cells
+        style: Table style name
+        bold_header: Render header labels with the Table Header style
+        header_fill: Optional header shading as a 6-digit hex string
+
+    Returns:
+        The created python-docx Table
+    """
+    table = document.add_table(rows=1, cols=len(headers))
+    if style:
+        table.style = style
+
+    tbl = table._tbl
+    widths = [int(grid_col.get(qn("w:w"))) for grid_col in tbl.tblGrid.gridCol_lst]
+    tbl.remove(tbl.tr_lst[0])
+
+    _append_row(
+        tbl,
+        [
+            TableCell(text=label, style=TABLE_HEADER.style_id if bold_header else None, fill=header_fill)
+            for label in headers
+        ],
+        widths,
+    )
+    grid = tuple(widths)
+    for values in rows:
+        if isinstance(values, StaticRow):
+            tbl.append(copy.deepcopy(_compile_static_row(values, grid)))
+        else:
+            _append_row(tbl, values, widths)
+    return table
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from .database import Base
 
 
@@ -18,122 +20,161 @@ class Component(Base):
     element_item = Column(Text, nullable=True)
 
 
-# Base class for component family tables
-class ComponentFamilyBase:
+# Consolidated requirement catalogue
+class CatalogueRequirement(Base):
     """
-    Base class for component family tables with common structure.
-    
-    Note: These tables are structured based on Common Criteria (CC) organization.
-    They store security functional and assurance requirements organized by families.
+    Requirement catalogue rows of all component families in one table.
+
+    Note: These rows are structured based on Common Criteria (CC) organization.
+    ``family_code`` (``fau`` … ``ava``) partitions the rows by family; the
+    per-family models below map the partitions through single-table
+    inheritance, and read-only views with the former table names
+    (``fau_db`` …) are kept for SQL clients.
+
+    Indexes follow the access patterns: a family partition in table order
+    (catalogue cache), components by family (lookups and imports), and the
+    class → family → component → element hierarchy across families.
     """
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    class_field = Column("class", String(255), nullable=True, index=True)  # Use class_field to avoid Python keyword
-    family = Column(String(255), nullable=True, index=True)
-    component = Column(String(255), nullable=True, index=True)
+    __tablename__ = "catalogue_requirements"
+    __table_args__ = (
+        Index("ix_catalogue_requirements_family_order", "family_code", "id"),
+        Index("ix_catalogue_requirements_family_component", "family_code", "component", "element"),
+        Index("ix_catalogue_requirements_hierarchy", "class", "family", "component", "element"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    family_code = Column(String(3), nullable=False)
+    class_field = Column("class", String(255), nullable=True)  # Use class_field to avoid Python keyword
+    family = Column(String(255), nullable=True)
+    component = Column(String(255), nullable=True)
     component_name = Column(Text, nullable=True)
-    element = Column(String(255), nullable=True, index=True)
+    element = Column(String(255), nullable=True)
     element_item = Column(Text, nullable=True)
 
+    __mapper_args__ = {"polymorphic_on": family_code}
+
+    # Former table name of the family partition, e.g. ``fau_db``
+    family_table = ""
+
 
 # Functional Requirements Tables (f-class tables)
 # Note: These are based on Common Criteria Protection Profile families.
 # They organize security functional requirements by category.
-class FauDb(ComponentFamilyBase, Base):
+class FauDb(CatalogueRequirement):
     """Security audit (FAU) family - Common Criteria legacy structure"""
-    __tablename__ = "fau_db"
+    family_table = "fau_db"
+    __mapper_args__ = {"polymorphic_identity": "fau"}
 
 
-class FcoDb(ComponentFamilyBase, Base):
+class FcoDb(CatalogueRequirement):
     """Communication (FCO) family"""
-    __tablename__ = "fco_db"
+    family_table = "fco_db"
+    __mapper_args__ = {"polymorphic_identity": "fco"}
 
 
-class FcsDb(ComponentFamilyBase, Base):
+class FcsDb(CatalogueRequirement):
     """Cryptographic support (FCS) family"""
-    __tablename__ = "fcs_db"
+    family_table = "fcs_db"
+    __mapper_args__ = {"polymorphic_identity": "fcs"}
 
 
-class FdpDb(ComponentFamilyBase, Base):
+class FdpDb(CatalogueRequirement):
     """User data protection (FDP) family"""
-    __tablename__ = "fdp_db"
+    family_table = "fdp_db"
+    __mapper_args__ = {"polymorphic_identity": "fdp"}
 
 
-class FiaDb(ComponentFamilyBase, Base):
+class FiaDb(CatalogueRequirement):
     """Identification and authentication (FIA) family"""
-    __tablename__ = "fia_db"
+    family_table = "fia_db"
+    __mapper_args__ = {"polymorphic_identity": "fia"}
 
 
-class FmtDb(ComponentFamilyBase, Base):
+class FmtDb(CatalogueRequirement):
     """Security management (FMT) family"""
-    __tablename__ = "fmt_db"
+    family_table = "fmt_db"
+    __mapper_args__ = {"polymorphic_identity": "fmt"}
 
 
-class FprDb(ComponentFamilyBase, Base):
+class FprDb(CatalogueRequirement):
     """Privacy (FPR) family"""
-    __tablename__ = "fpr_db"
+    family_table = "fpr_db"
+    __mapper_args__ = {"polymorphic_identity": "fpr"}
 
 
-class FptDb(ComponentFamilyBase, Base):
+class FptDb(CatalogueRequirement):
     """Protection of the TSF (FPT) family - TSF = TOE Security Functions (Common Criteria)"""
-    __tablename__ = "fpt_db"
+    family_table = "fpt_db"
+    __mapper_args__ = {"polymorphic_identity": "fpt"}
 
 
-class FruDb(ComponentFamilyBase, Base):
+class FruDb(CatalogueRequirement):
     """Resource utilisation (FRU) family"""
-    __tablename__ = "fru_db"
+    family_table = "fru_db"
+    __mapper_args__ = {"polymorphic_identity": "fru"}
 
 
-class FtaDb(ComponentFamilyBase, Base):
+class FtaDb(CatalogueRequirement):
     """Product access (FTA) family"""
-    __tablename__ = "fta_db"
+    family_table = "fta_db"
+    __mapper_args__ = {"polymorphic_identity": "fta"}
 
 
-class FtpDb(ComponentFamilyBase, Base):
+class FtpDb(CatalogueRequirement):
     """Trusted path/channels (FTP) family"""
-    __tablename__ = "ftp_db"
+    family_table = "ftp_db"
+    __mapper_args__ = {"polymorphic_identity": "ftp"}
 
 
 # Assurance Requirements Tables (a-class tables)
 # Note: These are based on Common Criteria Evaluation Assurance Level (EAL) components.
 # They organize security assurance requirements by category.
-class AcoDb(ComponentFamilyBase, Base):
+class AcoDb(CatalogueRequirement):
     """Composition (ACO) family - Common Criteria legacy structure"""
-    __tablename__ = "aco_db"
+    family_table = "aco_db"
+    __mapper_args__ = {"polymorphic_identity": "aco"}
 
 
-class AdvDb(ComponentFamilyBase, Base):
+class AdvDb(CatalogueRequirement):
     """Development (ADV) family"""
-    __tablename__ = "adv_db"
+    family_table = "adv_db"
+    __mapper_args__ = {"polymorphic_identity": "adv"}
 
 
-class AgdDb(ComponentFamilyBase, Base):
+class AgdDb(CatalogueRequirement):
     """Guidance documents (AGD) family"""
-    __tablename__ = "agd_db"
+    family_table = "agd_db"
+    __mapper_args__ = {"polymorphic_identity": "agd"}
 
 
-class AlcDb(ComponentFamilyBase, Base):
+class AlcDb(CatalogueRequirement):
     """Life-cycle support (ALC) family"""
-    __tablename__ = "alc_db"
+    family_table = "alc_db"
+    __mapper_args__ = {"polymorphic_identity": "alc"}
 
 
-class ApeDb(ComponentFamilyBase, Base):
+class ApeDb(CatalogueRequirement):
     """Protection Profile evaluation (APE) family"""
-    __tablename__ = "ape_db"
+    family_table = "ape_db"
+    __mapper_args__ = {"polymorphic_identity": "ape"}
 
 
-class AseDb(ComponentFamilyBase, Base):
+class AseDb(CatalogueRequirement):
     """CRA Documentation evaluation (ASE) family - Common Criteria: Security Target evaluation"""
-    __tablename__ = "ase_db"
+    family_table = "ase_db"
+    __mapper_args__ = {"polymorphic_identity": "ase"}
 
 
-class AteDb(ComponentFamilyBase, Base):
+class AteDb(CatalogueRequirement):
     """Tests (ATE) family"""
-    __tablename__ = "ate_db"
+    family_table = "ate_db"
+    __mapper_args__ = {"polymorphic_identity": "ate"}
 
 
-class AvaDb(ComponentFamilyBase, Base):
+class AvaDb(CatalogueRequirement):
     """Vulnerability assessment (AVA) family"""
-    __tablename__ = "ava_db"
+    family_table = "ava_db"
+    __mapper_args__ = {"polymorphic_identity": "ava"}
 
 
 # Special table for element lists with colors
@@ -151,3 +192,61 @@ class ElementListDb(Base):
     element_index = Column(String(255), nullable=True, index=True, unique=True)
     item_list = Column(Text, nullable=True)
     color = Column(String(50), nullable=True)  # For handling colored elements in UI
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class DocumentWorkspace(Base):
+    """
+    Server-side copy of a document workspace.
+
+    Stores the same state shape as the frontend workspace export
+    (``references/CRA_Document_Workspace_*.json``) as serialized JSON so
+    clients can send JSON Patch deltas instead of the whole state.
+    """
+    __tablename__ = "document_workspaces"
+
+    id = Column(String(36), primary_key=True)
+    user_id = Column(String(64), nullable=False, index=True)
+    state = Column(Text, nullable=False, default="{}")
+    version = Column(Integer, nullable=False, default=1)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=_utcnow)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=_utcnow, onupdate=_utcnow)
+
+
+class SbomImport(Base):
+    """
+    An imported SBOM (CycloneDX or SPDX).
+
+    The file itself is not kept; its deduplicated components are stored in
+    ``sbom_components`` and referenced from the third-party components
+    section by ``sbom_id``.
+    """
+    __tablename__ = "sbom_imports"
+
+    id = Column(String(36), primary_key=True)
+    user_id = Column(String(64), nullable=False, index=True)
+    filename = Column(String(255), nullable=True)
+    sbom_format = Column(String(32), nullable=False)
+    component_count = Column(Integer, nullable=False, default=0)
+    duplicate_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=_utcnow)
+
+
+class SbomComponent(Base):
+    """Normalized component row of an imported SBOM (``ThirdPartyComponentEntry`` fields)."""
+    __tablename__ = "sbom_components"
+    __table_args__ = (Index("ix_sbom_components_sbom_position", "sbom_id", "position"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    sbom_id = Column(String(36), ForeignKey("sbom_imports.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)
+    component_name = Column(Text, nullable=True)
+    component_type = Column(String(64), nullable=True)
+    version = Column(String(255), nullable=True)
+    supplier = Column(Text, nullable=True)
+    purpose = Column(Text, nullable=True)
+    license = Column(Text, nullable=True)
+    purl = Column(Text, nullable=True)
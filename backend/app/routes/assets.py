@@ -0,0 +1,86 @@
+"""Content-addressed image asset endpoints."""
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+from app.config import ASSET_ROOT, COVER_UPLOAD_MAX_BYTES, UPLOAD_CHUNK_SIZE
+from app.utils.asset_store import (
+    ASSET_SCHEME,
+    asset_path,
+    is_valid_digest,
+    store_asset_file,
+)
+from app.utils.http_cache import CACHE_IMMUTABLE_PUBLIC, cached_file_response
+from app.utils.upload_stream import image_media_type, iter_upload_file, sniff_image_format, stream_to_temp_file
+
+
+router = APIRouter()
+
+
+@router.post("/assets")
+async def upload_asset(file: UploadFile = File(...)):
+    """
+    Upload an image asset once and get a content-addressed reference.
+
+    Uploading the same bytes again returns the same digest without
+    storing a second copy. Uploads go through the same streaming path as
+    cover images: the size limit is enforced while receiving and the image
+    is verified with Pillow before it is stored.
+
+    Args:
+        file: Uploaded image file
+
+    Returns:
+        Digest, ``asset://`` reference for HTML and download path
+
+    Raises:
+        HTTPException: 413 if the upload exceeds the image size limit, 400
+            if the content is not a supported image
+    """
+    tmp_path, _ = await stream_to_temp_file(
+        iter_upload_file(file, UPLOAD_CHUNK_SIZE),
+        ASSET_ROOT,
+        COVER_UPLOAD_MAX_BYTES,
+    )
+    try:
+        if not await run_in_threadpool(sniff_image_format, tmp_path):
+            raise HTTPException(status_code=400, detail="Only image files are allowed")
+        media_type = await run_in_threadpool(image_media_type, tmp_path)
+        digest = await run_in_threadpool(store_asset_file, tmp_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return {
+        "status": "uploaded",
+        "sha256": digest,
+        "media_type": media_type,
+        "src": f"{ASSET_SCHEME}{digest}",
+        "path": f"/assets/{digest}",
+    }
+
+
+@router.get("/assets/{digest}")
+async def download_asset(digest: str, request: Request):
+    """
+    Download an image asset by digest.
+    
+    Assets are content-addressed, so the digest doubles as a strong ETag
+    and responses are cacheable indefinitely.
+
+    Raises:
+        HTTPException: If digest is invalid or asset not found
+    """
+    if not is_valid_digest(digest):
+        raise HTTPException(status_code=400, detail="Invalid asset reference")
+
+    file_path = asset_path(digest)
+    if not file_path.exists():
+        raise HTTPException(status_code=404, detail="Asset not found")
+
+    media_type = await run_in_threadpool(image_media_type, file_path) or "application/octet-stream"
+
+    return await cached_file_response(
+        request,
+        file_path,
+        media_type=media_type,
+        cache_control=CACHE_IMMUTABLE_PUBLIC,
+        etag=f'"{digest}"',
+    )
@@ -0,0 +1,212 @@
+"""Requirement catalogue endpoints."""
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import CATALOGUE_UPLOAD_MAX_BYTES, CATALOGUE_UPLOAD_ROOT, UPLOAD_CHUNK_SIZE
+from app.database import get_db
+from app.schemas import (
+    CatalogueComponentOut,
+    CatalogueImportOut,
+    CatalogueSnapshotOut,
+    CatalogueTable,
+    DependencyClosureOut,
+    DependencyQuery,
+    DependencyResolutionOut,
+    EalPackageOut,
+)
+from app.utils.assurance_packages import get_eal_package, normalize_eal
+from app.utils.catalogue import get_catalogue_component, get_dependency_graph
+from app.utils.catalogue_import import (
+    CatalogueFormatError,
+    begin_catalogue_import,
+    get_catalogue_import_progress,
+    import_catalogue,
+)
+from app.utils.catalogue_snapshot import export_catalogue_snapshot
+from app.utils.element_templates import get_element_template
+from app.utils.upload_stream import iter_upload_file, stream_to_temp_file
+
+
+router = APIRouter()
+
+
+@router.get("/catalogue/{table}/components/{component}", response_model=CatalogueComponentOut)
+def get_component_templates(table: CatalogueTable, component: str):
+    """
+    Get a catalogue component with its compiled element templates.
+
+    The templates are the ones the DOCX renderer fills, so the UI can
+    collect operation values per slot and send them back as the
+    ``parameters`` of a catalogue requirement.
+
+    Args:
+        table: Family table, e.g. ``fau_db``
+        component: Component identifier, e.g. ``FAU_GEN.1``
+
+    Returns:
+        Component metadata and elements
+
+    Raises:
+        HTTPException: If the component is not in the table
+    """
+    entry = get_catalogue_component(table, component)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Component not found")
+    return {
+        "table": entry.table,
+        "component": entry.component,
+        "name": entry.name,
+        "class_name": entry.class_name,
+        "family": entry.family,
+        "elements": [
+            {
+                "element": element.element,
+                "text": element.text,
+                "template": get_element_template(element.element, element.text).to_json(),
+            }
+            for element in entry.elements
+        ],
+    }
+
+
+@router.get("/catalogue/dependencies/{component}", response_model=DependencyClosureOut)
+def get_component_dependencies(component: str):
+    """
+    Get the transitive dependencies of a component.
+
+    Raises:
+        HTTPException: If the component is not in the catalogue
+    """
+    graph = get_dependency_graph()
+    entry = graph.components.get(component.strip())
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Component not found")
+    return {
+        "component": entry.component,
+        "hierarchical_to": list(entry.hierarchical_to),
+        "dependencies": list(graph.closure(entry.component)),
+    }
+
+
+@router.post("/catalogue/dependencies", response_model=DependencyResolutionOut)
+def resolve_dependencies(payload: DependencyQuery):
+    """
+    Check a selection of components in one call.
+
+    Components of the ``selected_eal`` package count as selected. Returns
+    the package contents, the missing transitive dependencies and the
+    unmet dependency groups.
+
+    Args:
+        payload: Selected components and EAL
+
+    Returns:
+        Dependency check result
+    """
+    graph = get_dependency_graph()
+    components = [component.strip() for component in payload.components if component and component.strip()]
+    package = get_eal_package(payload.selected_eal)
+    selection = set(components).union(package)
+    return {
+        "eal": normalize_eal(payload.selected_eal),
+        "eal_package": list(package),
+        "closure": list(graph.selection_closure(selection)),
+        "unmet": [
+            {"component": item.component, "alternatives": list(item.alternatives)}
+            for item in graph.unmet(selection)
+        ],
+        "unknown": [component for component in components if component not in graph.components],
+    }
+
+
+@router.get("/catalogue/eal-packages/{eal}", response_model=EalPackageOut)
+def get_eal_package_components(eal: str):
+    """
+    Get the assurance components of an EAL package.
+
+    Raises:
+        HTTPException: If the label is not EAL1-EAL7
+    """
+    key = normalize_eal(eal)
+    if key is None:
+        raise HTTPException(status_code=404, detail="EAL package not found")
+    return {"eal": key, "components": list(get_eal_package(key))}
+
+
+@router.post("/catalogue/import", response_model=CatalogueImportOut)
+async def import_catalogue_xml(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """
+    Import a Common Criteria catalogue or Protection Profile XML file.
+
+    The upload is streamed to a temp file and parsed incrementally; its
+    components replace the stored rows of the same components in the
+    family tables, and elements with operations are upserted into the
+    element list table. Poll ``GET /catalogue/import`` for progress;
+    progress and the running-import check are per worker process.
+
+    Args:
+        file: Catalogue XML file
+        db: Database session
+
+    Returns:
+        Final import counters
+
+    Raises:
+        HTTPException: If an import is already running, the file is too
+            large or it is not well-formed XML
+    """
+    progress = begin_catalogue_import()
+    if progress is None:
+        raise HTTPException(status_code=409, detail="A catalogue import is already running")
+    try:
+        tmp_path, _ = await stream_to_temp_file(
+            iter_upload_file(file, UPLOAD_CHUNK_SIZE),
+            CATALOGUE_UPLOAD_ROOT,
+            CATALOGUE_UPLOAD_MAX_BYTES,
+        )
+    except BaseException as exc:
+        progress.status = "failed"
+        progress.error = str(getattr(exc, "detail", exc))
+        raise
+    try:
+        result = await run_in_threadpool(import_catalogue, db, tmp_path, progress)
+    except CatalogueFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return result.to_json()
+
+
+@router.get("/catalogue/import", response_model=CatalogueImportOut)
+def get_catalogue_import_status():
+    """
+    Get the progress of the running or latest catalogue import.
+
+    Only imports run by the worker process serving the request are known.
+
+    Raises:
+        HTTPException: If no import has run in this process
+    """
+    progress = get_catalogue_import_progress()
+    if progress is None:
+        raise HTTPException(status_code=404, detail="No catalogue import")
+    return progress.to_json()
+
+
+@router.post("/catalogue/snapshot", response_model=CatalogueSnapshotOut)
+def export_snapshot(db: Session = Depends(get_db)):
+    """
+    Re-export the memory-mapped catalogue snapshot from the database.
+
+    Imports export it automatically; use this after changing catalogue
+    rows by other means. Other workers pick up the new file within
+    ``CATALOGUE_SNAPSHOT_CHECK_SECONDS``.
+
+    Raises:
+        HTTPException: If no snapshot path is configured
+    """
+    info = export_catalogue_snapshot(db)
+    if info is None:
+        raise HTTPException(status_code=404, detail="Catalogue snapshot is not configured")
+    return info.to_json()
@@ -1,27 +1,128 @@
 """Cover page upload and preview endpoints."""
+import asyncio
+import json
+import re
 import shutil
+import time
+import uuid
+import weakref
 from pathlib import Path
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import FileResponse
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, UploadFile, File, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.config import COVER_UPLOAD_ROOT, COVER_DOCX_ROOT
+from app.config import (
+    COVER_UPLOAD_ROOT,
+    COVER_DOCX_ROOT,
+    COVER_UPLOAD_MAX_BYTES,
+    UPLOAD_CHUNK_SIZE,
+    UPLOAD_SESSION_TTL_SECONDS,
+)
+from app.database import get_db
 from app.utils.validators import get_user_directory
+from app.utils.http_cache import CACHE_IMMUTABLE_PRIVATE, DOCX_MEDIA_TYPE, cached_file_response
 from app.utils.image_handler import resolve_uploaded_image_path
+from app.utils.image_variants import VARIANT_SIZES, get_cover_variant, is_variant
 from app.docx_builder.cover_builder import build_cover_document
-from app.schemas import CoverPreviewRequest
+from app.utils.upload_stream import (
+    PARTIAL_SUFFIX,
+    append_stream_to_file,
+    commit_image_upload,
+    iter_upload_file,
+    remove_files_except,
+    remove_stale_files,
+    stream_to_temp_file,
+)
+from app.schemas import CoverPreviewRequest, UploadSessionCreate
+from app.routes.workspace import get_workspace_or_404
+from app.utils.workspace_payload import build_cover_preview_payload
 
 
 router = APIRouter()
 
 
+UPLOAD_SESSION_DIR = ".sessions"
+UPLOAD_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+UPLOAD_SESSION_SWEEP_INTERVAL_SECONDS = 60 * 60
+
+
+class _UploadSessionLocks:
+    """One asyncio lock per upload session, dropped once no request holds it."""
+
+    def __init__(self):
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def get(self, upload_id: str) -> asyncio.Lock:
+        lock = self._locks.get(upload_id)
+        if lock is None:
+            lock = self._locks[upload_id] = asyncio.Lock()
+        return lock
+
+
+_session_locks = _UploadSessionLocks()
+_last_session_sweep = 0.0
+
+
+async def _cover_upload_response(user_id: str, image_path: Path) -> dict:
+    # Variants are produced once here so previews embed them without re-encoding
+    await run_in_threadpool(get_cover_variant, image_path, "thumb")
+    return {
+        "status": "uploaded",
+        "filename": image_path.name,
+        "path": f"/cover/uploads/{user_id}/{image_path.name}",
+        "thumbnail_path": f"/cover/uploads/{user_id}/{image_path.name}?variant=thumb",
+    }
+
+
+def _session_paths(user_id: str, upload_id: str, *, create: bool = False):
+    if not UPLOAD_ID_PATTERN.match(upload_id):
+        raise HTTPException(status_code=400, detail="Invalid upload identifier")
+    session_dir = get_user_directory(COVER_UPLOAD_ROOT, user_id, create=create) / UPLOAD_SESSION_DIR
+    if create:
+        session_dir.mkdir(parents=True, exist_ok=True)
+    return session_dir / f"{upload_id}.json", session_dir / f"{upload_id}{PARTIAL_SUFFIX}"
+
+
+def _sweep_upload_sessions() -> None:
+    """Delete resumable upload sessions of all users abandoned for longer than the TTL."""
+    sessions = {}
+    for path in COVER_UPLOAD_ROOT.glob(f"*/{UPLOAD_SESSION_DIR}/*"):
+        sessions.setdefault(path.with_suffix(""), []).append(path)
+    remove_stale_files((tuple(paths) for paths in sessions.values()), UPLOAD_SESSION_TTL_SECONDS)
+
+
+def _schedule_session_sweep(background_tasks: BackgroundTasks) -> None:
+    global _last_session_sweep
+    now = time.monotonic()
+    if _last_session_sweep and now - _last_session_sweep < UPLOAD_SESSION_SWEEP_INTERVAL_SECONDS:
+        return
+    _last_session_sweep = now
+    background_tasks.add_task(_sweep_upload_sessions)
+
+
+def _load_session(user_id: str, upload_id: str):
+    meta_path, part_path = _session_paths(user_id, upload_id)
+    if not meta_path.exists():
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    meta = json.loads(meta_path.read_text())
+    received = part_path.stat().st_size if part_path.exists() else 0
+    return meta, meta_path, part_path, received
+
+
 @router.post("/upload")
 async def upload_cover_image(
     user_id: str,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
 ):
     """
     Upload a cover image for a user.
     
+    The upload is streamed to a temp file with the size limit enforced while
+    receiving, verified by sniffing the image header, then atomically renamed
+    into place. Previous images are removed after the response is sent.
+    
     Args:
         user_id: User identifier
         file: Uploaded image file
@@ -29,40 +130,187 @@ async def upload_cover_image(
     Returns:
         Upload status and file path
     """
-    if not file.content_type or not file.content_type.startswith("image/"):
-        raise HTTPException(status_code=400, detail="Only image files are allowed")
-    
     upload_dir = get_user_directory(COVER_UPLOAD_ROOT, user_id, create=True)
     
-    # Clear old images
-    for existing in upload_dir.glob("*"):
-        existing.unlink(missing_ok=True)
+    tmp_path, _ = await stream_to_temp_file(
+        iter_upload_file(file, UPLOAD_CHUNK_SIZE),
+        upload_dir,
+        COVER_UPLOAD_MAX_BYTES,
+    )
+    image_path = await commit_image_upload(tmp_path, upload_dir, f"cover_{uuid.uuid4().hex}")
     
-    # Save new image
-    filename = file.filename or "cover_image"
-    file_path = upload_dir / filename
+    background_tasks.add_task(remove_files_except, upload_dir, image_path)
+    return await _cover_upload_response(user_id, image_path)
+
+
+@router.get("/uploads/{user_id}/{filename}")
+async def download_cover_image(
+    user_id: str,
+    filename: str,
+    request: Request,
+    variant: Optional[str] = Query(None),
+):
+    """
+    Download an uploaded cover image or one of its cached variants.
     
-    with file_path.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    Upload filenames are unique per upload, so responses are cacheable
+    indefinitely.
+    
+    Args:
+        user_id: User identifier
+        filename: Original image filename
+        variant: Optional variant name ('print' or 'thumb')
+        
+    Returns:
+        Image file
+        
+    Raises:
+        HTTPException: If the variant is unknown or the image is not found
+    """
+    if variant is not None and variant not in VARIANT_SIZES:
+        raise HTTPException(status_code=400, detail="Unknown image variant")
+    
+    upload_dir = get_user_directory(COVER_UPLOAD_ROOT, user_id, create=False)
+    file_path = upload_dir / Path(filename).name
+    if not file_path.is_file() or is_variant(file_path) or file_path.suffix == PARTIAL_SUFFIX:
+        raise HTTPException(status_code=404, detail="Cover image not found")
+    
+    if variant:
+        file_path = await run_in_threadpool(get_cover_variant, file_path, variant)
+    
+    return await cached_file_response(request, file_path, cache_control=CACHE_IMMUTABLE_PRIVATE)
+
+
+@router.post("/upload/sessions")
+async def create_cover_upload_session(
+    user_id: str,
+    payload: UploadSessionCreate,
+    background_tasks: BackgroundTasks,
+):
+    """
+    Start a resumable chunked cover image upload.
+    
+    Sessions not written to for ``UPLOAD_SESSION_TTL_SECONDS`` are deleted
+    by a sweep that runs after this request, at most once an hour.
+    
+    Args:
+        user_id: User identifier
+        payload: Total size (and optional original filename) of the image
+        
+    Returns:
+        Upload identifier, recommended chunk size and received byte count
+        
+    Raises:
+        HTTPException: If the declared size exceeds the upload limit
+    """
+    if payload.total_size > COVER_UPLOAD_MAX_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Upload exceeds the maximum size of {COVER_UPLOAD_MAX_BYTES} bytes",
+        )
+    
+    upload_id = uuid.uuid4().hex
+    meta_path, part_path = _session_paths(user_id, upload_id, create=True)
+    meta_path.write_text(json.dumps({"total_size": payload.total_size, "filename": payload.filename}))
+    part_path.touch()
+    _schedule_session_sweep(background_tasks)
     
     return {
-        "status": "uploaded",
-        "filename": filename,
-        "path": f"/cover/uploads/{user_id}/{filename}",
+        "upload_id": upload_id,
+        "chunk_size": UPLOAD_CHUNK_SIZE,
+        "received": 0,
+        "total_size": payload.total_size,
     }
 
 
-@router.post("/preview")
-async def generate_cover_preview(payload: CoverPreviewRequest):
+@router.get("/upload/sessions/{user_id}/{upload_id}")
+async def get_cover_upload_session(user_id: str, upload_id: str):
     """
-    Generate cover page preview DOCX.
+    Get the progress of a resumable upload so a client can resume it.
+    
+    Raises:
+        HTTPException: If the session does not exist
+    """
+    meta, _, _, received = _load_session(user_id, upload_id)
+    return {"upload_id": upload_id, "received": received, "total_size": meta["total_size"]}
+
+
+@router.put("/upload/sessions/{user_id}/{upload_id}")
+async def upload_cover_image_chunk(
+    user_id: str,
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+):
+    """
+    Append a chunk (raw request body) to a resumable upload.
+    
+    Chunks of one session are written one at a time in this worker
+    process; the offset is checked against the partial file only once the
+    session lock is held, so a concurrent or retried chunk cannot be
+    appended twice.
     
     Args:
-        payload: Cover page data
+        user_id: User identifier
+        upload_id: Upload session identifier
+        request: Request whose body is the chunk bytes
+        offset: Byte offset of this chunk; must equal the bytes received so far
         
     Returns:
-        Preview file information
+        Updated received byte count
+        
+    Raises:
+        HTTPException: 404 if the session is unknown, 409 if the offset does
+            not match (the detail carries the offset to resume from), 413 if
+            the chunk would exceed the declared size
+    """
+    async with _session_locks.get(upload_id):
+        meta, _, part_path, received = _load_session(user_id, upload_id)
+        if offset != received:
+            raise HTTPException(
+                status_code=409,
+                detail={"message": "Offset does not match received bytes", "received": received},
+            )
+        
+        received = await append_stream_to_file(request.stream(), part_path, meta["total_size"])
+    return {"upload_id": upload_id, "received": received, "total_size": meta["total_size"]}
+
+
+@router.post("/upload/sessions/{user_id}/{upload_id}/complete")
+async def complete_cover_upload_session(
+    user_id: str,
+    upload_id: str,
+    background_tasks: BackgroundTasks,
+):
     """
+    Finish a resumable upload: verify the image and move it into place.
+    
+    Returns:
+        Upload status and file path (same shape as ``POST /upload``)
+        
+    Raises:
+        HTTPException: 404 if the session is unknown, 409 if bytes are
+            missing, 400 if the content is not a supported image
+    """
+    async with _session_locks.get(upload_id):
+        meta, meta_path, part_path, received = _load_session(user_id, upload_id)
+        if received != meta["total_size"]:
+            raise HTTPException(
+                status_code=409,
+                detail={"message": "Upload is incomplete", "received": received},
+            )
+        
+        upload_dir = get_user_directory(COVER_UPLOAD_ROOT, user_id, create=True)
+        try:
+            image_path = await commit_image_upload(part_path, upload_dir, f"cover_{upload_id}")
+        finally:
+            meta_path.unlink(missing_ok=True)
+    
+    background_tasks.add_task(remove_files_except, upload_dir, image_path)
+    return await _cover_upload_response(user_id, image_path)
+
+
+def _render_cover_preview(payload: CoverPreviewRequest) -> dict:
     def get_upload_dir(uid, create=False):
         return get_user_directory(COVER_UPLOAD_ROOT, uid, create=create)
     
@@ -82,6 +330,48 @@ async def generate_cover_preview(payload: CoverPreviewRequest):
     }
 
 
+@router.post("/preview")
+async def generate_cover_preview(payload: CoverPreviewRequest):
+    """
+    Generate cover page preview DOCX.
+    
+    Args:
+        payload: Cover page data
+        
+    Returns:
+        Preview file information
+    """
+    return _render_cover_preview(payload)
+
+
+@router.post("/preview/workspace/{workspace_id}")
+def generate_cover_preview_from_workspace(
+    workspace_id: str,
+    user_id: str = Query(...),
+    db: Session = Depends(get_db),
+):
+    """
+    Generate cover page preview DOCX from a stored server-side workspace.
+    
+    Clients keep the workspace in sync with JSON Patch deltas, so this
+    request carries no document content at all.
+    
+    Args:
+        workspace_id: Workspace identifier
+        user_id: Owner of the workspace
+        db: Database session
+        
+    Returns:
+        Preview file information
+    """
+    workspace = get_workspace_or_404(db, workspace_id, user_id)
+    state = json.loads(workspace.state or "{}")
+    payload = CoverPreviewRequest.model_validate(
+        build_cover_preview_payload(state, workspace.user_id)
+    )
+    return _render_cover_preview(payload)
+
+
 @router.delete("/upload/{user_id}")
 async def cleanup_cover_images(user_id: str):
     """
@@ -121,7 +411,7 @@ async def cleanup_cover_preview(user_id: str):
 
 
 @router.get("/preview/{user_id}/{filename}")
-async def download_cover_preview(user_id: str, filename: str):
+async def download_cover_preview(user_id: str, filename: str, request: Request):
     """
     Download a cover preview document.
     
@@ -141,8 +431,9 @@ async def download_cover_preview(user_id: str, filename: str):
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="Preview file not found")
     
-    return FileResponse(
-        path=str(file_path),
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    return await cached_file_response(
+        request,
+        file_path,
+        media_type=DOCX_MEDIA_TYPE,
         filename=f"cover_preview_{user_id}.docx",
     )
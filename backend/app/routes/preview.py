@@ -1,334 +1,304 @@
-"""Document preview generation endpoints."""
+"""Document preview generation endpoints.
+
+Every preview section is declared once in ``PREVIEW_SECTIONS`` with its
+output directory, request schema and builder. ``register_preview_section``
+then mounts the generate/download/cleanup endpoints for it, so
+cross-cutting behaviour (threadpool offload, build concurrency limit,
+render metrics, conditional downloads) applies to all sections alike.
+Sections whose content is kept in the server-side workspace can also be
+generated from a workspace id.
+"""
+import asyncio
+import json
 import shutil
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Type
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.config import (
     SFR_DOCX_ROOT, SAR_DOCX_ROOT, SPD_DOCX_ROOT, SO_DOCX_ROOT,
-    TSS_DOCX_ROOT, ST_INTRO_DOCX_ROOT, FINAL_DOCX_ROOT, COVER_UPLOAD_ROOT
+    TSS_DOCX_ROOT, ST_INTRO_DOCX_ROOT, FINAL_DOCX_ROOT, COVER_UPLOAD_ROOT,
+    PREVIEW_MAX_CONCURRENT_BUILDS,
 )
+from app.database import get_db
+from app.routes.workspace import get_workspace_or_404
 from app.utils.validators import get_user_directory
+from app.utils.workspace_payload import build_final_preview_payload, build_st_intro_preview_payload
+from app.utils.http_cache import DOCX_MEDIA_TYPE, cached_file_response
 from app.utils.image_handler import resolve_uploaded_image_path
 from app.docx_builder.section_builders import build_html_preview_document, build_tss_preview_document
 from app.docx_builder.st_intro_builder import build_st_intro_combined_document
 from app.docx_builder.final_builder import build_final_combined_document
+from app.docx_builder.html_fragments import fragment_cache_stats
 from app.schemas import HtmlPreviewRequest, STIntroPreviewRequest, FinalPreviewRequest
 
 
 router = APIRouter()
 
 
+@dataclass(frozen=True)
+class PreviewSection:
+    """
+    Declaration of a preview section.
+    
+    Attributes:
+        key: Short section identifier used in endpoint names and metrics
+        title: Human-readable section name for endpoint docs
+        route: Base route; generate is POST ``route``, cleanup is
+            DELETE ``route/{user_id}``
+        root: Root directory for generated documents
+        schema: Request model for the generate endpoint
+        builder: Callable ``(payload, image_file, output_dir) -> Path``
+        download_name: Download filename prefix (``<name>_<user_id>.docx``)
+        download_route: Base route for downloads, defaults to ``route``
+        uses_cover_image: Resolve ``payload.cover_data['image_path']``
+        workspace_payload: Callable ``(state, user_id) -> dict`` building the
+            request from a workspace state; mounts POST
+            ``route/workspace/{workspace_id}``
+    """
+    key: str
+    title: str
+    route: str
+    root: Path
+    schema: Type[BaseModel]
+    builder: Callable[[Any, Optional[Path], Path], Path]
+    download_name: str
+    download_route: Optional[str] = None
+    uses_cover_image: bool = False
+    workspace_payload: Optional[Callable[[dict, str], dict]] = None
+
+
+class _PreviewMetrics:
+    """Thread-safe per-section render counters and timings."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sections: Dict[str, Dict[str, float]] = {}
+
+    def record(self, key: str, seconds: float, failed: bool) -> None:
+        with self._lock:
+            entry = self._sections.setdefault(
+                key,
+                {"builds": 0, "failures": 0, "total_seconds": 0.0, "last_seconds": 0.0, "max_seconds": 0.0},
+            )
+            entry["builds"] += 1
+            entry["failures"] += int(failed)
+            entry["total_seconds"] += seconds
+            entry["last_seconds"] = seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._sections.items()}
+
+
+_metrics = _PreviewMetrics()
+_build_slots = asyncio.Semaphore(PREVIEW_MAX_CONCURRENT_BUILDS)
+
+
 # Helper function for image resolution
 def get_upload_dir(user_id: str, create: bool = False):
     """Get user upload directory."""
     return get_user_directory(COVER_UPLOAD_ROOT, user_id, create=create)
 
 
-# SFR Preview Endpoints
-@router.post("/security/sfr/preview")
-async def generate_sfr_preview(payload: HtmlPreviewRequest):
-    """Generate Security Functional Requirements preview."""
-    output_dir = get_user_directory(SFR_DOCX_ROOT, payload.user_id, create=True)
-    output_path = build_html_preview_document(
-        payload.html_content, 
-        payload.user_id, 
-        output_dir
-    )
-    return {
-        "status": "ready",
-        "filename": output_path.name,
-        "path": f"/security/sfr/preview/{payload.user_id}/{output_path.name}",
-    }
-
-
-@router.get("/security/sfr/preview/{user_id}/{filename}")
-async def download_sfr_preview(user_id: str, filename: str):
-    """Download SFR preview document."""
-    docx_dir = get_user_directory(SFR_DOCX_ROOT, user_id, create=False)
-    file_path = docx_dir / filename
-    
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="Preview file not found")
-    
-    return FileResponse(
-        path=str(file_path),
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        filename=f"sfr_preview_{user_id}.docx",
-    )
-
-
-@router.delete("/security/sfr/preview/{user_id}")
-async def cleanup_sfr_preview(user_id: str):
-    """Delete SFR preview documents."""
-    docx_dir = get_user_directory(SFR_DOCX_ROOT, user_id, create=False)
-    if docx_dir.exists():
-        shutil.rmtree(docx_dir, ignore_errors=True)
-    return {"status": "deleted"}
-
-
-# SAR Preview Endpoints
-@router.post("/security/sar/preview")
-async def generate_sar_preview(payload: HtmlPreviewRequest):
-    """Generate Security Assurance Requirements preview."""
-    output_dir = get_user_directory(SAR_DOCX_ROOT, payload.user_id, create=True)
-    output_path = build_html_preview_document(
-        payload.html_content, 
-        payload.user_id, 
-        output_dir
-    )
-    return {
-        "status": "ready",
-        "filename": output_path.name,
-        "path": f"/security/sar/preview/{payload.user_id}/{output_path.name}",
-    }
-
-
-@router.get("/security/sar/preview/{user_id}/{filename}")
-async def download_sar_preview(user_id: str, filename: str):
-    """Download SAR preview document."""
-    docx_dir = get_user_directory(SAR_DOCX_ROOT, user_id, create=False)
-    file_path = docx_dir / filename
-    
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="Preview file not found")
-    
-    return FileResponse(
-        path=str(file_path),
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        filename=f"sar_preview_{user_id}.docx",
-    )
-
-
-@router.delete("/security/sar/preview/{user_id}")
-async def cleanup_sar_preview(user_id: str):
-    """Delete SAR preview documents."""
-    docx_dir = get_user_directory(SAR_DOCX_ROOT, user_id, create=False)
-    if docx_dir.exists():
-        shutil.rmtree(docx_dir, ignore_errors=True)
-    return {"status": "deleted"}
-
-
-# SPD Preview Endpoints
-@router.post("/spd/preview")
-async def generate_spd_preview(payload: HtmlPreviewRequest):
-    """Generate Security Problem Definition preview."""
-    output_dir = get_user_directory(SPD_DOCX_ROOT, payload.user_id, create=True)
-    output_path = build_html_preview_document(
-        payload.html_content, 
-        payload.user_id, 
-        output_dir
-    )
-    return {
-        "status": "ready",
-        "filename": output_path.name,
-        "path": f"/spd/preview/{payload.user_id}/{output_path.name}",
-    }
-
-
-@router.get("/spd/preview/{user_id}/{filename}")
-async def download_spd_preview(user_id: str, filename: str):
-    """Download SPD preview document."""
-    docx_dir = get_user_directory(SPD_DOCX_ROOT, user_id, create=False)
-    file_path = docx_dir / filename
-    
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="Preview file not found")
-    
-    return FileResponse(
-        path=str(file_path),
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        filename=f"spd_preview_{user_id}.docx",
-    )
-
-
-@router.delete("/spd/preview/{user_id}")
-async def cleanup_spd_preview(user_id: str):
-    """Delete SPD preview documents."""
-    docx_dir = get_user_directory(SPD_DOCX_ROOT, user_id, create=False)
-    if docx_dir.exists():
-        shutil.rmtree(docx_dir, ignore_errors=True)
-    return {"status": "deleted"}
-
-
-# Security Objectives Preview Endpoints
-@router.post("/so/preview")
-async def generate_security_objectives_preview(payload: HtmlPreviewRequest):
-    """Generate Security Objectives preview."""
-    output_dir = get_user_directory(SO_DOCX_ROOT, payload.user_id, create=True)
-    output_path = build_html_preview_document(
-        payload.html_content, 
-        payload.user_id, 
-        output_dir
-    )
-    return {
-        "status": "ready",
-        "filename": output_path.name,
-        "path": f"/so/preview/{payload.user_id}/{output_path.name}",
-    }
-
-
-@router.get("/so/preview/{user_id}/{filename}")
-async def download_so_preview(user_id: str, filename: str):
-    """Download Security Objectives preview document."""
-    docx_dir = get_user_directory(SO_DOCX_ROOT, user_id, create=False)
-    file_path = docx_dir / filename
-    
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="Preview file not found")
-    
-    return FileResponse(
-        path=str(file_path),
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        filename=f"so_preview_{user_id}.docx",
-    )
-
-
-@router.delete("/so/preview/{user_id}")
-async def cleanup_security_objectives_preview(user_id: str):
-    """Delete Security Objectives preview documents."""
-    docx_dir = get_user_directory(SO_DOCX_ROOT, user_id, create=False)
-    if docx_dir.exists():
-        shutil.rmtree(docx_dir, ignore_errors=True)
-    return {"status": "deleted"}
-
-
-# TSS Preview Endpoints
-@router.post("/tss/preview")
-async def generate_tss_preview(payload: HtmlPreviewRequest):
-    """Generate Product Summary Specification (TSS) preview."""
-    output_dir = get_user_directory(TSS_DOCX_ROOT, payload.user_id, create=True)
-    output_path = build_tss_preview_document(
-        payload.html_content, 
-        payload.user_id, 
-        output_dir
-    )
-    return {
-        "status": "ready",
-        "filename": output_path.name,
-        "path": f"/tss/preview/{payload.user_id}/{output_path.name}",
-    }
-
-
-@router.get("/tss/preview/{user_id}/{filename}")
-async def download_tss_preview(user_id: str, filename: str):
-    """Download TSS preview document."""
-    docx_dir = get_user_directory(TSS_DOCX_ROOT, user_id, create=False)
-    file_path = docx_dir / filename
-    
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="Preview file not found")
-    
-    return FileResponse(
-        path=str(file_path),
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        filename=f"tss_preview_{user_id}.docx",
-    )
-
-
-@router.delete("/tss/preview/{user_id}")
-async def cleanup_tss_preview(user_id: str):
-    """Delete TSS preview documents."""
-    docx_dir = get_user_directory(TSS_DOCX_ROOT, user_id, create=False)
-    if docx_dir.exists():
-        shutil.rmtree(docx_dir, ignore_errors=True)
-    return {"status": "deleted"}
-
-
-# ST Introduction Preview Endpoints
-@router.post("/st-intro/preview")
-async def generate_st_intro_preview(payload: STIntroPreviewRequest):
-    """Generate CRA Documentation Introduction preview."""
-    image_file = None
-    if payload.cover_data and payload.cover_data.get("image_path"):
-        try:
-            image_file = resolve_uploaded_image_path(
-                payload.cover_data["image_path"],
-                payload.user_id,
-                get_upload_dir
-            )
-        except Exception:
-            pass  # Continue without image
-    
-    output_dir = get_user_directory(ST_INTRO_DOCX_ROOT, payload.user_id, create=True)
-    output_path = build_st_intro_combined_document(payload, image_file, output_dir)
-    
-    return {
-        "status": "ready",
-        "filename": output_path.name,
-        "path": f"/st-intro/preview/{payload.user_id}/{output_path.name}",
-    }
-
-
-@router.get("/st-intro/preview/{user_id}/{filename}")
-async def download_st_intro_preview(user_id: str, filename: str):
-    """Download ST Introduction preview document."""
-    docx_dir = get_user_directory(ST_INTRO_DOCX_ROOT, user_id, create=False)
-    file_path = docx_dir / filename
-    
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="Preview file not found")
-    
-    return FileResponse(
-        path=str(file_path),
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        filename=f"st_intro_preview_{user_id}.docx",
-    )
-
-
-@router.delete("/st-intro/preview/{user_id}")
-async def cleanup_st_intro_preview(user_id: str):
-    """Delete ST Introduction preview documents."""
-    docx_dir = get_user_directory(ST_INTRO_DOCX_ROOT, user_id, create=False)
-    if docx_dir.exists():
-        shutil.rmtree(docx_dir, ignore_errors=True)
-    return {"status": "deleted"}
-
-
-# Final Preview Endpoints
-@router.post("/final-preview")
-async def generate_final_preview(payload: FinalPreviewRequest):
-    """Generate complete final CRA Documentation."""
-    image_file = None
-    if payload.cover_data and payload.cover_data.get("image_path"):
-        try:
-            image_file = resolve_uploaded_image_path(
-                payload.cover_data["image_path"],
-                payload.user_id,
-                get_upload_dir
-            )
-        except Exception:
-            pass  # Continue without image
-    
-    output_dir = get_user_directory(FINAL_DOCX_ROOT, payload.user_id, create=True)
-    output_path = build_final_combined_document(payload, image_file, output_dir)
+def _resolve_cover_image(payload) -> Optional[Path]:
+    if not payload.cover_data or not payload.cover_data.get("image_path"):
+        return None
+    try:
+        return resolve_uploaded_image_path(
+            payload.cover_data["image_path"],
+            payload.user_id,
+            get_upload_dir
+        )
+    except Exception:
+        return None  # Continue without image
+
+
+def _render_section(section: PreviewSection, payload) -> Path:
+    image_file = _resolve_cover_image(payload) if section.uses_cover_image else None
+    output_dir = get_user_directory(section.root, payload.user_id, create=True)
+    return section.builder(payload, image_file, output_dir)
+
+
+def _workspace_request(section: PreviewSection, db: Session, workspace_id: str, user_id: str) -> BaseModel:
+    workspace = get_workspace_or_404(db, workspace_id, user_id)
+    state = json.loads(workspace.state or "{}")
+    return section.schema.model_validate(section.workspace_payload(state, workspace.user_id))
+
+
+def _html_builder(build: Callable[[str, str, Path], Path]):
+    def builder(payload: HtmlPreviewRequest, image_file: Optional[Path], output_dir: Path) -> Path:
+        return build(payload.html_content, payload.user_id, output_dir)
+    return builder
+
+
+def register_preview_section(target: APIRouter, section: PreviewSection) -> None:
+    """
+    Mount generate, download and cleanup endpoints for a preview section.
     
-    return {
-        "status": "ready",
-        "filename": output_path.name,
-        "path": f"/final-preview/download/{payload.user_id}/{output_path.name}",
-    }
-
-
-@router.delete("/final-preview/{user_id}")
-async def cleanup_final_preview(user_id: str):
-    """Delete final preview documents."""
-    docx_dir = get_user_directory(FINAL_DOCX_ROOT, user_id, create=False)
-    if docx_dir.exists():
-        shutil.rmtree(docx_dir, ignore_errors=True)
-    return {"status": "deleted"}
-
-
-@router.get("/final-preview/download/{user_id}/{filename}")
-async def download_final_preview(user_id: str, filename: str):
-    """Download final preview document."""
-    docx_dir = get_user_directory(FINAL_DOCX_ROOT, user_id, create=False)
-    file_path = docx_dir / filename
+    Builds run in the threadpool (python-docx is CPU-bound and blocking)
+    behind a shared concurrency limit, and their timings are recorded.
     
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="Preview file not found")
+    Args:
+        target: Router to register the endpoints on
+        section: Section declaration
+    """
+    schema = section.schema
+    download_route = section.download_route or section.route
+
+    async def render(payload) -> dict:
+        async with _build_slots:
+            started = time.perf_counter()
+            failed = True
+            try:
+                output_path = await run_in_threadpool(_render_section, section, payload)
+                failed = False
+            finally:
+                _metrics.record(section.key, time.perf_counter() - started, failed)
+        return {
+            "status": "ready",
+            "filename": output_path.name,
+            "path": f"{download_route}/{payload.user_id}/{output_path.name}",
+        }
+
+    async def generate(payload: schema):  # type: ignore[valid-type]
+        return await render(payload)
+
+    async def generate_from_workspace(
+        workspace_id: str,
+        user_id: str = Query(...),
+        db: Session = Depends(get_db),
+    ):
+        payload = await run_in_threadpool(_workspace_request, section, db, workspace_id, user_id)
+        return await render(payload)
+
+    async def download(user_id: str, filename: str, request: Request):
+        docx_dir = get_user_directory(section.root, user_id, create=False)
+        file_path = docx_dir / filename
+        
+        if not file_path.exists():
+            raise HTTPException(status_code=404, detail="Preview file not found")
+        
+        return await cached_file_response(
+            request,
+            file_path,
+            media_type=DOCX_MEDIA_TYPE,
+            filename=f"{section.download_name}_{user_id}.docx",
+        )
+
+    async def cleanup(user_id: str):
+        docx_dir = get_user_directory(section.root, user_id, create=False)
+        if docx_dir.exists():
+            await run_in_threadpool(shutil.rmtree, docx_dir, ignore_errors=True)
+        return {"status": "deleted"}
+
+    for endpoint, verb, doc in (
+        (generate, "generate", "Generate {} preview."),
+        (generate_from_workspace, "generate_workspace", "Generate {} preview from a stored workspace."),
+        (download, "download", "Download {} preview document."),
+        (cleanup, "cleanup", "Delete {} preview documents."),
+    ):
+        endpoint.__name__ = f"{verb}_{section.key}_preview"
+        endpoint.__doc__ = doc.format(section.title)
+
+    target.add_api_route(section.route, generate, methods=["POST"])
+    if section.workspace_payload is not None:
+        target.add_api_route(f"{section.route}/workspace/{{workspace_id}}", generate_from_workspace, methods=["POST"])
+    target.add_api_route(f"{download_route}/{{user_id}}/{{filename}}", download, methods=["GET"])
+    target.add_api_route(f"{section.route}/{{user_id}}", cleanup, methods=["DELETE"])
+
+
+PREVIEW_SECTIONS = (
+    PreviewSection(
+        key="sfr",
+        title="Security Functional Requirements",
+        route="/security/sfr/preview",
+        root=SFR_DOCX_ROOT,
+        schema=HtmlPreviewRequest,
+        builder=_html_builder(build_html_preview_document),
+        download_name="sfr_preview",
+    ),
+    PreviewSection(
+        key="sar",
+        title="Security Assurance Requirements",
+        route="/security/sar/preview",
+        root=SAR_DOCX_ROOT,
+        schema=HtmlPreviewRequest,
+        builder=_html_builder(build_html_preview_document),
+        download_name="sar_preview",
+    ),
+    PreviewSection(
+        key="spd",
+        title="Security Problem Definition",
+        route="/spd/preview",
+        root=SPD_DOCX_ROOT,
+        schema=HtmlPreviewRequest,
+        builder=_html_builder(build_html_preview_document),
+        download_name="spd_preview",
+    ),
+    PreviewSection(
+        key="so",
+        title="Security Objectives",
+        route="/so/preview",
+        root=SO_DOCX_ROOT,
+        schema=HtmlPreviewRequest,
+        builder=_html_builder(build_html_preview_document),
+        download_name="so_preview",
+    ),
+    PreviewSection(
+        key="tss",
+        title="Product Summary Specification (TSS)",
+        route="/tss/preview",
+        root=TSS_DOCX_ROOT,
+        schema=HtmlPreviewRequest,
+        builder=_html_builder(build_tss_preview_document),
+        download_name="tss_preview",
+    ),
+    PreviewSection(
+        key="st_intro",
+        title="CRA Documentation Introduction",
+        route="/st-intro/preview",
+        root=ST_INTRO_DOCX_ROOT,
+        schema=STIntroPreviewRequest,
+        builder=build_st_intro_combined_document,
+        download_name="st_intro_preview",
+        uses_cover_image=True,
+        workspace_payload=build_st_intro_preview_payload,
+    ),
+    PreviewSection(
+        key="final",
+        title="complete final CRA Documentation",
+        route="/final-preview",
+        root=FINAL_DOCX_ROOT,
+        schema=FinalPreviewRequest,
+        builder=build_final_combined_document,
+        download_name="cra_documentation",
+        download_route="/final-preview/download",
+        uses_cover_image=True,
+        workspace_payload=build_final_preview_payload,
+    ),
+)
+
+
+@router.get("/metrics")
+async def get_preview_metrics():
+    """
+    Get per-section preview build counters and timings.
     
-    return FileResponse(
-        path=str(file_path),
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        filename=f"cra_documentation_{user_id}.docx",
-    )
+    Returns:
+        Mapping of section key to build count, failures and durations
+        (seconds), plus parsed-HTML fragment cache counters
+    """
+    return {"sections": _metrics.snapshot(), "html_fragment_cache": fragment_cache_stats()}
+
+
+for _section in PREVIEW_SECTIONS:
+    register_preview_section(router, _section)
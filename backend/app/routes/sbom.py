@@ -0,0 +1,133 @@
+"""SBOM import endpoints for the third-party components table."""
+from typing import List
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import SBOM_UPLOAD_MAX_BYTES, SBOM_UPLOAD_ROOT, UPLOAD_CHUNK_SIZE
+from app.database import get_db
+from app.models import SbomImport
+from app.schemas import SbomComponentOut, SbomImportOut
+from app.utils.sbom_parser import SbomFormatError
+from app.utils.sbom_store import delete_sbom, get_sbom, import_sbom, list_sbom_components
+from app.utils.upload_stream import iter_upload_file, stream_to_temp_file
+from app.utils.validators import validate_user_id
+
+
+router = APIRouter()
+
+
+def get_sbom_or_404(db: Session, sbom_id: str, user_id: str) -> SbomImport:
+    """
+    Load an SBOM import by id on behalf of its owner.
+
+    Imports of other users are reported as missing, so their ids cannot be
+    probed.
+
+    Args:
+        db: Database session
+        sbom_id: Import identifier
+        user_id: Requesting user
+
+    Returns:
+        Import row
+
+    Raises:
+        HTTPException: If the import does not exist or belongs to another
+            user
+    """
+    validate_user_id(user_id)
+    record = get_sbom(db, sbom_id)
+    if not record or record.user_id != user_id:
+        raise HTTPException(status_code=404, detail="SBOM not found")
+    return record
+
+
+@router.post("/sboms", response_model=SbomImportOut, status_code=201)
+async def upload_sbom(
+    user_id: str = Form(...),
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+):
+    """
+    Import a CycloneDX (JSON/XML) or SPDX (JSON/tag-value) SBOM.
+
+    The upload is streamed to a temp file with the size limit enforced while
+    receiving, then parsed incrementally; components are deduplicated by
+    purl (or name and version) and stored in batches. Reference the
+    returned id as ``sbom_id`` of the third-party components section.
+
+    Args:
+        user_id: Owner of the import
+        file: SBOM file
+        db: Database session
+
+    Returns:
+        Import summary
+
+    Raises:
+        HTTPException: If the file is too large or not a supported SBOM
+    """
+    validate_user_id(user_id)
+    tmp_path, _ = await stream_to_temp_file(
+        iter_upload_file(file, UPLOAD_CHUNK_SIZE),
+        SBOM_UPLOAD_ROOT,
+        SBOM_UPLOAD_MAX_BYTES,
+    )
+    try:
+        return await run_in_threadpool(import_sbom, db, tmp_path, user_id, file.filename)
+    except SbomFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+@router.get("/sboms/{sbom_id}", response_model=SbomImportOut)
+def get_sbom_summary(sbom_id: str, user_id: str = Query(...), db: Session = Depends(get_db)):
+    """
+    Get the summary of an imported SBOM.
+
+    Raises:
+        HTTPException: If the import is not found for this user
+    """
+    return get_sbom_or_404(db, sbom_id, user_id)
+
+
+@router.get("/sboms/{sbom_id}/components", response_model=List[SbomComponentOut])
+def list_components(
+    sbom_id: str,
+    user_id: str = Query(...),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    """
+    List the components of an imported SBOM in file order.
+
+    Args:
+        sbom_id: Import identifier
+        user_id: Requesting user
+        skip: Number of components to skip
+        limit: Maximum number of components to return
+        db: Database session
+
+    Returns:
+        Page of components
+
+    Raises:
+        HTTPException: If the import is not found for this user
+    """
+    get_sbom_or_404(db, sbom_id, user_id)
+    return list_sbom_components(db, sbom_id, skip, limit)
+
+
+@router.delete("/sboms/{sbom_id}", status_code=204)
+def remove_sbom(sbom_id: str, user_id: str = Query(...), db: Session = Depends(get_db)):
+    """
+    Delete an imported SBOM and its components.
+
+    Raises:
+        HTTPException: If the import is not found for this user
+    """
+    delete_sbom(db, get_sbom_or_404(db, sbom_id, user_id))
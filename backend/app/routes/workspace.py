@@ -0,0 +1,189 @@
+"""Server-side document workspace endpoints."""
+import json
+import uuid
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models import DocumentWorkspace
+from app.schemas import WorkspaceCreate, WorkspaceOut, WorkspacePatchRequest, WorkspaceSummary
+from app.utils.json_patch import JsonPatchError, JsonPatchTestFailed, apply_json_patch
+from app.utils.validators import validate_user_id
+
+
+router = APIRouter()
+
+
+def _unwrap_export(state: dict) -> dict:
+    """Accept either a bare state or a full workspace export file."""
+    if isinstance(state.get("state"), dict) and "exportedAt" in state:
+        return state["state"]
+    return state
+
+
+def _to_out(workspace: DocumentWorkspace) -> WorkspaceOut:
+    return WorkspaceOut(
+        id=workspace.id,
+        user_id=workspace.user_id,
+        version=workspace.version,
+        updated_at=workspace.updated_at,
+        state=json.loads(workspace.state or "{}"),
+    )
+
+
+def get_workspace_or_404(db: Session, workspace_id: str, user_id: str) -> DocumentWorkspace:
+    """
+    Load a workspace by id on behalf of its owner.
+
+    Workspaces of other users are reported as missing, so their ids cannot
+    be probed.
+
+    Args:
+        db: Database session
+        workspace_id: Workspace identifier
+        user_id: Requesting user
+
+    Returns:
+        Workspace row
+
+    Raises:
+        HTTPException: If the workspace does not exist or belongs to
+            another user
+    """
+    validate_user_id(user_id)
+    workspace = db.query(DocumentWorkspace).filter(DocumentWorkspace.id == workspace_id).first()
+    if not workspace or workspace.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Workspace not found")
+    return workspace
+
+
+@router.post("/workspaces", response_model=WorkspaceOut, status_code=201)
+def create_workspace(payload: WorkspaceCreate, db: Session = Depends(get_db)):
+    """
+    Create a server-side workspace from a full state snapshot.
+
+    Args:
+        payload: Owner and initial workspace state
+        db: Database session
+
+    Returns:
+        Created workspace
+    """
+    validate_user_id(payload.user_id)
+    workspace = DocumentWorkspace(
+        id=uuid.uuid4().hex,
+        user_id=payload.user_id,
+        state=json.dumps(_unwrap_export(payload.state), separators=(",", ":")),
+        version=1,
+    )
+    db.add(workspace)
+    db.commit()
+    db.refresh(workspace)
+    return _to_out(workspace)
+
+
+@router.get("/workspaces", response_model=List[WorkspaceSummary])
+def list_workspaces(user_id: str = Query(...), db: Session = Depends(get_db)):
+    """
+    List workspaces owned by a user (without their state).
+
+    Args:
+        user_id: User identifier
+        db: Database session
+
+    Returns:
+        Workspace summaries, most recently updated first
+    """
+    validate_user_id(user_id)
+    return (
+        db.query(DocumentWorkspace)
+        .filter(DocumentWorkspace.user_id == user_id)
+        .order_by(DocumentWorkspace.updated_at.desc())
+        .all()
+    )
+
+
+@router.get("/workspaces/{workspace_id}", response_model=WorkspaceOut)
+def get_workspace(workspace_id: str, user_id: str = Query(...), db: Session = Depends(get_db)):
+    """
+    Get a workspace including its full state.
+
+    Raises:
+        HTTPException: If workspace not found for this user
+    """
+    return _to_out(get_workspace_or_404(db, workspace_id, user_id))
+
+
+@router.patch("/workspaces/{workspace_id}", response_model=WorkspaceSummary)
+def patch_workspace(
+    workspace_id: str,
+    payload: WorkspacePatchRequest,
+    user_id: str = Query(...),
+    db: Session = Depends(get_db),
+):
+    """
+    Apply JSON Patch operations to a workspace.
+
+    The patch is applied atomically and bumps the workspace version. When
+    ``expected_version`` is provided and does not match, the update is
+    rejected so clients can resynchronise instead of overwriting changes.
+    The new state is written with a conditional update on the version the
+    patch was applied to, so a concurrent patch is rejected rather than
+    silently overwritten.
+
+    Args:
+        workspace_id: Workspace identifier
+        payload: Patch operations and optional expected version
+        user_id: Owner of the workspace
+        db: Database session
+
+    Returns:
+        Updated workspace summary (state is not echoed back)
+
+    Raises:
+        HTTPException: 404 if not found for this user, 409 on version
+            conflict or failed test operation, 422 if an operation cannot
+            be applied
+    """
+    workspace = get_workspace_or_404(db, workspace_id, user_id)
+    base_version = workspace.version
+    if payload.expected_version is not None and payload.expected_version != base_version:
+        raise HTTPException(status_code=409, detail="Workspace version conflict")
+
+    operations = [op.model_dump(by_alias=True, exclude_unset=True) for op in payload.operations]
+    try:
+        state = apply_json_patch(json.loads(workspace.state or "{}"), operations)
+    except JsonPatchTestFailed as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except JsonPatchError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    if not isinstance(state, dict):
+        raise HTTPException(status_code=422, detail="Workspace state must be an object")
+
+    result = db.execute(
+        update(DocumentWorkspace)
+        .where(DocumentWorkspace.id == workspace_id, DocumentWorkspace.version == base_version)
+        .values(state=json.dumps(state, separators=(",", ":")), version=DocumentWorkspace.version + 1)
+    )
+    if result.rowcount != 1:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Workspace version conflict")
+    db.commit()
+    db.refresh(workspace)
+    return workspace
+
+
+@router.delete("/workspaces/{workspace_id}", status_code=204)
+def delete_workspace(workspace_id: str, user_id: str = Query(...), db: Session = Depends(get_db)):
+    """
+    Delete a workspace.
+
+    Raises:
+        HTTPException: If workspace not found for this user
+    """
+    workspace = get_workspace_or_404(db, workspace_id, user_id)
+    db.delete(workspace)
+    db.commit()
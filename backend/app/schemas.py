@@ -1,5 +1,6 @@
 """Pydantic schemas for API request/response validation."""
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -73,6 +74,7 @@ class ThirdPartyComponentEntry(BaseModel):
 
 class ThirdPartyComponentsSection(BaseModel):
     entries: List[ThirdPartyComponentEntry] = Field(default_factory=list)
+    sbom_id: Optional[str] = None  # Imported SBOM whose components follow the entries
     management_approach_html: Optional[str] = None
     evidence_reference_html: Optional[str] = None
 
@@ -309,6 +311,12 @@ class CoverPreviewRequest(BaseModel):
     risk_management: Optional[RiskManagementSection] = None
 
 
+class UploadSessionCreate(BaseModel):
+    """Start a resumable chunked upload."""
+    total_size: int = Field(..., gt=0)
+    filename: Optional[str] = None
+
+
 class HtmlPreviewRequest(BaseModel):
     """Simple HTML preview request."""
     model_config = ConfigDict(populate_by_name=True)
@@ -337,6 +345,25 @@ class STIntroPreviewRequest(BaseModel):
     toe_description_html: Optional[str] = None  # Product Description
 
 
+CatalogueTable = Literal[
+    "fau_db", "fco_db", "fcs_db", "fdp_db", "fia_db", "fmt_db", "fpr_db", "fpt_db", "fru_db", "fta_db", "ftp_db",
+    "aco_db", "adv_db", "agd_db", "alc_db", "ape_db", "ase_db", "ate_db", "ava_db",
+]
+
+
+class CatalogueRequirementRef(BaseModel):
+    """
+    Security requirement selected from the requirement catalogue.
+
+    The backend renders it from the family table rows, so the client only
+    sends ids and the values completing the element operations.
+    """
+    table: CatalogueTable
+    component: str = Field(..., min_length=1)  # e.g. "FAU_GEN.1"
+    element: Optional[str] = None  # e.g. "FAU_GEN.1.1"; all elements when omitted
+    parameters: List[str] = Field(default_factory=list)  # Assignment/selection values in order
+
+
 class FinalPreviewRequest(BaseModel):
     """
     Request model for complete final CRA Documentation preview.
@@ -349,6 +376,12 @@ class FinalPreviewRequest(BaseModel):
     - sfr_list: "SFR" = Security Functional Requirements (now: Technical Requirements)
     - sar_list: "SAR" = Security Assurance Requirements (now: Assurance Requirements)
     - selected_eal: "EAL" = Evaluation Assurance Level (Common Criteria concept)
+    
+    ``sfr_requirements``/``sar_requirements`` select requirements by
+    catalogue id and take precedence over the HTML previews. Without any
+    SAR content (``sar_requirements``, ``sar_preview_html``, ``sar_list``),
+    a ``selected_eal`` naming EAL1-EAL7 renders that package's SARs from
+    the catalogue, provided all of its components are catalogued.
     """
     model_config = ConfigDict(populate_by_name=True)
     
@@ -367,4 +400,161 @@ class FinalPreviewRequest(BaseModel):
     selected_eal: Optional[str] = None  # Legacy: EAL (Evaluation Assurance Level - Common Criteria)
     sfr_preview_html: Optional[str] = None
     sar_preview_html: Optional[str] = None
+    sfr_requirements: List[CatalogueRequirementRef] = Field(default_factory=list)
+    sar_requirements: List[CatalogueRequirementRef] = Field(default_factory=list)
     risk_management: Optional[RiskManagementSection] = None  # Risk Management Elements (Section 5)
+
+
+# Workspace schemas
+class WorkspaceCreate(BaseModel):
+    """Create a server-side workspace from a full workspace state."""
+    user_id: str
+    state: Dict[str, Any] = Field(default_factory=dict)
+
+
+class WorkspacePatchOperation(BaseModel):
+    """Single JSON Patch (RFC 6902) operation."""
+    model_config = ConfigDict(populate_by_name=True)
+
+    op: Literal["add", "remove", "replace", "move", "copy", "test"]
+    path: str
+    value: Any = None
+    from_: Optional[str] = Field(None, alias="from")
+
+
+class WorkspacePatchRequest(BaseModel):
+    """Partial workspace update expressed as JSON Patch operations."""
+    operations: List[WorkspacePatchOperation] = Field(default_factory=list)
+    expected_version: Optional[int] = None
+
+
+class WorkspaceSummary(BaseModel):
+    id: str
+    user_id: str
+    version: int
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class WorkspaceOut(WorkspaceSummary):
+    state: Dict[str, Any]
+
+
+class SbomImportOut(BaseModel):
+    """Summary of an imported SBOM."""
+    id: str
+    user_id: str
+    filename: Optional[str] = None
+    sbom_format: str
+    component_count: int
+    duplicate_count: int
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SbomComponentOut(ThirdPartyComponentEntry):
+    """Stored SBOM component."""
+    position: int
+    purl: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TemplateSlotOut(BaseModel):
+    """Operation slot of a compiled element template."""
+    kind: str
+    text: str
+    prompt: str
+    options: List[str] = Field(default_factory=list)
+
+
+class ElementTemplateOut(BaseModel):
+    """Compiled element text: ``literals`` has one more entry than ``slots``."""
+    element_index: str
+    literals: List[str]
+    slots: List[TemplateSlotOut]
+    color: Optional[str] = None
+
+
+class CatalogueElementOut(BaseModel):
+    element: str
+    text: str
+    template: ElementTemplateOut
+
+
+class CatalogueComponentOut(BaseModel):
+    """Catalogue component with the compiled templates of its elements."""
+    table: str
+    component: str
+    name: str
+    class_name: str
+    family: str
+    elements: List[CatalogueElementOut]
+
+
+class CatalogueImportOut(BaseModel):
+    """Progress counters of a CC catalogue import."""
+    status: str
+    bytes_read: int
+    total_bytes: int
+    classes: int
+    families: int
+    components: int
+    elements: int
+    element_lists: int
+    skipped: int
+    tables: List[str]
+    seconds: float
+    error: Optional[str] = None
+    snapshot_error: Optional[str] = None
+
+
+class CatalogueSnapshotOut(BaseModel):
+    """Summary of an exported catalogue snapshot."""
+    version: int
+    fingerprint: int
+    families: int
+    rows: int
+    element_lists: int
+    strings: int
+    size: int
+
+
+class DependencyQuery(BaseModel):
+    """Selection of SFR/SAR components to check."""
+    components: List[str] = Field(default_factory=list)
+    selected_eal: Optional[str] = None  # Its package counts as selected
+
+
+class UnmetDependencyOut(BaseModel):
+    component: str
+    alternatives: List[str]
+
+
+class DependencyClosureOut(BaseModel):
+    """Transitive dependencies of one component, dependencies first."""
+    component: str
+    hierarchical_to: List[str]
+    dependencies: List[str]
+
+
+class DependencyResolutionOut(BaseModel):
+    """
+    Dependency check of a selection.
+
+    ``closure`` lists the missing transitive dependencies (first
+    alternative of each group), ``unmet`` the dependency groups nothing in
+    the selection satisfies.
+    """
+    eal: Optional[str] = None
+    eal_package: List[str] = Field(default_factory=list)
+    closure: List[str]
+    unmet: List[UnmetDependencyOut]
+    unknown: List[str] = Field(default_factory=list)
+
+
+class EalPackageOut(BaseModel):
+    eal: str
+    components: List[str]
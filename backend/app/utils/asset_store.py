@@ -0,0 +1,201 @@
+"""Content-addressed image asset storage.
+
+Uploaded images are stored once under ``ASSET_ROOT`` keyed by the SHA-256
+of their bytes and referenced from HTML as ``asset://<sha256>``. Decoded
+bytes are kept in a bounded in-memory LRU so repeated previews do not hit
+the disk. Inline images interned while compiling render plans live only in
+that LRU: they are never written to ``ASSET_ROOT`` and so never served by
+the asset download route.
+"""
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from app.config import ASSET_ROOT, ASSET_CACHE_MAX_BYTES
+from app.utils.image_handler import decode_base64_image
+
+
+ASSET_SCHEME = "asset://"
+ASSET_DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class _AssetCache:
+    """Thread-safe LRU of asset bytes bounded by total size."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(digest)
+            if data is not None:
+                self._entries.move_to_end(digest)
+            return data
+
+    def put(self, digest: str, data: bytes) -> bool:
+        """Cache asset bytes; returns False if they exceed the whole budget."""
+        if len(data) > self.max_bytes:
+            return False
+        with self._lock:
+            if digest in self._entries:
+                self._entries.move_to_end(digest)
+                return True
+            self._entries[digest] = data
+            self._size += len(data)
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+        return True
+
+    def __contains__(self, digest: str) -> bool:
+        with self._lock:
+            return digest in self._entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+_cache = _AssetCache(ASSET_CACHE_MAX_BYTES)
+
+
+def is_valid_digest(digest: str) -> bool:
+    """Check that a string is a lowercase hex SHA-256 digest."""
+    return bool(digest) and bool(ASSET_DIGEST_PATTERN.match(digest))
+
+
+def asset_path(digest: str) -> Path:
+    """
+    Get the on-disk path for an asset digest.
+
+    Assets are sharded by the first two hex characters to keep directories small.
+    """
+    return ASSET_ROOT / digest[:2] / digest
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def store_asset_file(tmp_path: Path) -> str:
+    """
+    Move a received upload into the store under its content hash.
+
+    Identical uploads are deduplicated: if the digest already exists on
+    disk the temp file is discarded.
+
+    Args:
+        tmp_path: Verified upload in a temp file on the ``ASSET_ROOT``
+            filesystem (consumed by this call)
+
+    Returns:
+        SHA-256 hex digest of the content
+    """
+    digest = _file_digest(tmp_path)
+    path = asset_path(digest)
+    if path.exists():
+        tmp_path.unlink(missing_ok=True)
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_path, path)
+    return digest
+
+
+def intern_image_source(src: Optional[str]) -> str:
+    """
+    Replace an inline base64 image with an ``asset://`` reference.
+
+    Compiled render plans keep the returned reference instead of the data
+    URI, so they stay small and replays load the bytes from the asset cache
+    instead of decoding base64 again. The bytes are only cached in memory;
+    once evicted the reference no longer resolves (see ``asset_available``)
+    and plans holding it have to be compiled again.
+
+    Args:
+        src: Image source attribute value
+
+    Returns:
+        ``asset://<sha256>`` for a decodable data URI, an empty string for
+        an undecodable one, and any other source (or an image too large for
+        the cache) unchanged
+    """
+    if not src or not src.startswith("data:"):
+        return src or ""
+    data = decode_base64_image(src)
+    if not data:
+        return ""
+    digest = hashlib.sha256(data).hexdigest()
+    if not _cache.put(digest, data):
+        return src
+    return f"{ASSET_SCHEME}{digest}"
+
+
+def asset_available(digest: str) -> bool:
+    """Whether an asset digest can currently be loaded (from memory or the store)."""
+    return digest in _cache or asset_path(digest).exists()
+
+
+def load_asset(digest: str) -> Optional[bytes]:
+    """
+    Load asset bytes by digest, from memory when possible.
+
+    Args:
+        digest: SHA-256 hex digest
+
+    Returns:
+        Asset bytes, or None if the digest is invalid or unknown
+    """
+    if not is_valid_digest(digest):
+        return None
+    cached = _cache.get(digest)
+    if cached is not None:
+        return cached
+    path = asset_path(digest)
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    _cache.put(digest, data)
+    return data
+
+
+def parse_asset_reference(src: Optional[str]) -> Optional[str]:
+    """Return the digest of an ``asset://<sha256>`` reference, or None."""
+    if not src or not src.startswith(ASSET_SCHEME):
+        return None
+    digest = src[len(ASSET_SCHEME):].strip().lower()
+    return digest if is_valid_digest(digest) else None
+
+
+def resolve_image_source(src: Optional[str]) -> Optional[bytes]:
+    """
+    Resolve an HTML image ``src`` to image bytes.
+
+    Supports ``asset://<sha256>`` references and legacy base64 data URIs.
+
+    Args:
+        src: Image source attribute value
+
+    Returns:
+        Image bytes, or None if the source cannot be resolved
+    """
+    if not src:
+        return None
+    digest = parse_asset_reference(src)
+    if digest:
+        return load_asset(digest)
+    return decode_base64_image(src)
@@ -0,0 +1,68 @@
+"""Evaluation Assurance Level (EAL) packages.
+
+Assurance components of the predefined EAL1–EAL7 packages (Common Criteria
+Part 3), used to expand ``selected_eal`` into its SAR components.
+"""
+import re
+from typing import Dict, Optional, Tuple
+
+
+_ST_LOW = ("ASE_CCL.1", "ASE_ECD.1", "ASE_INT.1", "ASE_OBJ.1", "ASE_REQ.1", "ASE_TSS.1")
+_ST = ("ASE_CCL.1", "ASE_ECD.1", "ASE_INT.1", "ASE_OBJ.2", "ASE_REQ.2", "ASE_SPD.1", "ASE_TSS.1")
+_GUIDANCE = ("AGD_OPE.1", "AGD_PRE.1")
+
+EAL_PACKAGES: Dict[str, Tuple[str, ...]] = {
+    "EAL1": (
+        "ADV_FSP.1", *_GUIDANCE, "ALC_CMC.1", "ALC_CMS.1", *_ST_LOW,
+        "ATE_IND.1", "AVA_VAN.1",
+    ),
+    "EAL2": (
+        "ADV_ARC.1", "ADV_FSP.2", "ADV_TDS.1", *_GUIDANCE,
+        "ALC_CMC.2", "ALC_CMS.2", "ALC_DEL.1", *_ST,
+        "ATE_COV.1", "ATE_FUN.1", "ATE_IND.2", "AVA_VAN.2",
+    ),
+    "EAL3": (
+        "ADV_ARC.1", "ADV_FSP.3", "ADV_TDS.2", *_GUIDANCE,
+        "ALC_CMC.3", "ALC_CMS.3", "ALC_DEL.1", "ALC_DVS.1", "ALC_LCD.1", *_ST,
+        "ATE_COV.2", "ATE_DPT.1", "ATE_FUN.1", "ATE_IND.2", "AVA_VAN.2",
+    ),
+    "EAL4": (
+        "ADV_ARC.1", "ADV_FSP.4", "ADV_IMP.1", "ADV_TDS.3", *_GUIDANCE,
+        "ALC_CMC.4", "ALC_CMS.4", "ALC_DEL.1", "ALC_DVS.1", "ALC_LCD.1", "ALC_TAT.1", *_ST,
+        "ATE_COV.2", "ATE_DPT.1", "ATE_FUN.1", "ATE_IND.2", "AVA_VAN.3",
+    ),
+    "EAL5": (
+        "ADV_ARC.1", "ADV_FSP.5", "ADV_IMP.1", "ADV_INT.2", "ADV_TDS.4", *_GUIDANCE,
+        "ALC_CMC.4", "ALC_CMS.5", "ALC_DEL.1", "ALC_DVS.1", "ALC_LCD.1", "ALC_TAT.2", *_ST,
+        "ATE_COV.2", "ATE_DPT.3", "ATE_FUN.1", "ATE_IND.2", "AVA_VAN.4",
+    ),
+    "EAL6": (
+        "ADV_ARC.1", "ADV_FSP.5", "ADV_IMP.2", "ADV_INT.3", "ADV_SPM.1", "ADV_TDS.5", *_GUIDANCE,
+        "ALC_CMC.5", "ALC_CMS.5", "ALC_DEL.1", "ALC_DVS.2", "ALC_LCD.1", "ALC_TAT.3", *_ST,
+        "ATE_COV.3", "ATE_DPT.3", "ATE_FUN.2", "ATE_IND.2", "AVA_VAN.5",
+    ),
+    "EAL7": (
+        "ADV_ARC.1", "ADV_FSP.6", "ADV_IMP.2", "ADV_INT.3", "ADV_SPM.1", "ADV_TDS.6", *_GUIDANCE,
+        "ALC_CMC.5", "ALC_CMS.5", "ALC_DEL.1", "ALC_DVS.2", "ALC_LCD.2", "ALC_TAT.3", *_ST,
+        "ATE_COV.3", "ATE_DPT.4", "ATE_FUN.2", "ATE_IND.3", "AVA_VAN.5",
+    ),
+}
+
+_EAL_NAME = re.compile(r"^EAL\s*([1-7])\s*\+?$", re.IGNORECASE)
+
+
+def normalize_eal(value: Optional[str]) -> Optional[str]:
+    """
+    Normalize an EAL label (``"eal 4"``, ``"EAL4+"``) to its package key.
+
+    Returns:
+        ``EAL1`` … ``EAL7``, or None for blank or unknown labels
+    """
+    match = _EAL_NAME.match((value or "").strip())
+    return f"EAL{match.group(1)}" if match else None
+
+
+def get_eal_package(value: Optional[str]) -> Tuple[str, ...]:
+    """Assurance components of an EAL package (empty for unknown labels)."""
+    eal = normalize_eal(value)
+    return EAL_PACKAGES[eal] if eal else ()
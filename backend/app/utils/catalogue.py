@@ -0,0 +1,506 @@
+"""Process-wide cache of the requirement catalogue family tables.
+
+The functional (``fau_db`` … ``ftp_db``) and assurance (``aco_db`` …
+``ava_db``) families are read-only at runtime, so each family is loaded
+once from the consolidated ``catalogue_requirements`` table, grouped by
+component and shared by every document build. Family tables are still
+named by their former table names. When a catalogue snapshot is
+configured, families are read from the mapped snapshot instead.
+
+``Hierarchical to:`` and ``Dependencies:`` rows of a component are parsed
+into relations instead of elements; across all tables they form the
+``DependencyGraph``, whose closures are precomputed when it is built.
+"""
+import re
+import threading
+from dataclasses import dataclass, field as dataclass_field
+from itertools import groupby
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models import (
+    AcoDb,
+    AdvDb,
+    AgdDb,
+    AlcDb,
+    ApeDb,
+    AseDb,
+    AteDb,
+    AvaDb,
+    CatalogueRequirement,
+    FauDb,
+    FcoDb,
+    FcsDb,
+    FdpDb,
+    FiaDb,
+    FmtDb,
+    FprDb,
+    FptDb,
+    FruDb,
+    FtaDb,
+    FtpDb,
+)
+from app.utils.catalogue_snapshot import get_catalogue_snapshot
+
+
+FUNCTIONAL_MODELS = (FauDb, FcoDb, FcsDb, FdpDb, FiaDb, FmtDb, FprDb, FptDb, FruDb, FtaDb, FtpDb)
+ASSURANCE_MODELS = (AcoDb, AdvDb, AgdDb, AlcDb, ApeDb, AseDb, AteDb, AvaDb)
+
+CATALOGUE_MODELS = {model.family_table: model for model in FUNCTIONAL_MODELS + ASSURANCE_MODELS}
+
+_COMPONENT_ID = re.compile(r"\b[A-Z]{3}_[A-Z]{3}\.\d+\b")
+_ALTERNATIVE_GROUP = re.compile(r"\[([^\]]*)\]")
+_OR_WORD = re.compile(r"\bor\b", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class CatalogueElement:
+    """One element of a catalogue component, e.g. ``FAU_GEN.1.1``."""
+    element: str
+    text: str
+
+
+@dataclass(frozen=True)
+class CatalogueComponent:
+    """
+    A catalogue component with its elements in table order.
+
+    Attributes:
+        table: Family table the component was read from
+        component: Component identifier, e.g. ``FAU_GEN.1``
+        name: Component name, e.g. ``Audit data generation``
+        class_name: Class the component belongs to
+        family: Family the component belongs to
+        elements: Elements in table order
+        hierarchical_to: Components this one can replace
+        dependencies: Dependency groups; each group is satisfied by any
+            one of its alternative components
+    """
+    table: str
+    component: str
+    name: str
+    class_name: str
+    family: str
+    elements: Tuple[CatalogueElement, ...]
+    hierarchical_to: Tuple[str, ...] = ()
+    dependencies: Tuple[Tuple[str, ...], ...] = ()
+
+    def element(self, element_id: str) -> Optional[CatalogueElement]:
+        for element in self.elements:
+            if element.element == element_id:
+                return element
+        return None
+
+
+def _relation_kind(element: str, text: str) -> Optional[str]:
+    for value in (element, text):
+        lowered = value.lower()
+        if lowered.startswith("hierarchical to"):
+            return "hierarchical_to"
+        if lowered.startswith("dependencies"):
+            return "dependencies"
+    return None
+
+
+def parse_dependency_groups(text: str) -> Tuple[Tuple[str, ...], ...]:
+    """
+    Parse a ``Dependencies:`` text into groups of alternatives.
+
+    Bracketed lists (``[FCS_CKM.2 …, or FCS_COP.1 …]``) and ids joined by
+    ``or`` form one group; every other component id is its own group.
+
+    Args:
+        text: Dependency text, e.g. ``FAU_GEN.1 Audit data generation``
+
+    Returns:
+        Groups in text order, without duplicates
+    """
+    groups: List[Tuple[str, ...]] = []
+
+    def add(group: Sequence[str]) -> None:
+        group = tuple(dict.fromkeys(group))
+        if group and group not in groups:
+            groups.append(group)
+
+    for bracketed in _ALTERNATIVE_GROUP.findall(text):
+        add(_COMPONENT_ID.findall(bracketed))
+
+    remainder = _ALTERNATIVE_GROUP.sub(" ; ", text)
+    current: List[str] = []
+    previous_end = None
+    for match in _COMPONENT_ID.finditer(remainder):
+        if current and not _OR_WORD.search(remainder[previous_end:match.start()]):
+            add(current)
+            current = []
+        current.append(match.group())
+        previous_end = match.end()
+    add(current)
+    return tuple(groups)
+
+
+def _load_tables(tables: Sequence[str]) -> Dict[str, Dict[str, CatalogueComponent]]:
+    codes = {CATALOGUE_MODELS[table].__mapper__.polymorphic_identity: table for table in tables}
+    snapshot = get_catalogue_snapshot()
+    if snapshot is not None:
+        return {
+            table: _group_components(
+                table,
+                (
+                    (component, name, class_name, family, element, element_item)
+                    for class_name, family, component, name, element, element_item in snapshot.family_rows(code)
+                ),
+            )
+            for code, table in codes.items()
+        }
+
+    # One query over the consolidated table for all requested families
+    model = CatalogueRequirement
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(
+                model.family_code,
+                model.component,
+                model.component_name,
+                model.class_field,
+                model.family,
+                model.element,
+                model.element_item,
+            )
+            .where(model.family_code.in_(list(codes)))
+            .order_by(model.family_code, model.id)
+        ).all()
+
+    loaded: Dict[str, Dict[str, CatalogueComponent]] = {table: {} for table in tables}
+    for code, family_rows in groupby(rows, key=lambda row: row[0]):
+        table = codes[code]
+        loaded[table] = _group_components(table, (row[1:] for row in family_rows))
+    return loaded
+
+
+def _group_components(table: str, rows: Iterable[Tuple]) -> Dict[str, CatalogueComponent]:
+    grouped: Dict[str, dict] = {}
+    for component, name, class_name, family, element, element_item in rows:
+        component = (component or "").strip()
+        if not component:
+            continue
+        entry = grouped.setdefault(
+            component,
+            {"name": "", "class_name": "", "family": "", "elements": [], "hierarchical_to": [], "dependencies": []},
+        )
+        # Header rows may carry only part of the metadata
+        entry["name"] = entry["name"] or (name or "").strip()
+        entry["class_name"] = entry["class_name"] or (class_name or "").strip()
+        entry["family"] = entry["family"] or (family or "").strip()
+        element = (element or "").strip()
+        text = (element_item or "").strip()
+        relation = _relation_kind(element, text)
+        if relation == "hierarchical_to":
+            entry["hierarchical_to"].extend(_COMPONENT_ID.findall(f"{element} {text}"))
+        elif relation == "dependencies":
+            entry["dependencies"].extend(parse_dependency_groups(f"{element} {text}"))
+        elif element:
+            entry["elements"].append(CatalogueElement(element, text))
+
+    return {
+        component: CatalogueComponent(
+            table=table,
+            component=component,
+            name=entry["name"],
+            class_name=entry["class_name"],
+            family=entry["family"],
+            elements=tuple(entry["elements"]),
+            hierarchical_to=tuple(dict.fromkeys(entry["hierarchical_to"])),
+            dependencies=tuple(dict.fromkeys(entry["dependencies"])),
+        )
+        for component, entry in grouped.items()
+    }
+
+
+@dataclass(frozen=True)
+class UnmetDependency:
+    """Dependency group of a selected component that the selection lacks."""
+    component: str
+    alternatives: Tuple[str, ...]
+
+
+@dataclass
+class DependencyGraph:
+    """
+    Dependency and hierarchy relations across all family tables.
+
+    Closures are computed once when the graph is built: components are
+    ordered topologically (dependencies first) over the strongly connected
+    components of the graph, so dependency cycles are safe, and every
+    component's transitive dependency set is stored as a tuple in that
+    order. Per-component closures follow the first alternative of each
+    dependency group; selection queries check every alternative and accept
+    hierarchically higher components as substitutes.
+
+    Attributes:
+        components: Catalogue components by id
+        order: Topological position of every known id
+        closures: Transitive dependencies per component, excluding itself
+        satisfiers: Ids that satisfy a dependency on each component
+    """
+    components: Dict[str, CatalogueComponent]
+    order: Dict[str, int] = dataclass_field(default_factory=dict)
+    closures: Dict[str, Tuple[str, ...]] = dataclass_field(default_factory=dict)
+    satisfiers: Dict[str, FrozenSet[str]] = dataclass_field(default_factory=dict)
+
+    @classmethod
+    def build(cls, components: Iterable[CatalogueComponent]) -> "DependencyGraph":
+        graph = cls({component.component: component for component in components})
+        graph._index()
+        return graph
+
+    def _edges(self, component_id: str) -> Tuple[str, ...]:
+        component = self.components.get(component_id)
+        if component is None:
+            return ()
+        return tuple(group[0] for group in component.dependencies)
+
+    def _strongly_connected(self, nodes: Sequence[str]) -> List[List[str]]:
+        # Iterative Tarjan; components come out dependencies-first
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack = set()
+        stack: List[str] = []
+        result: List[List[str]] = []
+        for root in nodes:
+            if root in index:
+                continue
+            work = [(root, iter(self._edges(root)))]
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, edges = work[-1]
+                advanced = False
+                for target in edges:
+                    if target not in index:
+                        index[target] = lowlink[target] = len(index)
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target, iter(self._edges(target))))
+                        advanced = True
+                        break
+                    if target in on_stack:
+                        lowlink[node] = min(lowlink[node], index[target])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        members.append(member)
+                        if member == node:
+                            break
+                    result.append(sorted(members))
+        return result
+
+    def _index(self) -> None:
+        nodes = sorted(
+            set(self.components)
+            | {target for component_id in self.components for target in self._edges(component_id)}
+        )
+        groups = self._strongly_connected(nodes)
+        for group in groups:
+            for member in group:
+                self.order[member] = len(self.order)
+
+        # Dependencies are ordered first, so their closures already exist
+        # (members of one cycle share the cycle's closure)
+        for group in groups:
+            closure = set()
+            for member in group:
+                for target in self._edges(member):
+                    closure.add(target)
+                    closure.update(self.closures.get(target, ()))
+            closure.update(group)
+            for member in group:
+                self.closures[member] = self._ordered(closure - {member})
+
+        parents: Dict[str, set] = {}
+        for component in self.components.values():
+            for lower in component.hierarchical_to:
+                parents.setdefault(lower, set()).add(component.component)
+        for component_id in set(nodes) | set(parents):
+            satisfiers = {component_id}
+            pending = [component_id]
+            while pending:
+                for parent in parents.get(pending.pop(), ()):
+                    if parent not in satisfiers:
+                        satisfiers.add(parent)
+                        pending.append(parent)
+            self.satisfiers[component_id] = frozenset(satisfiers)
+
+    def _ordered(self, component_ids: Iterable[str]) -> Tuple[str, ...]:
+        return tuple(sorted(component_ids, key=lambda component_id: self.order.get(component_id, len(self.order))))
+
+    def closure(self, component_id: str) -> Tuple[str, ...]:
+        """Transitive dependencies of one component, dependencies first."""
+        return self.closures.get(component_id, ())
+
+    def _satisfied(self, component_id: str, selected: set) -> bool:
+        return not selected.isdisjoint(self.satisfiers.get(component_id, (component_id,)))
+
+    def selection_closure(self, selection: Iterable[str]) -> Tuple[str, ...]:
+        """
+        Components a selection still needs, dependencies first.
+
+        Dependency groups already satisfied (directly or through a
+        hierarchically higher component) are skipped; otherwise the first
+        alternative is added and followed.
+        """
+        selected = set(selection)
+        have = set(selected)
+        pending = list(self._ordered(selected))
+        while pending:
+            component = self.components.get(pending.pop())
+            if component is None:
+                continue
+            for group in component.dependencies:
+                if any(self._satisfied(alternative, have) for alternative in group):
+                    continue
+                have.add(group[0])
+                pending.append(group[0])
+        return self._ordered(have - selected)
+
+    def unmet(self, selection: Iterable[str]) -> List[UnmetDependency]:
+        """
+        Dependency groups of selected components that nothing in the
+        selection satisfies.
+
+        Args:
+            selection: Selected component ids
+
+        Returns:
+            Unmet groups in topological order of the dependent component
+        """
+        selected = set(selection)
+        unmet = []
+        for component_id in self._ordered(selected):
+            component = self.components.get(component_id)
+            if component is None:
+                continue
+            for group in component.dependencies:
+                if not any(self._satisfied(alternative, selected) for alternative in group):
+                    unmet.append(UnmetDependency(component_id, group))
+        return unmet
+
+
+class _CatalogueCache:
+    """Components per family table and the dependency graph, loaded on first use."""
+
+    def __init__(self):
+        self._tables: Dict[str, Dict[str, CatalogueComponent]] = {}
+        self._graph: Optional[DependencyGraph] = None
+        self._versions: Dict[str, int] = dict.fromkeys(CATALOGUE_MODELS, 0)
+        self._snapshot_version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _check_snapshot(self) -> None:
+        # A replaced snapshot (e.g. exported by another worker) drops everything
+        snapshot = get_catalogue_snapshot()
+        version = snapshot.version if snapshot is not None else None
+        if version != self._snapshot_version:
+            self.invalidate()
+            self._snapshot_version = version
+
+    def table(self, table: str) -> Dict[str, CatalogueComponent]:
+        self._check_snapshot()
+        components = self._tables.get(table)
+        if components is None:
+            with self._lock:
+                components = self._tables.get(table)
+                if components is None:
+                    components = self._tables[table] = _load_tables([table])[table]
+        return components
+
+    def graph(self) -> DependencyGraph:
+        self._check_snapshot()
+        graph = self._graph
+        if graph is None:
+            missing = [table for table in CATALOGUE_MODELS if table not in self._tables]
+            if missing:
+                loaded = _load_tables(missing)
+                with self._lock:
+                    for table, components in loaded.items():
+                        self._tables.setdefault(table, components)
+            components = [
+                component
+                for table in CATALOGUE_MODELS
+                for component in self.table(table).values()
+            ]
+            with self._lock:
+                graph = self._graph
+                if graph is None:
+                    graph = self._graph = DependencyGraph.build(components)
+        return graph
+
+    def versions(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        self._check_snapshot()
+        return tuple(self._versions[table] for table in tables)
+
+    def invalidate(self, table: Optional[str] = None) -> None:
+        with self._lock:
+            self._graph = None
+            if table is None:
+                self._tables.clear()
+                for name in self._versions:
+                    self._versions[name] += 1
+            else:
+                self._tables.pop(table, None)
+                self._versions[table] += 1
+
+
+_cache = _CatalogueCache()
+
+
+def get_catalogue_component(table: str, component: str) -> Optional[CatalogueComponent]:
+    """
+    Look up a component in a family table.
+
+    Args:
+        table: Family table name (key of ``CATALOGUE_MODELS``)
+        component: Component identifier, e.g. ``FAU_GEN.1``
+
+    Returns:
+        Cached component, or None if the table has no such component
+
+    Raises:
+        KeyError: If ``table`` is not a catalogue table
+    """
+    if table not in CATALOGUE_MODELS:
+        raise KeyError(table)
+    return _cache.table(table).get(component.strip())
+
+
+def invalidate_catalogue(table: Optional[str] = None) -> None:
+    """Drop cached rows of one family table (or all) after it changed."""
+    _cache.invalidate(table)
+
+
+def catalogue_version(tables: Iterable[str]) -> Tuple[int, ...]:
+    """
+    Current versions of family tables, bumped by every invalidation.
+
+    Caches derived from catalogue rows compare these to detect stale
+    entries.
+
+    Raises:
+        KeyError: If a table is not a catalogue table
+    """
+    return _cache.versions(tables)
+
+
+def get_dependency_graph() -> DependencyGraph:
+    """Get the dependency graph of the whole catalogue, building it on first use."""
+    return _cache.graph()
@@ -0,0 +1,443 @@
+"""Streaming import of Common Criteria XML catalogues.
+
+The CC Part 2/3 XML catalogue and Protection Profile XML files describe
+classes, families, components and elements (``f-class`` / ``a-class`` …
+``f-element`` / ``a-element``, with or without a namespace). The file is
+walked with ``iterparse`` and every component is released once it has been
+converted, so memory stays constant regardless of the catalogue size.
+
+Components are written to the family partitions (``fau_db`` … ``ava_db``)
+of ``catalogue_requirements`` in the row layout read by
+``app.utils.catalogue``: one header row, a ``Hierarchical to:`` and a
+``Dependencies:`` row, then one row per element.
+Elements with operations get an ``element_list_db`` entry keyed on
+``element_index``. Both are upserted in batches inside one transaction, and
+the affected catalogue caches are invalidated after the commit, once a
+configured catalogue snapshot has been re-exported (or, if that fails,
+removed so workers read the database).
+
+Import progress and the one-import-at-a-time guard are kept in memory, so
+they are per worker process: with several workers, status requests may be
+served by a worker that has not seen the import, and imports started on
+different workers are not serialized against each other.
+"""
+import json
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field as dataclass_field
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Set, Tuple
+
+from lxml import etree
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.models import CatalogueRequirement, ElementListDb
+from app.utils.catalogue import CATALOGUE_MODELS, invalidate_catalogue
+from app.utils.catalogue_snapshot import export_catalogue_snapshot, remove_catalogue_snapshot
+from app.utils.element_templates import invalidate_element_templates
+
+
+CATALOGUE_IMPORT_BATCH_ROWS = 1000
+
+_CLASS_TAGS = {"f-class", "a-class"}
+_FAMILY_TAGS = {"f-family", "a-family"}
+_COMPONENT_TAGS = {"f-component", "a-component"}
+_ELEMENT_TAGS = {"f-element", "a-element"}
+_ASSIGNMENT_TAGS = {"assignment", "assignable", "assignmentitem"}
+_SELECTION_TAGS = {"selection", "selectables", "selectionitem"}
+_OPTION_TAGS = {"selectable"}
+_REFINEMENT_TAGS = {"refinement"}
+_NOTE_TAGS = {"note", "notes", "application-note"}
+_HIERARCHY_TAGS = {"hierarchical", "hierarchical-to", "hierarchicalto"}
+_DEPENDENCY_TAGS = {"dependson", "depends-on"}
+_ALTERNATIVE_TAGS = {"dependsoneof", "depends-on-one-of"}
+
+_COMPONENT_ID = re.compile(r"\b[A-Z]{3}_[A-Z]{3}\.\d+\b")
+
+
+class CatalogueFormatError(ValueError):
+    """The file is not a well-formed CC catalogue."""
+
+
+@dataclass
+class CatalogueImportProgress:
+    """
+    Counters of a running or finished import.
+
+    Attributes:
+        status: ``running``, ``completed`` or ``failed``
+        bytes_read: Bytes of the file parsed so far
+        total_bytes: File size
+        classes: Classes seen
+        families: Families seen
+        components: Components written
+        elements: Element rows written
+        element_lists: ``element_list_db`` rows written
+        skipped: Components whose class has no family table
+        tables: Family tables written to
+        seconds: Elapsed time
+        error: Failure reason of a failed import
+        snapshot_error: Why the catalogue snapshot could not be re-exported
+            after a committed import
+    """
+    status: str = "running"
+    bytes_read: int = 0
+    total_bytes: int = 0
+    classes: int = 0
+    families: int = 0
+    components: int = 0
+    elements: int = 0
+    element_lists: int = 0
+    skipped: int = 0
+    tables: List[str] = dataclass_field(default_factory=list)
+    seconds: float = 0.0
+    error: Optional[str] = None
+    snapshot_error: Optional[str] = None
+
+    def to_json(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class _ParsedComponent:
+    table: str
+    component: str
+    rows: List[dict]
+    element_lists: List[dict]
+
+
+def _local(tag) -> str:
+    return etree.QName(tag).localname.lower() if isinstance(tag, str) else ""
+
+
+def _clean(value: Optional[str]) -> str:
+    return " ".join((value or "").split())
+
+
+def _identifier(node) -> str:
+    return _clean(node.get("id") or node.get("ref") or "").upper()
+
+
+def _selection_options(node) -> List[str]:
+    options = []
+    for child in node:
+        name = _local(child.tag)
+        if name in _OPTION_TAGS:
+            option = _clean(_content_text(child))
+            if option:
+                options.append(option)
+        elif name in _SELECTION_TAGS:
+            options.extend(_selection_options(child))
+    return options
+
+
+def _content_text(node) -> str:
+    """Text of a node with its operations written as catalogue placeholders."""
+    parts = [node.text or ""]
+    for child in node:
+        name = _local(child.tag)
+        if name in _ASSIGNMENT_TAGS:
+            parts.append(f"[assignment: {_clean(_content_text(child))}]")
+        elif name in _SELECTION_TAGS:
+            options = _selection_options(child) or [_clean(_content_text(child))]
+            parts.append(f"[selection: {', '.join(options)}]")
+        elif name in _REFINEMENT_TAGS:
+            parts.append(f"[refinement: {_clean(_content_text(child))}]")
+        elif name not in _NOTE_TAGS:
+            parts.append(_content_text(child))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def _element_row(element, component: str) -> Tuple[Optional[dict], Optional[dict]]:
+    element_id = _identifier(element)
+    if not element_id:
+        return None, None
+    title = next((child for child in element if _local(child.tag) == "title"), element)
+    text = _clean(_content_text(title))
+
+    options = []
+    for node in title.iter():
+        if _local(node.tag) in _SELECTION_TAGS:
+            options.extend(_selection_options(node))
+    color = _clean(element.get("color")) or None
+    element_list = None
+    if options or color or "[assignment:" in text or "[refinement:" in text:
+        element_list = {
+            "element": component,
+            "element_index": element_id,
+            "item_list": json.dumps(list(dict.fromkeys(options))) if options else None,
+            "color": color,
+        }
+    return {"element": element_id, "element_item": text}, element_list
+
+
+def _relation_ids(node) -> List[str]:
+    identifier = _identifier(node)
+    if identifier:
+        return [identifier]
+    return _COMPONENT_ID.findall(_clean("".join(node.itertext())).upper())
+
+
+def _relations(component) -> Tuple[List[str], List[Tuple[str, ...]]]:
+    hierarchical_to: List[str] = []
+    groups: List[Tuple[str, ...]] = []
+    for node in component.iter():
+        name = _local(node.tag)
+        if name in _ELEMENT_TAGS:
+            continue
+        if name in _HIERARCHY_TAGS:
+            hierarchical_to.extend(_relation_ids(node))
+        elif name in _ALTERNATIVE_TAGS:
+            group = tuple(
+                identifier
+                for child in node
+                if _local(child.tag) in _DEPENDENCY_TAGS
+                for identifier in _relation_ids(child)
+            )
+            if group:
+                groups.append(group)
+        elif name in _DEPENDENCY_TAGS and _local(node.getparent().tag) not in _ALTERNATIVE_TAGS:
+            groups.extend((identifier,) for identifier in _relation_ids(node))
+    return list(dict.fromkeys(hierarchical_to)), list(dict.fromkeys(groups))
+
+
+def _dependency_text(groups: List[Tuple[str, ...]]) -> str:
+    if not groups:
+        return "No dependencies."
+    # Alternatives in brackets, as parsed by parse_dependency_groups
+    return " ".join(
+        f"[{', or '.join(group)}]" if len(group) > 1 else group[0]
+        for group in groups
+    )
+
+
+def _parse_component(component, class_name: str, family: str) -> Optional[_ParsedComponent]:
+    component_id = _identifier(component)
+    if not component_id:
+        return None
+    name = _clean(component.get("name"))
+    header = {
+        "class_field": class_name,
+        "family": family,
+        "component": component_id,
+        "component_name": name,
+    }
+    hierarchical_to, groups = _relations(component)
+    rows = [
+        {**header, "element": None, "element_item": None},
+        {**header, "element": "Hierarchical to:", "element_item": ", ".join(hierarchical_to) or "No other components."},
+        {**header, "element": "Dependencies:", "element_item": _dependency_text(groups)},
+    ]
+    element_lists = []
+    for element in component.iter():
+        if _local(element.tag) not in _ELEMENT_TAGS:
+            continue
+        row, element_list = _element_row(element, component_id)
+        if row is not None:
+            rows.append({**header, **row})
+        if element_list is not None:
+            element_lists.append(element_list)
+    return _ParsedComponent(
+        table=f"{component_id[:3].lower()}_db",
+        component=component_id,
+        rows=rows,
+        element_lists=element_lists,
+    )
+
+
+def _label(node) -> str:
+    return _clean(node.get("name") or node.get("title")) or _identifier(node)
+
+
+def iter_catalogue_components(handle, progress: CatalogueImportProgress) -> Iterator[_ParsedComponent]:
+    """
+    Parse catalogue components from an open binary file as a stream.
+
+    ``progress`` is updated with the class/family counts and the bytes
+    read as the file is consumed.
+
+    Raises:
+        CatalogueFormatError: If the XML is malformed
+    """
+    events = etree.iterparse(
+        handle,
+        events=("start", "end"),
+        resolve_entities=False,
+        no_network=True,
+        remove_comments=True,
+    )
+    class_name = family = ""
+    try:
+        for event, node in events:
+            name = _local(node.tag)
+            if event == "start":
+                if name in _CLASS_TAGS:
+                    class_name = _label(node)
+                    progress.classes += 1
+                elif name in _FAMILY_TAGS:
+                    family = _label(node)
+                    progress.families += 1
+                continue
+            if name in _COMPONENT_TAGS:
+                parsed = _parse_component(node, class_name, family)
+                progress.bytes_read = handle.tell()
+                if parsed is not None:
+                    yield parsed
+            elif name not in _FAMILY_TAGS and name not in _CLASS_TAGS:
+                continue
+            # Release the finished component/family and its earlier siblings
+            node.clear(keep_tail=True)
+            parent = node.getparent()
+            if parent is not None:
+                while node.getprevious() is not None:
+                    del parent[0]
+    except etree.XMLSyntaxError as exc:
+        raise CatalogueFormatError(f"Malformed catalogue XML: {exc}") from None
+
+
+def _flush(db: Session, batch: List[_ParsedComponent]) -> None:
+    model = CatalogueRequirement
+    codes = {CATALOGUE_MODELS[parsed.table].__mapper__.polymorphic_identity for parsed in batch}
+    db.execute(
+        delete(model).where(
+            model.family_code.in_(list(codes)),
+            model.component.in_([parsed.component for parsed in batch]),
+        )
+    )
+    db.execute(
+        insert(model),
+        [
+            {"family_code": CATALOGUE_MODELS[parsed.table].__mapper__.polymorphic_identity, **row}
+            for parsed in batch
+            for row in parsed.rows
+        ],
+    )
+
+    element_lists = {
+        entry["element_index"]: entry
+        for parsed in batch
+        for entry in parsed.element_lists
+    }
+    if element_lists:
+        db.execute(delete(ElementListDb).where(ElementListDb.element_index.in_(list(element_lists))))
+        db.execute(insert(ElementListDb), list(element_lists.values()))
+
+
+def import_catalogue(
+    db: Session,
+    path: Path,
+    progress: Optional[CatalogueImportProgress] = None,
+    on_progress: Optional[Callable[[CatalogueImportProgress], None]] = None,
+) -> CatalogueImportProgress:
+    """
+    Import a CC XML catalogue into the family and element list tables.
+
+    Components replace the stored rows of the same component; components
+    not in the file are kept. Rows are written in batches of about
+    ``CATALOGUE_IMPORT_BATCH_ROWS`` and committed once at the end.
+
+    Args:
+        db: Database session
+        path: Catalogue XML file
+        progress: Counters to update (a new one by default)
+        on_progress: Called after every written batch
+
+    Returns:
+        Final counters
+
+    Raises:
+        CatalogueFormatError: If the XML is malformed
+    """
+    progress = progress or CatalogueImportProgress()
+    progress.total_bytes = path.stat().st_size
+    started = time.perf_counter()
+    tables: Set[str] = set()
+    batch: List[_ParsedComponent] = []
+    rows = 0
+
+    def flush() -> None:
+        nonlocal batch, rows
+        if batch:
+            _flush(db, batch)
+            progress.components += len(batch)
+            progress.elements += sum(len(parsed.rows) - 3 for parsed in batch)
+            progress.element_lists += sum(len(parsed.element_lists) for parsed in batch)
+            tables.update(parsed.table for parsed in batch)
+            progress.tables = sorted(tables)
+            batch, rows = [], 0
+        progress.seconds = round(time.perf_counter() - started, 3)
+        if on_progress is not None:
+            on_progress(progress)
+
+    try:
+        with open(path, "rb") as handle:
+            for parsed in iter_catalogue_components(handle, progress):
+                if parsed.table not in CATALOGUE_MODELS:
+                    progress.skipped += 1
+                    continue
+                batch.append(parsed)
+                rows += len(parsed.rows)
+                if rows >= CATALOGUE_IMPORT_BATCH_ROWS:
+                    flush()
+            progress.bytes_read = progress.total_bytes
+            flush()
+        db.commit()
+    except BaseException as exc:
+        db.rollback()
+        progress.status = "failed"
+        progress.error = str(exc)
+        raise
+
+    try:
+        # Publish the new catalogue to every worker before dropping caches
+        export_catalogue_snapshot(db)
+    except Exception as exc:
+        # The import is committed; without a current snapshot workers read the database
+        progress.snapshot_error = str(exc)
+        remove_catalogue_snapshot()
+    finally:
+        for table in tables:
+            invalidate_catalogue(table)
+        invalidate_element_templates()
+    progress.status = "completed"
+    progress.seconds = round(time.perf_counter() - started, 3)
+    return progress
+
+
+class _ImportTracker:
+    """
+    Progress of the latest import in this process.
+
+    The state is in memory only: the guard allows one import at a time per
+    worker process, not across workers.
+    """
+
+    def __init__(self):
+        self._progress: Optional[CatalogueImportProgress] = None
+        self._lock = threading.Lock()
+
+    def begin(self) -> Optional[CatalogueImportProgress]:
+        with self._lock:
+            if self._progress is not None and self._progress.status == "running":
+                return None
+            self._progress = CatalogueImportProgress()
+            return self._progress
+
+    def current(self) -> Optional[CatalogueImportProgress]:
+        return self._progress
+
+
+_tracker = _ImportTracker()
+
+
+def begin_catalogue_import() -> Optional[CatalogueImportProgress]:
+    """Start tracking a new import; None while another import is running in this process."""
+    return _tracker.begin()
+
+
+def get_catalogue_import_progress() -> Optional[CatalogueImportProgress]:
+    """Progress of the running or latest import of this process, if any."""
+    return _tracker.current()
@@ -0,0 +1,404 @@
+"""Read-only binary snapshot of the requirement catalogue.
+
+The catalogue rows (``catalogue_requirements``) and element lists
+(``element_list_db``) are exported into one file that every worker maps
+read-only, so the data lives once in the shared page cache instead of once
+per process, and lookups read straight from the mapping.
+
+Layout (little-endian):
+
+- header: magic, format version, catalogue version, database
+  fingerprint, section counts
+- family directory: ``(code, first row, row count)`` per family
+- rows: ``(class, family, component, component_name, element,
+  element_item)`` string ids, grouped by family in table order
+- element lists: ``(element_index, element, item_list, color)`` string
+  ids, sorted by ``element_index`` for binary search
+- string table: ``count + 1`` offsets into the UTF-8 string data; each
+  distinct string is stored once
+
+A new snapshot is written to a temp file and renamed over the old one, so
+readers see either the old or the new file; open mappings stay valid until
+they are released. The fingerprint (row counts and highest ids of both
+tables) lets startup detect a snapshot that no longer matches the database.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import CATALOGUE_SNAPSHOT_CHECK_SECONDS, CATALOGUE_SNAPSHOT_PATH
+from app.database import SessionLocal
+from app.models import CatalogueRequirement, ElementListDb
+
+
+SNAPSHOT_MAGIC = b"CRACATSN"
+SNAPSHOT_FORMAT_VERSION = 2
+
+_HEADER = struct.Struct("<8sIIQQIIII")
+_FAMILY = struct.Struct("<III")
+_ROW = struct.Struct("<6I")
+_ELEMENT_LIST = struct.Struct("<4I")
+_OFFSET = struct.Struct("<I")
+_STRING_SPAN = struct.Struct("<II")
+_NONE = 0xFFFFFFFF
+
+Row = Tuple[Optional[str], ...]
+
+
+class CatalogueSnapshotError(ValueError):
+    """The file is not a readable catalogue snapshot."""
+
+
+@dataclass(frozen=True)
+class SnapshotInfo:
+    """Summary of a written or mapped snapshot."""
+    version: int
+    fingerprint: int
+    families: int
+    rows: int
+    element_lists: int
+    strings: int
+    size: int
+
+    def to_json(self) -> dict:
+        return {
+            "version": self.version,
+            "fingerprint": self.fingerprint,
+            "families": self.families,
+            "rows": self.rows,
+            "element_lists": self.element_lists,
+            "strings": self.strings,
+            "size": self.size,
+        }
+
+
+class CatalogueSnapshot:
+    """
+    Memory-mapped catalogue snapshot.
+
+    Strings are decoded from the mapping on access; nothing else is copied
+    into the process.
+
+    Raises:
+        CatalogueSnapshotError: If the file has the wrong magic, format
+            version or size
+    """
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as handle:
+            try:
+                self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise CatalogueSnapshotError("Catalogue snapshot is empty") from None
+        self._view = memoryview(self._mmap)
+        if len(self._view) < _HEADER.size:
+            raise CatalogueSnapshotError("Catalogue snapshot is truncated")
+        (
+            magic,
+            format_version,
+            _reserved,
+            self.version,
+            self.fingerprint,
+            family_count,
+            row_count,
+            element_list_count,
+            string_count,
+        ) = _HEADER.unpack_from(self._view, 0)
+        if magic != SNAPSHOT_MAGIC or format_version != SNAPSHOT_FORMAT_VERSION:
+            raise CatalogueSnapshotError("Not a catalogue snapshot of a supported format")
+
+        self._rows_offset = _HEADER.size + family_count * _FAMILY.size
+        self._element_lists_offset = self._rows_offset + row_count * _ROW.size
+        self._offsets_offset = self._element_lists_offset + element_list_count * _ELEMENT_LIST.size
+        self._strings_offset = self._offsets_offset + (string_count + 1) * _OFFSET.size
+        self._element_list_count = element_list_count
+        if len(self._view) < self._strings_offset:
+            raise CatalogueSnapshotError("Catalogue snapshot is truncated")
+
+        self._families: Dict[str, Tuple[int, int]] = {}
+        for code_id, first, count in _FAMILY.iter_unpack(self._view[_HEADER.size:self._rows_offset]):
+            self._families[self.string(code_id)] = (first, count)
+        self.info = SnapshotInfo(
+            version=self.version,
+            fingerprint=self.fingerprint,
+            families=family_count,
+            rows=row_count,
+            element_lists=element_list_count,
+            strings=string_count,
+            size=len(self._view),
+        )
+
+    def _string_bytes(self, string_id: int) -> bytes:
+        start, end = _STRING_SPAN.unpack_from(self._mmap, self._offsets_offset + string_id * _OFFSET.size)
+        return self._mmap[self._strings_offset + start:self._strings_offset + end]
+
+    def string(self, string_id: int) -> Optional[str]:
+        if string_id == _NONE:
+            return None
+        return self._string_bytes(string_id).decode("utf-8")
+
+    def family_rows(self, family_code: str) -> Iterator[Row]:
+        """Rows of one family in table order (empty for unknown codes)."""
+        first, count = self._families.get(family_code, (0, 0))
+        start = self._rows_offset + first * _ROW.size
+        for ids in _ROW.iter_unpack(self._view[start:start + count * _ROW.size]):
+            yield tuple(self.string(string_id) for string_id in ids)
+
+    def element_list(self, element_index: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """
+        Look up an element list entry by binary search.
+
+        Returns:
+            ``(item_list, color)``, or None if the element has no entry
+        """
+        # UTF-8 byte order matches the code point order the entries are sorted by
+        key = element_index.encode("utf-8")
+        low, high = 0, self._element_list_count
+        while low < high:
+            middle = (low + high) // 2
+            record = _ELEMENT_LIST.unpack_from(
+                self._mmap, self._element_lists_offset + middle * _ELEMENT_LIST.size
+            )
+            current = self._string_bytes(record[0])
+            if current == key:
+                return self.string(record[2]), self.string(record[3])
+            if current < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.data: List[bytes] = []
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return _NONE
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.data)
+            self.data.append(value.encode("utf-8"))
+        return string_id
+
+
+def catalogue_fingerprint(db: Session) -> int:
+    """
+    Fingerprint of the catalogue tables: row counts and highest ids.
+
+    Cheap enough to compare at startup. Edits that keep both (rows
+    updated in place) are not detected; re-export the snapshot after
+    those.
+    """
+    state = tuple(
+        tuple(db.execute(select(func.count(), func.coalesce(func.max(model.id), 0)).select_from(model)).one())
+        for model in (CatalogueRequirement, ElementListDb)
+    )
+    digest = hashlib.blake2b(repr(state).encode("ascii"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def write_catalogue_snapshot(db: Session, path: Path) -> SnapshotInfo:
+    """
+    Export the catalogue tables into a snapshot file.
+
+    The file is written next to ``path`` and renamed over it, so workers
+    mapping the previous snapshot are not affected.
+
+    Args:
+        db: Database session
+        path: Snapshot file
+
+    Returns:
+        Summary of the written snapshot
+    """
+    fingerprint = catalogue_fingerprint(db)
+    model = CatalogueRequirement
+    strings = _StringTable()
+    families: List[Tuple[int, int, int]] = []
+    rows: List[bytes] = []
+    current_code = None
+    for row in db.execute(
+        select(
+            model.family_code,
+            model.class_field,
+            model.family,
+            model.component,
+            model.component_name,
+            model.element,
+            model.element_item,
+        ).order_by(model.family_code, model.id)
+    ):
+        if row[0] != current_code:
+            current_code = row[0]
+            families.append((strings.add(current_code), len(rows), 0))
+        code_id, first, count = families[-1]
+        families[-1] = (code_id, first, count + 1)
+        rows.append(_ROW.pack(*(strings.add(value) for value in row[1:])))
+
+    # Keys are stripped like the database path does; for keys that collide
+    # after stripping the last row wins there, so it wins here too
+    element_lists = sorted(
+        {
+            element_index.strip(): (element_index.strip(), element, item_list, color)
+            for element_index, element, item_list, color in db.execute(
+                select(ElementListDb.element_index, ElementListDb.element, ElementListDb.item_list, ElementListDb.color)
+            )
+            if element_index and element_index.strip()
+        }.values(),
+        key=lambda entry: entry[0],
+    )
+    element_list_records = [
+        _ELEMENT_LIST.pack(*(strings.add(value) for value in entry))
+        for entry in element_lists
+    ]
+
+    offsets = [0]
+    for value in strings.data:
+        offsets.append(offsets[-1] + len(value))
+    version = time.time_ns()
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC,
+        SNAPSHOT_FORMAT_VERSION,
+        0,
+        version,
+        fingerprint,
+        len(families),
+        len(rows),
+        len(element_list_records),
+        len(strings.data),
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle = tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", delete=False)
+    try:
+        with handle:
+            handle.write(header)
+            handle.write(b"".join(_FAMILY.pack(*family) for family in families))
+            handle.write(b"".join(rows))
+            handle.write(b"".join(element_list_records))
+            handle.write(struct.pack(f"<{len(offsets)}I", *offsets))
+            handle.write(b"".join(strings.data))
+            handle.flush()
+            os.fsync(handle.fileno())
+        # Temp files are created 0600; every worker must be able to map it
+        os.chmod(handle.name, 0o644)
+        os.replace(handle.name, path)
+    except BaseException:
+        Path(handle.name).unlink(missing_ok=True)
+        raise
+
+    return SnapshotInfo(
+        version=version,
+        fingerprint=fingerprint,
+        families=len(families),
+        rows=len(rows),
+        element_lists=len(element_list_records),
+        strings=len(strings.data),
+        size=path.stat().st_size,
+    )
+
+
+class _SnapshotHolder:
+    """The mapped snapshot of this process, remapped when the file is replaced."""
+
+    def __init__(self):
+        self._snapshot: Optional[CatalogueSnapshot] = None
+        self._identity = None
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def current(self) -> Optional[CatalogueSnapshot]:
+        if CATALOGUE_SNAPSHOT_PATH is None:
+            return None
+        now = time.monotonic()
+        checked_at = self._checked_at
+        if checked_at is not None and now - checked_at < CATALOGUE_SNAPSHOT_CHECK_SECONDS:
+            return self._snapshot
+        with self._lock:
+            self._checked_at = now
+            try:
+                stat = os.stat(CATALOGUE_SNAPSHOT_PATH)
+                identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                identity = None
+            if identity != self._identity:
+                self._identity = identity
+                snapshot = None
+                if identity is not None:
+                    try:
+                        snapshot = CatalogueSnapshot(CATALOGUE_SNAPSHOT_PATH)
+                    except (OSError, CatalogueSnapshotError):
+                        snapshot = None
+                # The previous mapping is released with its last reference
+                self._snapshot = snapshot
+            return self._snapshot
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._checked_at = None
+
+
+_holder = _SnapshotHolder()
+
+
+def get_catalogue_snapshot() -> Optional[CatalogueSnapshot]:
+    """
+    Get the mapped catalogue snapshot, if one is configured and readable.
+
+    The file is checked for replacement at most every
+    ``CATALOGUE_SNAPSHOT_CHECK_SECONDS``.
+    """
+    return _holder.current()
+
+
+def export_catalogue_snapshot(db: Session) -> Optional[SnapshotInfo]:
+    """
+    Write the configured snapshot and map it in this process right away.
+
+    Returns:
+        Summary of the written snapshot, or None if no snapshot path is
+        configured
+    """
+    if CATALOGUE_SNAPSHOT_PATH is None:
+        return None
+    info = write_catalogue_snapshot(db, CATALOGUE_SNAPSHOT_PATH)
+    _holder.refresh()
+    return info
+
+
+def remove_catalogue_snapshot() -> None:
+    """Delete the configured snapshot so every worker falls back to the database."""
+    if CATALOGUE_SNAPSHOT_PATH is None:
+        return
+    CATALOGUE_SNAPSHOT_PATH.unlink(missing_ok=True)
+    _holder.refresh()
+
+
+def ensure_catalogue_snapshot() -> None:
+    """
+    Export the configured snapshot at startup unless it matches the database.
+
+    A missing, unreadable or outdated snapshot (its fingerprint differs from
+    the database, e.g. after rows were changed while no worker was running)
+    is re-exported.
+    """
+    if CATALOGUE_SNAPSHOT_PATH is None:
+        return
+    with SessionLocal() as db:
+        snapshot = get_catalogue_snapshot()
+        if snapshot is not None and snapshot.fingerprint == catalogue_fingerprint(db):
+            return
+        export_catalogue_snapshot(db)
@@ -0,0 +1,67 @@
+"""Compatibility layer between the consolidated catalogue table and the former family tables.
+
+The requirement catalogue used to live in one table per family (``fau_db``
+… ``ava_db``). Rows are now stored in ``catalogue_requirements``; at startup
+rows left in former family tables are moved over, and each former table
+name is recreated as a read-only view of its partition so SQL clients keep
+working.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.database import Base
+from app.models import CatalogueRequirement
+
+
+_COLUMNS = "id, class, family, component, component_name, element, element_item"
+_COPIED_COLUMNS = "class, family, component, component_name, element, element_item"
+# Arbitrary application-wide key of the PostgreSQL advisory lock
+_MIGRATION_LOCK_KEY = 40000
+
+
+def _family_models():
+    return [mapper.class_ for mapper in CatalogueRequirement.__mapper__.self_and_descendants if mapper.class_.family_table]
+
+
+def ensure_catalogue_storage(engine: Engine) -> None:
+    """
+    Create missing tables, migrate former family tables and create their
+    compatibility views.
+
+    Safe to run on every startup: tables already migrated are views and
+    are left alone. Tables are created and the schema is inspected inside
+    one exclusive transaction, so workers starting together run this one
+    after another and the later ones find everything in place.
+
+    Args:
+        engine: Database engine
+    """
+    table_name = CatalogueRequirement.__tablename__
+    with engine.connect() as connection:
+        # Several workers run this at startup: take the write lock before
+        # looking at the schema, so only the first one creates and migrates
+        if connection.dialect.name == "sqlite":
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+        elif connection.dialect.name == "postgresql":
+            connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _MIGRATION_LOCK_KEY})
+        Base.metadata.create_all(bind=connection)
+        inspector = inspect(connection)
+        tables = set(inspector.get_table_names())
+        views = set(inspector.get_view_names())
+        for model in _family_models():
+            name = model.family_table
+            if name in views:
+                continue
+            code = model.__mapper__.polymorphic_identity
+            if name in tables:
+                # Keep the former row order: new ids are assigned in id order
+                connection.execute(text(
+                    f"INSERT INTO {table_name} (family_code, {_COPIED_COLUMNS}) "
+                    f"SELECT :code, {_COPIED_COLUMNS} FROM {name} ORDER BY id"
+                ), {"code": code})
+                connection.execute(text(f"DROP TABLE {name}"))
+            connection.execute(text(
+                f"CREATE VIEW {name} AS SELECT {_COLUMNS} FROM {table_name} "
+                f"WHERE family_code = '{code}'"
+            ))
+        connection.commit()
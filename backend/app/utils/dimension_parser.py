@@ -1,10 +1,7 @@
 """HTML element dimension parsing utilities."""
-import re
 from typing import Optional
 
-
-CSS_WIDTH_RE = re.compile(r"width\s*:\s*([0-9.]+)px", re.IGNORECASE)
-CSS_HEIGHT_RE = re.compile(r"height\s*:\s*([0-9.]+)px", re.IGNORECASE)
+from .style_parser import parse_css_px
 
 
 def extract_dimension_px(element, attr_name: str) -> Optional[float]:
@@ -27,14 +24,9 @@ def extract_dimension_px(element, attr_name: str) -> Optional[float]:
         return None
     
     # Check CSS style
-    style = element.get("style", "")
-    regex = CSS_WIDTH_RE if attr_name == "width" else CSS_HEIGHT_RE
-    match = regex.search(style)
-    if match:
-        try:
-            return float(match.group(1))
-        except (TypeError, ValueError):
-            pass
+    css_value = parse_css_px(element.get("style"), attr_name)
+    if css_value is not None:
+        return css_value
     
     # Check direct attribute
     attr_value = element.get(attr_name)
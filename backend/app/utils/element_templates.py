@@ -0,0 +1,288 @@
+"""Compiled templates for catalogue element text.
+
+Element texts contain operation placeholders (``[assignment: …]``,
+``[selection: …]``, ``[refinement: …]``). Each element's text is parsed
+once into an ``ElementTemplate`` (literal parts interleaved with operation
+slots) cached per ``element_index``, so filling in user parameters is a
+list join. The same compiled form is serialized for the UI and walked by
+the DOCX requirement renderer.
+"""
+import json
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models import ElementListDb
+from app.utils.catalogue_snapshot import get_catalogue_snapshot
+
+
+_OPERATION_START = re.compile(r"\[\s*(?:assignment|selection|refinement)\b", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class TemplateSlot:
+    """
+    One operation of an element.
+
+    Attributes:
+        kind: ``assignment``, ``selection`` or ``refinement``
+        text: Placeholder text as written in the catalogue (shown while
+            the operation is not completed)
+        prompt: Text after the colon, e.g. the assignment description
+        options: Choices of a selection operation
+    """
+    kind: str
+    text: str
+    prompt: str
+    options: Tuple[str, ...] = ()
+
+    def to_json(self) -> dict:
+        return {"kind": self.kind, "text": self.text, "prompt": self.prompt, "options": list(self.options)}
+
+
+@dataclass(frozen=True)
+class ElementTemplate:
+    """
+    Element text compiled into literal parts and operation slots.
+
+    ``parts`` interleaves the literals with the slots' placeholder texts
+    (``literal, slot, literal, …, literal``), so a filled text is the
+    join of a copy with the completed slots replaced.
+
+    Attributes:
+        element_index: Element identifier, e.g. ``FAU_GEN.1.1``
+        source: Text the template was compiled from
+        parts: Literals and placeholder texts, interleaved
+        slots: Operation slots in text order
+        color: UI highlight color of the element's operations
+    """
+    element_index: str
+    source: str
+    parts: Tuple[str, ...]
+    slots: Tuple[TemplateSlot, ...]
+    color: Optional[str] = None
+
+    @property
+    def literals(self) -> Tuple[str, ...]:
+        return self.parts[::2]
+
+    def _filled_parts(self, values: Sequence[Optional[str]]) -> Tuple[List[str], List[bool]]:
+        parts = list(self.parts)
+        filled = [False] * len(self.slots)
+        for index, value in enumerate(values[:len(self.slots)]):
+            value = (value or "").strip()
+            if value:
+                parts[2 * index + 1] = value
+                filled[index] = True
+        return parts, filled
+
+    def fill(self, values: Sequence[Optional[str]]) -> str:
+        """
+        Complete the operations with ``values`` in slot order.
+
+        Missing or blank values keep the placeholder text.
+        """
+        return "".join(self._filled_parts(values)[0])
+
+    def segments(self, values: Sequence[Optional[str]] = ()) -> List[Tuple[str, bool]]:
+        """
+        Split the filled text into ``(text, is_value)`` runs.
+
+        ``is_value`` marks completed operations; literals and open
+        placeholders are ``False``. Empty literals are skipped.
+        """
+        parts, filled = self._filled_parts(values)
+        segments = []
+        for index, part in enumerate(parts):
+            if part:
+                segments.append((part, bool(index % 2) and filled[index // 2]))
+        return segments
+
+    def to_json(self) -> dict:
+        return {
+            "element_index": self.element_index,
+            "literals": list(self.literals),
+            "slots": [slot.to_json() for slot in self.slots],
+            "color": self.color,
+        }
+
+
+def _split_options(body: str) -> Tuple[str, ...]:
+    # Top-level comma split: nested [assignment: …] options stay whole
+    options = []
+    depth = 0
+    current = []
+    for char in body:
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        if char == "," and depth == 0:
+            options.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    options.append("".join(current).strip())
+    return tuple(option for option in options if option)
+
+
+def _parse_slot(text: str, default_options: Tuple[str, ...]) -> TemplateSlot:
+    head, separator, body = text[1:-1].partition(":")
+    kind = head.split(",")[0].strip().lower()
+    prompt = body.strip() if separator else ""
+    options: Tuple[str, ...] = ()
+    if kind == "selection":
+        options = _split_options(prompt) or default_options
+    return TemplateSlot(kind=kind, text=text, prompt=prompt, options=options)
+
+
+def compile_element_template(
+    element_index: str,
+    text: str,
+    options: Sequence[str] = (),
+    color: Optional[str] = None,
+) -> ElementTemplate:
+    """
+    Parse element text into a template.
+
+    Args:
+        element_index: Element identifier
+        text: Catalogue element text
+        options: Choices for selection operations that do not list their
+            own (from the element list table)
+        color: UI highlight color
+
+    Returns:
+        Compiled template; text with unbalanced brackets keeps the
+        remainder as a literal
+    """
+    default_options = tuple(options)
+    parts: List[str] = []
+    slots: List[TemplateSlot] = []
+    position = 0
+    while True:
+        match = _OPERATION_START.search(text, position)
+        if match is None:
+            break
+        start = match.start()
+        depth = 0
+        end = start
+        for end in range(start, len(text)):
+            if text[end] == "[":
+                depth += 1
+            elif text[end] == "]":
+                depth -= 1
+                if depth == 0:
+                    break
+        if depth:
+            break
+        slot = _parse_slot(text[start:end + 1], default_options)
+        parts.extend((text[position:start], slot.text))
+        slots.append(slot)
+        position = end + 1
+    parts.append(text[position:])
+
+    return ElementTemplate(
+        element_index=element_index,
+        source=text,
+        parts=tuple(parts),
+        slots=tuple(slots),
+        color=color,
+    )
+
+
+def _parse_item_list(value: Optional[str]) -> Tuple[str, ...]:
+    value = (value or "").strip()
+    if not value:
+        return ()
+    if value.startswith("["):
+        try:
+            items = json.loads(value)
+        except ValueError:
+            items = None
+        if isinstance(items, list):
+            return tuple(str(item).strip() for item in items if str(item).strip())
+    return tuple(line.strip() for line in value.splitlines() if line.strip())
+
+
+def _load_element_lists() -> Dict[str, Tuple[Tuple[str, ...], Optional[str]]]:
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(ElementListDb.element_index, ElementListDb.item_list, ElementListDb.color)
+        ).all()
+    return {
+        element_index.strip(): (_parse_item_list(item_list), (color or "").strip() or None)
+        for element_index, item_list, color in rows
+        if element_index and element_index.strip()
+    }
+
+
+class _TemplateCache:
+    """Compiled templates per element index, recompiled when the text changes."""
+
+    def __init__(self):
+        self._templates: Dict[str, ElementTemplate] = {}
+        self._element_lists: Optional[Dict[str, Tuple[Tuple[str, ...], Optional[str]]]] = None
+        self._snapshot_version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _element_list(self, element_index: str) -> Tuple[Tuple[str, ...], Optional[str]]:
+        snapshot = get_catalogue_snapshot()
+        if snapshot is not None:
+            # Looked up in the mapped snapshot; nothing is loaded up front
+            entry = snapshot.element_list(element_index)
+            if entry is None:
+                return (), None
+            item_list, color = entry
+            return _parse_item_list(item_list), (color or "").strip() or None
+        element_lists = self._element_lists
+        if element_lists is None:
+            element_lists = self._element_lists = _load_element_lists()
+        return element_lists.get(element_index, ((), None))
+
+    def get(self, element_index: str, text: str) -> ElementTemplate:
+        snapshot = get_catalogue_snapshot()
+        version = snapshot.version if snapshot is not None else None
+        if version != self._snapshot_version:
+            self.invalidate()
+            self._snapshot_version = version
+        template = self._templates.get(element_index)
+        if template is not None and template.source == text:
+            return template
+        with self._lock:
+            options, color = self._element_list(element_index)
+            template = compile_element_template(element_index, text, options, color)
+            self._templates[element_index] = template
+        return template
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self._element_lists = None
+
+
+_cache = _TemplateCache()
+
+
+def get_element_template(element_index: str, text: str) -> ElementTemplate:
+    """
+    Get the compiled template of an element, compiling it on first use.
+
+    Args:
+        element_index: Element identifier, e.g. ``FAU_GEN.1.1``
+        text: Current catalogue text of the element (a changed text
+            replaces the cached template)
+
+    Returns:
+        Cached template
+    """
+    return _cache.get(element_index, text)
+
+
+def invalidate_element_templates() -> None:
+    """Drop compiled templates and element list metadata."""
+    _cache.invalidate()
@@ -0,0 +1,82 @@
+"""Plain-text extraction from rich-text (TipTap) HTML.
+
+Used wherever editor HTML ends up as table text or is tested for visible
+content. Parsing goes through lxml's C parser, so entities are decoded
+(``&amp;`` -> ``&``, ``&nbsp;`` -> space) and inline markup such as
+``<strong>`` does not split words. Results are cached because the same
+notes and comments are converted on every preview.
+"""
+import re
+from functools import lru_cache
+from typing import Optional
+
+from lxml import etree
+from lxml import html as lxml_html
+
+
+HTML_TEXT_CACHE_SIZE = 4096
+
+# Elements that separate words when flattened to text
+BREAK_TAGS = frozenset({
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "figcaption", "figure", "footer", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "img", "li", "main", "ol", "p", "pre", "section", "table",
+    "tbody", "td", "tfoot", "th", "thead", "tr", "ul",
+})
+
+_TAG_RE = re.compile(r"<[^>]*>")
+
+
+def _collapse(text: str) -> str:
+    # str.split() also splits on non-breaking and other Unicode spaces
+    return " ".join(text.split())
+
+
+def _collect_text(element, parts: list) -> None:
+    # Comments and processing instructions have a non-string tag; only
+    # their tail (added by the parent) is text
+    is_element = isinstance(element.tag, str)
+    is_break = is_element and element.tag in BREAK_TAGS
+    if is_break:
+        parts.append(" ")
+    if is_element and element.text:
+        parts.append(element.text)
+    for child in element:
+        _collect_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+    if is_break:
+        parts.append(" ")
+
+
+@lru_cache(maxsize=HTML_TEXT_CACHE_SIZE)
+def _html_to_text(value: str) -> str:
+    if "<" not in value and "&" not in value:
+        return _collapse(value)
+
+    try:
+        root = lxml_html.fragment_fromstring(value, create_parent="div")
+    except (etree.ParserError, ValueError):
+        return _collapse(_TAG_RE.sub(" ", value))
+
+    parts = []
+    _collect_text(root, parts)
+    return _collapse("".join(parts))
+
+
+def html_to_text(value: Optional[str]) -> str:
+    """
+    Convert an HTML fragment to normalized plain text.
+
+    Block elements and line breaks become single spaces, entities are
+    decoded and whitespace (including non-breaking spaces) is collapsed.
+
+    Args:
+        value: HTML fragment (or plain text)
+
+    Returns:
+        Plain text, empty string for empty input
+    """
+    if not value:
+        return ""
+    return _html_to_text(value)
@@ -0,0 +1,112 @@
+"""Conditional GET helpers for file downloads.
+
+Downloads carry a strong ETag derived from the file's SHA-256 so clients can
+revalidate with ``If-None-Match`` and receive ``304 Not Modified`` instead of
+the full body. Byte ranges (``Range``/``If-Range``) are served by Starlette's
+``FileResponse`` against the same ETag.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Cache-Control policies per kind of download
+CACHE_REVALIDATE = "private, no-cache"
+CACHE_IMMUTABLE_PRIVATE = "private, max-age=31536000, immutable"
+CACHE_IMMUTABLE_PUBLIC = "public, max-age=31536000, immutable"
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+_ETAG_CACHE_MAX_ENTRIES = 1024
+
+# path -> (mtime_ns, size, etag); avoids re-hashing unchanged files on every poll
+_etag_cache: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+_etag_lock = threading.Lock()
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_etag(path: Path) -> str:
+    """
+    Get the strong ETag for a file, hashing it only when it has changed.
+
+    Args:
+        path: File path
+
+    Returns:
+        Quoted ETag value
+    """
+    stat = path.stat()
+    key = str(path)
+    with _etag_lock:
+        cached = _etag_cache.get(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            _etag_cache.move_to_end(key)
+            return cached[2]
+
+    etag = f'"{_hash_file(path)}"'
+    with _etag_lock:
+        _etag_cache[key] = (stat.st_mtime_ns, stat.st_size, etag)
+        _etag_cache.move_to_end(key)
+        while len(_etag_cache) > _ETAG_CACHE_MAX_ENTRIES:
+            _etag_cache.popitem(last=False)
+    return etag
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    # Weak comparison, as required for If-None-Match
+    return "*" in candidates or any(value.removeprefix("W/") == etag for value in candidates)
+
+
+async def cached_file_response(
+    request: Request,
+    path: Path,
+    *,
+    media_type: Optional[str] = None,
+    filename: Optional[str] = None,
+    cache_control: str = CACHE_REVALIDATE,
+    etag: Optional[str] = None,
+) -> Response:
+    """
+    Build a file download response with ETag, Cache-Control and range support.
+
+    Args:
+        request: Incoming request (for conditional headers)
+        path: File to send
+        media_type: Response media type (guessed from the name if omitted)
+        filename: Download filename for Content-Disposition
+        cache_control: Cache-Control header value
+        etag: Precomputed quoted ETag (e.g. for content-addressed files)
+
+    Returns:
+        304 response if the client copy is current, otherwise a FileResponse
+    """
+    if etag is None:
+        etag = await run_in_threadpool(file_etag, path)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(
+        path=str(path),
+        media_type=media_type,
+        filename=filename,
+        headers=headers,
+    )
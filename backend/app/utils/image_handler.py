@@ -41,6 +41,9 @@ def resolve_uploaded_image_path(
     """
     Resolve and validate uploaded image path.
     
+    Accepts either a per-user cover upload path or a content-addressed
+    ``asset://<sha256>`` reference from the shared asset store.
+    
     Args:
         image_path: Web path to image (e.g., '/cover/uploads/{user_id}/image.png')
         user_id: User identifier
@@ -55,6 +58,22 @@ def resolve_uploaded_image_path(
     if not image_path:
         return None
     
+    if image_path.startswith("asset://"):
+        from .asset_store import asset_path, parse_asset_reference
+        digest = parse_asset_reference(image_path)
+        if not digest:
+            raise HTTPException(
+                status_code=400, 
+                detail="Invalid image reference for preview generation"
+            )
+        image_file = asset_path(digest)
+        if not image_file.exists():
+            raise HTTPException(
+                status_code=400, 
+                detail="Referenced cover image could not be found"
+            )
+        return image_file
+    
     expected_prefix = f"/cover/uploads/{user_id}/"
     if not image_path.startswith(expected_prefix):
         raise HTTPException(
@@ -0,0 +1,128 @@
+"""Derived image variants (print and thumbnail) for uploaded cover images.
+
+Variants are stored next to the original upload as ``<stem>.<variant>.<ext>``
+so they are cleaned up together with it and regenerated lazily for uploads
+that predate this cache.
+"""
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+from PIL import Image, ImageOps
+
+
+# Cover frame width in the DOCX (see CoverDocumentRenderer._add_cover_image)
+COVER_IMAGE_WIDTH_MM = 120
+COVER_PRINT_DPI = 300
+THUMBNAIL_MAX_PX = 320
+JPEG_QUALITY = 88
+
+# Maximum pixel edge for each variant
+VARIANT_SIZES = {
+    "print": round(COVER_IMAGE_WIDTH_MM / 25.4 * COVER_PRINT_DPI),
+    "thumb": THUMBNAIL_MAX_PX,
+}
+
+
+def variant_base_stem(path: Path) -> str:
+    """Return the original upload stem for an original or variant path."""
+    return path.name.split(".", 1)[0]
+
+
+def is_variant(path: Path) -> bool:
+    """Check whether a path names a derived variant rather than an original."""
+    parts = path.name.split(".")
+    return len(parts) >= 3 and parts[-2] in VARIANT_SIZES
+
+
+def _has_alpha(image: Image.Image) -> bool:
+    return image.mode in {"RGBA", "LA"} or (image.mode == "P" and "transparency" in image.info)
+
+
+def _variant_path(original: Path, variant: str, extension: str) -> Path:
+    return original.with_name(f"{variant_base_stem(original)}.{variant}.{extension}")
+
+
+def find_variant(original: Path, variant: str) -> Optional[Path]:
+    """Return an existing variant file for an original upload, if any."""
+    for extension in ("jpg", "png"):
+        candidate = _variant_path(original, variant, extension)
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _write_variant(image: Image.Image, original: Path, variant: str) -> Path:
+    max_edge = VARIANT_SIZES[variant]
+    derived = image.copy()
+    if max(derived.size) > max_edge:
+        derived.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+    if _has_alpha(derived):
+        target = _variant_path(original, variant, "png")
+        derived = derived.convert("RGBA")
+        options = {"format": "PNG", "optimize": True}
+    else:
+        target = _variant_path(original, variant, "jpg")
+        derived = derived.convert("RGB")
+        options = {
+            "format": "JPEG", "quality": JPEG_QUALITY, "optimize": True, "progressive": True,
+            "dpi": (COVER_PRINT_DPI, COVER_PRINT_DPI),
+        }
+    # Unique temp name: concurrent requests may generate the same variant
+    fd, tmp_name = tempfile.mkstemp(dir=str(target.parent), prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            derived.save(handle, **options)
+        os.replace(tmp_name, target)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return target
+
+
+def generate_cover_variants(original: Path) -> Dict[str, Path]:
+    """
+    Produce the print and thumbnail variants of an uploaded cover image.
+
+    The image is decoded once, EXIF orientation is applied, and each variant
+    is downscaled (never upscaled) and re-encoded. Runs synchronously; call
+    it from a threadpool in request handlers.
+
+    Args:
+        original: Path to the verified original upload
+
+    Returns:
+        Mapping of variant name to written file path
+    """
+    with Image.open(original) as source:
+        source.seek(0)
+        image = ImageOps.exif_transpose(source)
+        image.load()
+    return {variant: _write_variant(image, original, variant) for variant in VARIANT_SIZES}
+
+
+def get_cover_variant(original: Optional[Path], variant: str = "print") -> Optional[Path]:
+    """
+    Get a cached variant for an uploaded cover image, generating it if missing.
+
+    Falls back to the original file if the variant cannot be produced, so
+    callers can always use the returned path.
+
+    Args:
+        original: Original upload path (or None)
+        variant: Variant name ('print' or 'thumb')
+
+    Returns:
+        Path to embed, or None if no original was given
+    """
+    if original is None:
+        return None
+    existing = find_variant(original, variant)
+    if existing:
+        return existing
+    try:
+        return generate_cover_variants(original)[variant]
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return original
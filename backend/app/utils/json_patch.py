@@ -0,0 +1,162 @@
+"""JSON Patch (RFC 6902) helpers for partial workspace updates."""
+import copy
+from typing import Any, Iterable, List, Mapping
+
+
+class JsonPatchError(ValueError):
+    """Raised when a patch operation cannot be applied to a document."""
+
+
+class JsonPatchTestFailed(JsonPatchError):
+    """Raised when a ``test`` operation does not match the document."""
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """
+    Split a JSON Pointer (RFC 6901) into unescaped reference tokens.
+
+    Args:
+        pointer: Pointer string (e.g., '/riskManagement/productContext/evidenceEntries/0')
+
+    Returns:
+        List of reference tokens ('' yields an empty list for the whole document)
+
+    Raises:
+        JsonPatchError: If the pointer is not empty and does not start with '/'
+    """
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _array_index(container: list, token: str, *, allow_end: bool) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    upper = len(container) if allow_end else len(container) - 1
+    if index > upper:
+        raise JsonPatchError(f"Array index out of range: {token}")
+    return index
+
+
+def _resolve_parent(document: Any, tokens: List[str]):
+    target = document
+    for token in tokens[:-1]:
+        if isinstance(target, dict):
+            if token not in target:
+                raise JsonPatchError(f"Path segment not found: {token!r}")
+            target = target[token]
+        elif isinstance(target, list):
+            target = target[_array_index(target, token, allow_end=False)]
+        else:
+            raise JsonPatchError(f"Cannot traverse into scalar at {token!r}")
+    return target
+
+
+def _get(document: Any, tokens: List[str]) -> Any:
+    if not tokens:
+        return document
+    parent = _resolve_parent(document, tokens)
+    token = tokens[-1]
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path not found: {token!r}")
+        return parent[token]
+    if isinstance(parent, list):
+        return parent[_array_index(parent, token, allow_end=False)]
+    raise JsonPatchError(f"Cannot read from scalar at {token!r}")
+
+
+def _add(document: Any, tokens: List[str], value: Any) -> Any:
+    if not tokens:
+        return value
+    parent = _resolve_parent(document, tokens)
+    token = tokens[-1]
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_array_index(parent, token, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add to scalar at {token!r}")
+    return document
+
+
+def _remove(document: Any, tokens: List[str]) -> Any:
+    if not tokens:
+        raise JsonPatchError("Cannot remove the document root")
+    parent = _resolve_parent(document, tokens)
+    token = tokens[-1]
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path not found: {token!r}")
+        del parent[token]
+    elif isinstance(parent, list):
+        del parent[_array_index(parent, token, allow_end=False)]
+    else:
+        raise JsonPatchError(f"Cannot remove from scalar at {token!r}")
+    return document
+
+
+def apply_json_patch(document: Any, operations: Iterable[Mapping[str, Any]]) -> Any:
+    """
+    Apply a sequence of JSON Patch operations to a document.
+
+    The patch is applied atomically: the input document is never mutated and
+    either every operation succeeds or a JsonPatchError is raised.
+
+    Args:
+        document: JSON-compatible document (dict/list/scalars)
+        operations: Operations with 'op', 'path' and, depending on the op,
+            'value' or 'from' keys
+
+    Returns:
+        New patched document
+
+    Raises:
+        JsonPatchError: If an operation is malformed or its path is invalid
+        JsonPatchTestFailed: If a 'test' operation does not match
+    """
+    result = copy.deepcopy(document)
+
+    for operation in operations:
+        op = operation.get("op")
+        path = operation.get("path")
+        if not isinstance(path, str):
+            raise JsonPatchError("Patch operation is missing 'path'")
+        tokens = parse_pointer(path)
+
+        if op == "add":
+            if "value" not in operation:
+                raise JsonPatchError("'add' operation requires 'value'")
+            result = _add(result, tokens, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            result = _remove(result, tokens)
+        elif op == "replace":
+            if "value" not in operation:
+                raise JsonPatchError("'replace' operation requires 'value'")
+            _get(result, tokens)
+            if tokens:
+                result = _remove(result, tokens)
+            result = _add(result, tokens, copy.deepcopy(operation["value"]))
+        elif op in {"move", "copy"}:
+            source = operation.get("from")
+            if not isinstance(source, str):
+                raise JsonPatchError(f"'{op}' operation requires 'from'")
+            source_tokens = parse_pointer(source)
+            if op == "move" and tokens[: len(source_tokens)] == source_tokens and tokens != source_tokens:
+                raise JsonPatchError("Cannot move a value into one of its children")
+            value = copy.deepcopy(_get(result, source_tokens))
+            if op == "move":
+                result = _remove(result, source_tokens)
+            result = _add(result, tokens, value)
+        elif op == "test":
+            if _get(result, tokens) != operation.get("value"):
+                raise JsonPatchTestFailed(f"Test operation failed at {path!r}")
+        else:
+            raise JsonPatchError(f"Unsupported patch operation: {op!r}")
+
+    return result
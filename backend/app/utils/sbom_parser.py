@@ -0,0 +1,474 @@
+"""Streaming SBOM parsers (CycloneDX JSON/XML, SPDX JSON/tag-value).
+
+Real SBOMs list thousands of components, so files are never loaded whole:
+JSON is decoded one array item at a time, XML is walked with ``iterparse``
+and cleared as it goes, and SPDX tag-value is read line by line. Every
+parser yields components normalized to the fields of
+``ThirdPartyComponentEntry`` plus ``purl``.
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, TextIO, Tuple
+
+from lxml import etree
+
+
+JSON_CHUNK_CHARS = 64 * 1024
+# Largest single JSON value (one component, the metadata block) held at once
+JSON_MAX_VALUE_CHARS = 16 * 1024 * 1024
+
+SPDX_NO_VALUES = {"NOASSERTION", "NONE", ""}
+
+ComponentEntry = Dict[str, Optional[str]]
+
+
+class SbomFormatError(ValueError):
+    """The file is not a supported or well-formed SBOM."""
+
+
+def _clean(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = " ".join(str(value).split())
+    return text or None
+
+
+def _component_type(value: Any) -> Optional[str]:
+    text = _clean(value)
+    if not text:
+        return None
+    return text.replace("_", " ").replace("-", " ").capitalize()
+
+
+def _entry(
+    name: Any = None,
+    component_type: Any = None,
+    version: Any = None,
+    supplier: Any = None,
+    purpose: Any = None,
+    license: Any = None,
+    purl: Any = None,
+) -> ComponentEntry:
+    return {
+        "component_name": _clean(name),
+        "component_type": _component_type(component_type),
+        "version": _clean(version),
+        "supplier": _clean(supplier),
+        "purpose": _clean(purpose),
+        "license": _clean(license),
+        "purl": _clean(purl),
+    }
+
+
+def _spdx_value(value: Any) -> Optional[str]:
+    text = _clean(value)
+    if not text or text.upper() in SPDX_NO_VALUES:
+        return None
+    return text
+
+
+def _spdx_supplier(value: Any) -> Optional[str]:
+    text = _spdx_value(value)
+    if text:
+        for prefix in ("Organization:", "Person:", "Tool:"):
+            if text.startswith(prefix):
+                return text[len(prefix):].strip() or None
+    return text
+
+
+def _spdx_entry(fields: Dict[str, Any]) -> ComponentEntry:
+    return _entry(
+        name=fields.get("name"),
+        component_type=fields.get("purpose"),
+        version=_spdx_value(fields.get("version")),
+        supplier=_spdx_supplier(fields.get("supplier")) or _spdx_supplier(fields.get("originator")),
+        purpose=fields.get("summary"),
+        license=_spdx_value(fields.get("license_concluded")) or _spdx_value(fields.get("license_declared")),
+        purl=fields.get("purl"),
+    )
+
+
+# --- JSON ---------------------------------------------------------------
+
+class _JsonStream:
+    """Incremental reader decoding one JSON value at a time from a text stream."""
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, handle: TextIO):
+        self._handle = handle
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._handle.read(JSON_CHUNK_CHARS)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        if len(self._buffer) > JSON_MAX_VALUE_CHARS:
+            raise SbomFormatError("SBOM contains a JSON value that is too large")
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ('' at end)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def take(self, expected: str) -> str:
+        char = self.peek()
+        if char not in expected or not char:
+            raise SbomFormatError("Malformed JSON SBOM")
+        self._pos += 1
+        return char
+
+    def value(self) -> Any:
+        while True:
+            self.peek()
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise SbomFormatError("Malformed JSON SBOM") from None
+            # A number or literal ending at the buffer edge may be cut off
+            if end >= len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def _iter_json_members(handle: TextIO, array_keys) -> Iterator[Tuple[str, Any]]:
+    """
+    Walk a top-level JSON object.
+
+    Yields ``(key, item)`` for each item of the arrays named in
+    ``array_keys`` and ``(key, value)`` for every other top-level member;
+    other arrays are skipped item by item.
+    """
+    stream = _JsonStream(handle)
+    stream.take("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value()
+        stream.take(":")
+        if stream.peek() == "[":
+            stream.take("[")
+            if stream.peek() == "]":
+                stream.take("]")
+            else:
+                while True:
+                    item = stream.value()
+                    if key in array_keys:
+                        yield key, item
+                    if stream.take(",]") == "]":
+                        break
+        else:
+            value = stream.value()
+            if key not in array_keys:
+                yield key, value
+        if stream.take(",}") == "}":
+            return
+
+
+def _cyclonedx_licenses(licenses: Any) -> Optional[str]:
+    names = []
+    for choice in licenses if isinstance(licenses, list) else []:
+        if not isinstance(choice, dict):
+            continue
+        if choice.get("expression"):
+            names.append(choice["expression"])
+            continue
+        license_info = choice.get("license") or {}
+        name = license_info.get("id") or license_info.get("name") if isinstance(license_info, dict) else None
+        if name:
+            names.append(name)
+    return ", ".join(dict.fromkeys(names)) or None
+
+
+def _cyclonedx_supplier(component: Dict[str, Any]) -> Optional[str]:
+    supplier = component.get("supplier")
+    if isinstance(supplier, dict) and supplier.get("name"):
+        return supplier["name"]
+    return component.get("publisher") or component.get("author")
+
+
+def _cyclonedx_json_entries(component: Any) -> Iterator[ComponentEntry]:
+    if not isinstance(component, dict):
+        return
+    name = component.get("name")
+    group = component.get("group")
+    yield _entry(
+        name=f"{group}/{name}" if group and name else name,
+        component_type=component.get("type"),
+        version=component.get("version"),
+        supplier=_cyclonedx_supplier(component),
+        purpose=component.get("description"),
+        license=_cyclonedx_licenses(component.get("licenses")),
+        purl=component.get("purl"),
+    )
+    for child in component.get("components") or []:
+        yield from _cyclonedx_json_entries(child)
+
+
+def _spdx_json_entry(package: Any) -> Optional[ComponentEntry]:
+    if not isinstance(package, dict):
+        return None
+    purl = next(
+        (
+            ref.get("referenceLocator")
+            for ref in package.get("externalRefs") or []
+            if isinstance(ref, dict) and ref.get("referenceType") == "purl"
+        ),
+        None,
+    )
+    return _spdx_entry({
+        "name": package.get("name"),
+        "purpose": package.get("primaryPackagePurpose"),
+        "version": package.get("versionInfo"),
+        "supplier": package.get("supplier"),
+        "originator": package.get("originator"),
+        "summary": package.get("summary"),
+        "license_concluded": package.get("licenseConcluded"),
+        "license_declared": package.get("licenseDeclared"),
+        "purl": purl,
+    })
+
+
+def _iter_json(path: Path, formats: Dict[str, str]) -> Iterator[ComponentEntry]:
+    try:
+        with path.open("r", encoding="utf-8-sig") as handle:
+            for key, value in _iter_json_members(handle, {"components", "packages"}):
+                if key == "bomFormat":
+                    formats["format"] = "cyclonedx-json"
+                elif key == "spdxVersion":
+                    formats["format"] = "spdx-json"
+                elif key == "components":
+                    formats.setdefault("format", "cyclonedx-json")
+                    yield from _cyclonedx_json_entries(value)
+                elif key == "packages":
+                    formats.setdefault("format", "spdx-json")
+                    entry = _spdx_json_entry(value)
+                    if entry:
+                        yield entry
+    except UnicodeDecodeError:
+        raise SbomFormatError("JSON SBOM is not valid UTF-8") from None
+    if "format" not in formats:
+        raise SbomFormatError("JSON file is neither a CycloneDX nor an SPDX document")
+
+
+# --- XML ----------------------------------------------------------------
+
+def _local(tag: Any) -> str:
+    return etree.QName(tag).localname if isinstance(tag, str) else ""
+
+
+def _child_text(element, name: str) -> Optional[str]:
+    for child in element:
+        if _local(child.tag) == name:
+            return child.text
+    return None
+
+
+def _child(element, name: str):
+    for child in element:
+        if _local(child.tag) == name:
+            return child
+    return None
+
+
+def _cyclonedx_xml_entry(component) -> ComponentEntry:
+    licenses = []
+    licenses_element = _child(component, "licenses")
+    if licenses_element is not None:
+        for choice in licenses_element:
+            if _local(choice.tag) == "expression" and choice.text:
+                licenses.append(choice.text)
+            elif _local(choice.tag) == "license":
+                name = _child_text(choice, "id") or _child_text(choice, "name")
+                if name:
+                    licenses.append(name)
+
+    supplier = _child(component, "supplier")
+    supplier_name = _child_text(supplier, "name") if supplier is not None else None
+    name = _child_text(component, "name")
+    group = _child_text(component, "group")
+    return _entry(
+        name=f"{group}/{name}" if group and name else name,
+        component_type=component.get("type"),
+        version=_child_text(component, "version"),
+        supplier=supplier_name or _child_text(component, "publisher") or _child_text(component, "author"),
+        purpose=_child_text(component, "description"),
+        license=", ".join(dict.fromkeys(licenses)) or None,
+        purl=_child_text(component, "purl"),
+    )
+
+
+def _is_product_component(component) -> bool:
+    """Whether a component is (part of) metadata/component, the product itself."""
+    return any(_local(ancestor.tag) == "metadata" for ancestor in component.iterancestors())
+
+
+def _iter_xml(path: Path, formats: Dict[str, str]) -> Iterator[ComponentEntry]:
+    """
+    Walk a CycloneDX XML document.
+
+    Components are yielded parent first, like the JSON parser: a component
+    with nested components is yielded when its ``components`` child starts,
+    since the fields read from it precede that child in the schema.
+    """
+    yielded = set()
+    events = etree.iterparse(
+        str(path),
+        events=("start", "end"),
+        resolve_entities=False,
+        no_network=True,
+        huge_tree=False,
+    )
+    try:
+        for event, element in events:
+            if event == "start":
+                if "format" not in formats:
+                    if _local(element.tag) != "bom":
+                        raise SbomFormatError("XML file is not a CycloneDX document")
+                    formats["format"] = "cyclonedx-xml"
+                elif _local(element.tag) == "components":
+                    owner = element.getparent()
+                    if _local(owner.tag) == "component" and not _is_product_component(owner):
+                        yielded.add(owner)
+                        yield _cyclonedx_xml_entry(owner)
+                continue
+            parent = element.getparent()
+            if _local(element.tag) == "component":
+                # metadata/component describes the product itself
+                if _is_product_component(element):
+                    continue
+                if element in yielded:
+                    yielded.discard(element)
+                else:
+                    yield _cyclonedx_xml_entry(element)
+            elif parent is None or parent.getparent() is not None:
+                continue
+            # Release processed components (nested ones are already yielded)
+            # and finished top-level sections such as dependencies
+            element.clear(keep_tail=True)
+            while element.getprevious() is not None:
+                del parent[0]
+    except etree.XMLSyntaxError as exc:
+        raise SbomFormatError(f"Malformed XML SBOM: {exc}") from None
+
+
+# --- SPDX tag-value -----------------------------------------------------
+
+_SPDX_TAGS = {
+    "PackageName": "name",
+    "PackageVersion": "version",
+    "PackageSupplier": "supplier",
+    "PackageOriginator": "originator",
+    "PackageSummary": "summary",
+    "PackageLicenseConcluded": "license_concluded",
+    "PackageLicenseDeclared": "license_declared",
+    "PrimaryPackagePurpose": "purpose",
+}
+# Tags that start a section other than a package
+_SPDX_SECTION_TAGS = {"FileName", "SnippetSPDXID", "LicenseID"}
+
+
+def _iter_spdx_tag_value(path: Path, formats: Dict[str, str]) -> Iterator[ComponentEntry]:
+    formats["format"] = "spdx-tag-value"
+    package: Optional[Dict[str, str]] = None
+    with path.open("r", encoding="utf-8-sig", errors="replace") as handle:
+        for line in handle:
+            tag, separator, value = line.partition(":")
+            if not separator:
+                continue
+            tag, value = tag.strip(), value.strip()
+            if value.startswith("<text>"):
+                # Multi-line values are only read up to the first line
+                text = value[len("<text>"):]
+                while "</text>" not in text:
+                    continuation = handle.readline()
+                    if not continuation:
+                        break
+                    if len(text) < 4096:
+                        text += " " + continuation.strip()
+                value = text.split("</text>", 1)[0]
+
+            if tag == "PackageName":
+                if package is not None:
+                    yield _spdx_entry(package)
+                package = {}
+            elif tag in _SPDX_SECTION_TAGS:
+                if package is not None:
+                    yield _spdx_entry(package)
+                package = None
+            if package is None:
+                continue
+
+            if tag in _SPDX_TAGS:
+                package[_SPDX_TAGS[tag]] = value
+            elif tag == "ExternalRef":
+                parts = value.split()
+                if len(parts) >= 3 and parts[1] == "purl":
+                    package["purl"] = parts[2]
+    if package is not None:
+        yield _spdx_entry(package)
+
+
+# --- Entry point --------------------------------------------------------
+
+def _sniff(path: Path) -> str:
+    with path.open("rb") as handle:
+        head = handle.read(4096)
+    text = head.lstrip(b"\xef\xbb\xbf").lstrip()
+    if text.startswith(b"{"):
+        return "json"
+    if text.startswith(b"<"):
+        return "xml"
+    if b"SPDXVersion:" in head:
+        return "tag-value"
+    raise SbomFormatError("Unsupported SBOM format (expected CycloneDX JSON/XML or SPDX JSON/tag-value)")
+
+
+def iter_sbom_components(path: Path, formats: Dict[str, str]) -> Iterator[ComponentEntry]:
+    """
+    Stream the components of an SBOM file.
+
+    Args:
+        path: SBOM file
+        formats: Filled with the detected format under ``"format"``
+            (``cyclonedx-json``, ``cyclonedx-xml``, ``spdx-json`` or
+            ``spdx-tag-value``)
+
+    Yields:
+        Normalized component entries (``ThirdPartyComponentEntry`` fields
+        plus ``purl``)
+
+    Raises:
+        SbomFormatError: If the file is not a supported, well-formed SBOM
+    """
+    kind = _sniff(path)
+    if kind == "json":
+        return _iter_json(path, formats)
+    if kind == "xml":
+        return _iter_xml(path, formats)
+    return _iter_spdx_tag_value(path, formats)
+
+
+def component_key(entry: ComponentEntry) -> Optional[str]:
+    """Deduplication key: the purl, else name and version."""
+    if entry.get("purl"):
+        return f"purl:{entry['purl']}"
+    if entry.get("component_name"):
+        return f"name:{entry['component_name'].lower()}@{(entry.get('version') or '').lower()}"
+    return None
@@ -0,0 +1,133 @@
+"""Server-side storage of imported SBOM components."""
+import uuid
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import SbomComponent, SbomImport
+from app.utils.sbom_parser import component_key, iter_sbom_components
+
+
+SBOM_INSERT_BATCH_SIZE = 1000
+SBOM_READ_BATCH_SIZE = 500
+
+COMPONENT_FIELDS = ("component_name", "component_type", "version", "supplier", "purpose", "license")
+
+
+def import_sbom(db: Session, path: Path, user_id: str, filename: Optional[str]) -> SbomImport:
+    """
+    Parse an SBOM file as a stream and store its deduplicated components.
+
+    Components are inserted in batches as they are parsed; only the
+    deduplication keys are kept in memory.
+
+    Args:
+        db: Database session
+        path: SBOM file
+        user_id: Owner of the import
+        filename: Original file name
+
+    Returns:
+        Committed import record
+
+    Raises:
+        SbomFormatError: If the file is not a supported, well-formed SBOM
+    """
+    formats = {}
+    record = SbomImport(id=uuid.uuid4().hex, user_id=user_id, filename=filename, sbom_format="unknown")
+    db.add(record)
+    db.flush()
+
+    seen = set()
+    batch: List[dict] = []
+    position = duplicates = 0
+    try:
+        for entry in iter_sbom_components(path, formats):
+            key = component_key(entry)
+            if key is None:
+                continue
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            batch.append({"sbom_id": record.id, "position": position, **entry})
+            position += 1
+            if len(batch) >= SBOM_INSERT_BATCH_SIZE:
+                db.execute(insert(SbomComponent), batch)
+                batch = []
+        if batch:
+            db.execute(insert(SbomComponent), batch)
+
+        record.sbom_format = formats.get("format", "unknown")
+        record.component_count = position
+        record.duplicate_count = duplicates
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+    db.refresh(record)
+    return record
+
+
+def get_sbom(db: Session, sbom_id: str) -> Optional[SbomImport]:
+    return db.get(SbomImport, sbom_id)
+
+
+def list_sbom_components(db: Session, sbom_id: str, skip: int, limit: int) -> List[SbomComponent]:
+    """Page through the stored components of an import in SBOM order."""
+    return list(
+        db.scalars(
+            select(SbomComponent)
+            .where(SbomComponent.sbom_id == sbom_id, SbomComponent.position >= skip)
+            .order_by(SbomComponent.position)
+            .limit(limit)
+        )
+    )
+
+
+def delete_sbom(db: Session, record: SbomImport) -> None:
+    """Delete an import and its components."""
+    db.execute(delete(SbomComponent).where(SbomComponent.sbom_id == record.id))
+    db.delete(record)
+    db.commit()
+
+
+def iter_sbom_entries(sbom_id: str, user_id: str, batch_size: int = SBOM_READ_BATCH_SIZE) -> Iterator[dict]:
+    """
+    Stream the stored components of a user's import as entry dicts.
+
+    Rows are read in keyset-paginated batches with a dedicated session, so
+    document builders can render thousands of components without loading
+    them all at once.
+
+    Args:
+        sbom_id: Import identifier
+        user_id: Owner of the import; imports of other users yield nothing
+        batch_size: Rows fetched per query
+
+    Yields:
+        Dicts with the ``ThirdPartyComponentEntry`` fields
+    """
+    columns = [getattr(SbomComponent, field) for field in COMPONENT_FIELDS]
+    last_position = -1
+    with SessionLocal() as db:
+        owned = db.scalar(
+            select(SbomImport.id).where(SbomImport.id == sbom_id, SbomImport.user_id == user_id)
+        )
+        if owned is None:
+            return
+        while True:
+            rows = db.execute(
+                select(SbomComponent.position, *columns)
+                .where(SbomComponent.sbom_id == sbom_id, SbomComponent.position > last_position)
+                .order_by(SbomComponent.position)
+                .limit(batch_size)
+            ).all()
+            for row in rows:
+                yield dict(zip(COMPONENT_FIELDS, row[1:]))
+            if len(rows) < batch_size:
+                return
+            last_position = rows[-1][0]
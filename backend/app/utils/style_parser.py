@@ -1,76 +1,224 @@
-"""CSS and HTML style parsing utilities."""
+"""CSS and HTML style parsing utilities.
+
+Inline ``style`` attributes are tokenized once per distinct string into a
+declaration map (see ``parse_style_declarations``); every helper below
+queries that map instead of scanning the raw string again.
+"""
+import colorsys
+import math
 import re
-from typing import Optional, Dict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional, Dict, Tuple
 from docx.shared import RGBColor
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 
+from .css_colors import CSS_NAMED_COLORS
 
-def parse_margin_left(style: Optional[str]) -> Optional[float]:
+
+STYLE_CACHE_SIZE = 4096
+
+_EMPTY_DECLARATIONS: Mapping[str, str] = MappingProxyType({})
+_PX_RE = re.compile(r"([0-9.]+)px")
+_COLOR_ARGS_RE = re.compile(r"\s*[,/\s]\s*")
+
+_ALIGNMENTS = {
+    "left": WD_PARAGRAPH_ALIGNMENT.LEFT,
+    "center": WD_PARAGRAPH_ALIGNMENT.CENTER,
+    "right": WD_PARAGRAPH_ALIGNMENT.RIGHT,
+    "justify": WD_PARAGRAPH_ALIGNMENT.JUSTIFY,
+}
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def _parse_style_declarations(style: str) -> Mapping[str, str]:
+    declarations = {}
+    for rule in style.split(";"):
+        name, separator, value = rule.partition(":")
+        name = name.strip().lower()
+        if not separator or not name:
+            continue
+        value = value.replace("!important", "").strip().lower()
+        if value:
+            declarations[name] = value
+    return MappingProxyType(declarations)
+
+
+def parse_style_declarations(style: Optional[str]) -> Mapping[str, str]:
     """
-    Extract left margin value from CSS style string.
+    Tokenize a CSS style string into a declaration map.
+    
+    Property names and values are lowercased, ``!important`` is dropped and,
+    as in CSS, the last declaration of a property wins. Results are cached
+    per distinct style string and shared, so the map is read-only.
     
     Args:
         style: CSS style string (e.g., 'margin-left: 20px; color: red;')
         
     Returns:
-        Margin value in points, or None if not found
+        Read-only mapping of property name to value
     """
     if not style:
-        return None
+        return _EMPTY_DECLARATIONS
+    return _parse_style_declarations(style)
+
+
+def parse_css_px(style: Optional[str], property_name: str) -> Optional[float]:
+    """
+    Extract a pixel value of a CSS property.
     
-    match = re.search(r"margin-left\s*:\s*([0-9.]+)px", style)
+    Args:
+        style: CSS style string
+        property_name: Property to read (e.g., 'width')
+        
+    Returns:
+        Value in pixels, or None if the property is missing or not in px
+    """
+    value = parse_style_declarations(style).get(property_name)
+    if not value:
+        return None
+    match = _PX_RE.match(value)
     if not match:
         return None
-    
     try:
-        from .converters import px_to_points
-        return px_to_points(float(match.group(1)))
+        return float(match.group(1))
     except ValueError:
         return None
 
 
-def parse_color(value: Optional[str]) -> Optional[RGBColor]:
+def parse_margin_left(style: Optional[str]) -> Optional[float]:
     """
-    Parse color value from CSS string (hex or rgb format).
+    Extract left margin value from CSS style string.
     
     Args:
-        value: Color string (e.g., '#ff0000', 'rgb(255, 0, 0)', 'red')
+        style: CSS style string (e.g., 'margin-left: 20px; color: red;')
         
     Returns:
-        RGBColor object, or None if invalid format
+        Margin value in points, or None if not found
     """
-    if not value:
+    margin_px = parse_css_px(style, "margin-left")
+    if margin_px is None:
+        return None
+    
+    from .converters import px_to_points
+    return px_to_points(margin_px)
+
+
+def _channel(token: str) -> int:
+    """Parse an rgb() channel (number or percentage) into 0-255."""
+    if token.endswith("%"):
+        value = float(token[:-1]) * 255 / 100
+    else:
+        value = float(token)
+    return min(255, max(0, int(round(value))))
+
+
+def _unit_fraction(token: str) -> float:
+    """Parse an hsl() saturation/lightness or alpha value into 0-1."""
+    value = float(token[:-1]) / 100 if token.endswith("%") else float(token)
+    return min(1.0, max(0.0, value))
+
+
+def _hue_degrees(token: str) -> float:
+    for unit, factor in (("deg", 1.0), ("grad", 0.9), ("rad", 180 / math.pi), ("turn", 360.0)):
+        if token.endswith(unit):
+            return float(token[:-len(unit)]) * factor
+    return float(token)
+
+
+@lru_cache(maxsize=1024)
+def _intern_rgb(r: int, g: int, b: int) -> RGBColor:
+    """Shared ``RGBColor`` instance per color value."""
+    return RGBColor(r, g, b)
+
+
+def _parse_color_function(color: str) -> Optional[Tuple[int, int, int]]:
+    name, _, args = color.partition("(")
+    tokens = _COLOR_ARGS_RE.split(args.rstrip(")").strip())
+    if len(tokens) < 3:
+        return None
+    # Fully transparent colors carry no visible color
+    if len(tokens) >= 4 and _unit_fraction(tokens[3]) == 0:
         return None
     
-    color = value.strip().lower()
+    if name.strip() in {"rgb", "rgba"}:
+        return _channel(tokens[0]), _channel(tokens[1]), _channel(tokens[2])
+    if name.strip() in {"hsl", "hsla"}:
+        hue = (_hue_degrees(tokens[0]) % 360) / 360
+        r, g, b = colorsys.hls_to_rgb(hue, _unit_fraction(tokens[2]), _unit_fraction(tokens[1]))
+        return tuple(min(255, max(0, int(round(channel * 255)))) for channel in (r, g, b))
+    return None
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def _parse_color(color: str) -> Optional[RGBColor]:
+    rgb = None
     
     # Handle hex colors
     if color.startswith("#"):
         hex_value = color[1:]
-        # Expand shorthand hex (e.g., #f00 -> #ff0000)
-        if len(hex_value) == 3:
+        # Expand shorthand hex (e.g., #f00 -> #ff0000, #f00a -> #ff0000aa)
+        if len(hex_value) in {3, 4}:
             hex_value = "".join(ch * 2 for ch in hex_value)
-        
-        if len(hex_value) == 6:
+        # Fully transparent colors carry no visible color
+        if len(hex_value) == 8 and hex_value[6:] == "00":
+            return None
+        if len(hex_value) in {6, 8}:
             try:
-                r = int(hex_value[0:2], 16)
-                g = int(hex_value[2:4], 16)
-                b = int(hex_value[4:6], 16)
-                return RGBColor(r, g, b)
+                rgb = tuple(int(hex_value[i:i + 2], 16) for i in (0, 2, 4))
             except ValueError:
                 return None
     
-    # Handle rgb() colors
-    elif color.startswith("rgb"):
-        numbers = re.findall(r"[0-9]{1,3}", color)
-        if len(numbers) >= 3:
-            try:
-                r, g, b = (min(255, max(0, int(num))) for num in numbers[:3])
-                return RGBColor(r, g, b)
-            except ValueError:
-                return None
+    # Handle rgb()/rgba()/hsl()/hsla() colors
+    elif "(" in color:
+        try:
+            rgb = _parse_color_function(color)
+        except ValueError:
+            return None
     
-    return None
+    # Handle named colors
+    else:
+        rgb = CSS_NAMED_COLORS.get(color)
+    
+    return _intern_rgb(*rgb) if rgb else None
+
+
+def parse_color(value: Optional[str]) -> Optional[RGBColor]:
+    """
+    Parse color value from CSS string.
+    
+    Understands hex (3, 4, 6 or 8 digits), ``rgb()``/``rgba()``,
+    ``hsl()``/``hsla()`` and named CSS colors; alpha is ignored except that
+    fully transparent colors yield None. Results are memoized and equal
+    colors share one ``RGBColor`` instance, so treat it as immutable.
+    
+    Args:
+        value: Color string (e.g., '#ff0000', 'rgb(255, 0, 0)', 'red')
+        
+    Returns:
+        RGBColor object, or None if invalid format
+    """
+    if not value:
+        return None
+    return _parse_color(value.strip().lower())
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def _declared_run_styles(style: str) -> Tuple[bool, bool, bool, bool, Optional[RGBColor]]:
+    """Run formatting declared in a style attribute: bold, italic, underline, strike, color."""
+    declarations = parse_style_declarations(style)
+    font = declarations.get("font", "")
+    decoration = " ".join((
+        declarations.get("text-decoration", ""),
+        declarations.get("text-decoration-line", ""),
+    ))
+    return (
+        "bold" in declarations.get("font-weight", "") or "bold" in font,
+        "italic" in declarations.get("font-style", "") or "italic" in font,
+        "underline" in decoration,
+        "line-through" in decoration,
+        parse_color(declarations.get("color")),
+    )
 
 
 def collect_inline_styles(element) -> Dict[str, any]:
@@ -105,33 +253,22 @@ def collect_inline_styles(element) -> Dict[str, any]:
         styles["strike"] = True
     
     # Parse inline style attribute
-    style_attr = element.get("style", "")
-    for rule in style_attr.split(";"):
-        rule = rule.strip().lower()
-        if not rule:
-            continue
-        
-        if "bold" in rule:
-            styles["bold"] = True
-        if "italic" in rule:
-            styles["italic"] = True
-        if "underline" in rule:
-            styles["underline"] = True
-        if "line-through" in rule:
-            styles["strike"] = True
-        
-        if rule.startswith("color"):
-            parts = rule.split(":", 1)
-            if len(parts) == 2:
-                parsed = parse_color(parts[1])
-                if parsed:
-                    styles["color"] = parsed
+    style_attr = element.get("style")
+    if style_attr:
+        bold, italic, underline, strike, color = _declared_run_styles(style_attr)
+        styles["bold"] = styles["bold"] or bold
+        styles["italic"] = styles["italic"] or italic
+        styles["underline"] = styles["underline"] or underline
+        styles["strike"] = styles["strike"] or strike
+        if color:
+            styles["color"] = color
     
     # Check color attribute
     color_attr = element.get("color")
-    parsed_color = parse_color(color_attr)
-    if parsed_color:
-        styles["color"] = parsed_color
+    if color_attr:
+        parsed_color = parse_color(color_attr)
+        if parsed_color:
+            styles["color"] = parsed_color
     
     return styles
 
@@ -171,49 +308,19 @@ def parse_text_alignment(element) -> Optional[WD_PARAGRAPH_ALIGNMENT]:
     """
     # Check align attribute
     align_attr = (element.get("align") or "").lower()
-    if align_attr:
-        if align_attr == "left":
-            return WD_PARAGRAPH_ALIGNMENT.LEFT
-        elif align_attr == "center":
-            return WD_PARAGRAPH_ALIGNMENT.CENTER
-        elif align_attr == "right":
-            return WD_PARAGRAPH_ALIGNMENT.RIGHT
-        elif align_attr == "justify":
-            return WD_PARAGRAPH_ALIGNMENT.JUSTIFY
+    if align_attr in _ALIGNMENTS:
+        return _ALIGNMENTS[align_attr]
     
     # Check style attribute for text-align
-    style_attr = element.get("style", "")
-    for rule in style_attr.split(";"):
-        rule = rule.strip().lower()
-        if rule.startswith("text-align"):
-            parts = rule.split(":", 1)
-            if len(parts) == 2:
-                align_value = parts[1].strip()
-                if align_value == "left":
-                    return WD_PARAGRAPH_ALIGNMENT.LEFT
-                elif align_value == "center":
-                    return WD_PARAGRAPH_ALIGNMENT.CENTER
-                elif align_value == "right":
-                    return WD_PARAGRAPH_ALIGNMENT.RIGHT
-                elif align_value == "justify":
-                    return WD_PARAGRAPH_ALIGNMENT.JUSTIFY
-    
-    return None
+    text_align = parse_style_declarations(element.get("style")).get("text-align")
+    return _ALIGNMENTS.get(text_align) if text_align else None
 
 
 def _extract_css_value(style: str, property_name: str) -> Optional[str]:
     """
     Extract the last occurrence of a CSS property's value from an inline style string.
     """
-    if not style:
-        return None
-    pattern = rf"{re.escape(property_name)}\s*:\s*([^;]+)"
-    matches = list(re.finditer(pattern, style, re.IGNORECASE))
-    if not matches:
-        return None
-    raw_value = matches[-1].group(1)
-    normalized = raw_value.replace("!important", "").strip().lower()
-    return normalized or None
+    return parse_style_declarations(style).get(property_name)
 
 
 def _alignment_from_margins(left: Optional[str], right: Optional[str]) -> Optional[WD_PARAGRAPH_ALIGNMENT]:
@@ -0,0 +1,221 @@
+"""Streaming upload helpers with size limits and image verification."""
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Optional, Tuple
+
+from fastapi import HTTPException
+from PIL import Image, UnidentifiedImageError
+from starlette.concurrency import run_in_threadpool
+
+from app.utils.image_variants import variant_base_stem
+
+
+# Pillow format name -> file extension for accepted image uploads
+ALLOWED_IMAGE_FORMATS = {
+    "PNG": "png",
+    "JPEG": "jpg",
+    "GIF": "gif",
+    "BMP": "bmp",
+    "WEBP": "webp",
+}
+
+PARTIAL_SUFFIX = ".part"
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Upload exceeds the maximum size of {max_bytes} bytes",
+    )
+
+
+async def stream_to_temp_file(
+    chunks: AsyncIterator[bytes],
+    target_dir: Path,
+    max_bytes: int,
+) -> Tuple[Path, int]:
+    """
+    Write an async byte stream to a temp file, enforcing a size limit.
+
+    The limit is checked as data arrives, so oversized uploads are rejected
+    without ever being fully buffered or written to disk.
+
+    Args:
+        chunks: Async iterator of byte chunks
+        target_dir: Directory for the temp file (same filesystem as the final file)
+        max_bytes: Maximum accepted size in bytes
+
+    Returns:
+        Tuple of (temp file path, bytes written)
+
+    Raises:
+        HTTPException: 413 if the stream exceeds max_bytes
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=str(target_dir), suffix=PARTIAL_SUFFIX)
+    tmp_path = Path(tmp_name)
+    written = 0
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                written += len(chunk)
+                if written > max_bytes:
+                    raise _too_large(max_bytes)
+                await run_in_threadpool(handle.write, chunk)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return tmp_path, written
+
+
+async def iter_upload_file(upload, chunk_size: int) -> AsyncIterator[bytes]:
+    """Yield an ``UploadFile`` in fixed-size chunks."""
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def append_stream_to_file(
+    chunks: AsyncIterator[bytes],
+    path: Path,
+    max_bytes: int,
+) -> int:
+    """
+    Append an async byte stream to a partial file, enforcing a size limit.
+
+    Args:
+        chunks: Async iterator of byte chunks
+        path: Partial file to append to
+        max_bytes: Maximum total size of the file in bytes
+
+    Returns:
+        New total size of the file
+
+    Raises:
+        HTTPException: 413 if the file would exceed max_bytes
+    """
+    size = path.stat().st_size if path.exists() else 0
+    with path.open("ab") as handle:
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            if size + len(chunk) > max_bytes:
+                handle.truncate(size)
+                raise _too_large(max_bytes)
+            await run_in_threadpool(handle.write, chunk)
+            size += len(chunk)
+    return size
+
+
+def _image_format(path: Path, verify: bool) -> Optional[str]:
+    try:
+        with Image.open(path) as image:
+            image_format = image.format
+            if verify:
+                image.verify()
+    except (UnidentifiedImageError, OSError, SyntaxError, ValueError, Image.DecompressionBombError):
+        return None
+    return image_format if image_format in ALLOWED_IMAGE_FORMATS else None
+
+
+def sniff_image_format(path: Path) -> Optional[str]:
+    """
+    Identify and verify an image file by its header using Pillow.
+
+    The client-supplied content type is never trusted; only formats in
+    ALLOWED_IMAGE_FORMATS are accepted.
+
+    Args:
+        path: Image file path
+
+    Returns:
+        File extension for the detected format, or None if invalid
+    """
+    image_format = _image_format(path, verify=True)
+    return ALLOWED_IMAGE_FORMATS[image_format] if image_format else None
+
+
+def image_media_type(path: Path) -> Optional[str]:
+    """
+    Media type of a stored image, read from its header only.
+
+    Args:
+        path: Image file path (already verified on upload)
+
+    Returns:
+        Media type such as ``image/png``, or None if not an allowed image
+    """
+    image_format = _image_format(path, verify=False)
+    return Image.MIME.get(image_format) if image_format else None
+
+
+async def commit_image_upload(tmp_path: Path, target_dir: Path, stem: str) -> Path:
+    """
+    Verify a received image and atomically move it into place.
+
+    Args:
+        tmp_path: Fully received temp file
+        target_dir: Destination directory
+        stem: Filename stem for the stored image
+
+    Returns:
+        Final image path
+
+    Raises:
+        HTTPException: 400 if the file is not a supported image
+    """
+    extension = await run_in_threadpool(sniff_image_format, tmp_path)
+    if not extension:
+        tmp_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=400, detail="Only image files are allowed")
+
+    final_path = target_dir / f"{stem}.{extension}"
+    await run_in_threadpool(os.replace, tmp_path, final_path)
+    return final_path
+
+
+def remove_files_except(directory: Path, keep: Path) -> None:
+    """
+    Delete previous uploads in a directory except ``keep`` and its variants.
+
+    In-flight temp files (``*.part`` and dot-prefixed variant temp files)
+    and subdirectories are left alone so concurrent or resumable uploads
+    and variant generation are not disturbed.
+    """
+    keep_stem = variant_base_stem(keep)
+    for existing in directory.glob("*"):
+        if not existing.is_file() or existing.suffix == PARTIAL_SUFFIX or existing.name.startswith("."):
+            continue
+        if variant_base_stem(existing) != keep_stem:
+            existing.unlink(missing_ok=True)
+
+
+def remove_stale_files(groups: Iterable[Tuple[Path, ...]], max_age_seconds: float) -> int:
+    """
+    Delete groups of files none of which was modified within ``max_age_seconds``.
+
+    A group (e.g. an upload session's metadata and partial file) counts as
+    active while any of its files is recent, and is deleted as a whole.
+
+    Returns:
+        Number of groups deleted
+    """
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for paths in groups:
+        modified = []
+        for path in paths:
+            try:
+                modified.append(path.stat().st_mtime)
+            except OSError:
+                continue
+        if modified and max(modified) < cutoff:
+            for path in paths:
+                path.unlink(missing_ok=True)
+            removed += 1
+    return removed
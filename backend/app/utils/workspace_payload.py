@@ -0,0 +1,550 @@
+"""Build preview request payloads from a stored document workspace state.
+
+Mirrors the frontend payload builders (``useCoverPreview.ts`` and
+``previewPayload.ts``) so previews can be rendered from a server-side
+workspace without the client resending the whole state.
+"""
+from html import escape
+from typing import Any, Dict, List, Optional
+
+from app.utils.html_text import html_to_text
+
+
+REGULATORY_PRIMARY_REFERENCES = [
+    "Regulation (EU) 2024/2847 - Cyber Resilience Act (CRA)",
+    "Annex I Part I (1) - General design, development, and production requirements",
+    "Annex I Part I (2) - Specific cybersecurity requirements",
+    "Annex I Part II - Vulnerability handling requirements",
+]
+
+CONFORMANCE_LEVEL_OPTIONS = [
+    ("full", "Full Conformance"),
+    ("partial", "Partial Conformance"),
+    ("non", "Non-Conformance"),
+]
+
+
+def _section(state: Any, key: str) -> Dict[str, Any]:
+    value = state.get(key) if isinstance(state, dict) else None
+    return value if isinstance(value, dict) else {}
+
+
+def _list(state: Dict[str, Any], key: str) -> List[Any]:
+    value = state.get(key)
+    return value if isinstance(value, list) else []
+
+
+def strip_html(value: Optional[str]) -> str:
+    """Remove HTML tags, decode entities and collapse whitespace."""
+    return html_to_text(value)
+
+
+def normalize_html(value: Optional[str]) -> Optional[str]:
+    """Return trimmed HTML, or None when it has no visible text."""
+    if not value or not isinstance(value, str):
+        return None
+    trimmed = value.strip()
+    if not trimmed:
+        return None
+    return trimmed if strip_html(trimmed) else None
+
+
+def normalize_plain_text(value: Optional[str]) -> Optional[str]:
+    """Return trimmed text, or None when empty."""
+    if not value or not isinstance(value, str):
+        return None
+    trimmed = value.strip()
+    return trimmed or None
+
+
+def build_regulatory_html(state: Dict[str, Any]) -> str:
+    """Build the regulatory conformance HTML block (section 3.2)."""
+    base_list = "".join(f"<li>{escape(item)}</li>" for item in REGULATORY_PRIMARY_REFERENCES)
+    other_entries = []
+    for entry in _list(state, "additionalRegulations"):
+        if not isinstance(entry, dict):
+            continue
+        regulation = (entry.get("regulation") or "").strip()
+        description = (entry.get("description") or "").strip()
+        if not regulation and not description:
+            continue
+        label = f"<strong>{escape(regulation)}</strong>" if regulation else ""
+        detail = f"{' — ' if regulation else ''}{escape(description)}" if description else ""
+        content = f"{label}{detail}" if label else (detail or "—")
+        other_entries.append(f"<li>{content}</li>")
+    other_section = (
+        f"<p>Other Applicable Regulations:</p><ul>{''.join(other_entries)}</ul>" if other_entries else ""
+    )
+    return (
+        "<p>[Reference: Annex C - Relationship with CRA]</p>\n"
+        "<p>This product is intended to conform to the essential cybersecurity requirements of:</p>\n"
+        f"<ul>{base_list}</ul>\n"
+        f"{other_section}"
+    )
+
+
+def build_conformance_level_html(state: Dict[str, Any]) -> str:
+    """Build the conformance level HTML block (section 3.3)."""
+    statuses = _list(state, "statuses")
+    status_line = " ".join(
+        f"{'☑' if value in statuses else '☐'} {label}" for value, label in CONFORMANCE_LEVEL_OPTIONS
+    )
+    justification_html = state.get("justificationHtml") or ""
+    justification_block = (
+        justification_html if justification_html.strip() else "<p>[Explain which requirements are not met and why]</p>"
+    )
+    return (
+        "<p><strong>Overall Conformance Status:</strong></p>\n"
+        f"<p>{status_line}</p>\n"
+        "<p><strong>Justification for Partial Conformance (if applicable):</strong></p>\n"
+        f"{justification_block}"
+    )
+
+
+def normalize_evidence_payload(entries: Any) -> List[dict]:
+    """Normalize workspace evidence entries into ``RiskEvidenceEntry`` dicts."""
+    normalized = []
+    for entry in entries or []:
+        if not isinstance(entry, dict):
+            continue
+        reference = normalize_plain_text(entry.get("referenceId"))
+        title = normalize_plain_text(entry.get("title"))
+        notes_html = normalize_html(entry.get("descriptionHtml"))
+        if not reference and not title and not notes_html:
+            continue
+        normalized.append(
+            {
+                "section_key": entry.get("sectionKey") or "risk-product-context",
+                "reference_id": reference,
+                "title": title,
+                "status": entry.get("status"),
+                "notes_html": notes_html,
+            }
+        )
+    return normalized
+
+
+def _assessment_has_content(state: Dict[str, Any]) -> bool:
+    if not state:
+        return False
+    has_assessments = any(
+        isinstance(a, dict)
+        and (a.get("status") != "not_assessed" or a.get("evidenceId") or a.get("commentsHtml"))
+        for a in _list(state, "assessments")
+    )
+    verdict = state.get("overallVerdict")
+    has_verdict = bool(verdict and verdict != "not_assessed")
+    has_summary = bool(normalize_html(state.get("summaryOfFindingsHtml")))
+    has_non_conformities = bool(_list(state, "nonConformities"))
+    return has_assessments or has_verdict or has_summary or has_non_conformities
+
+
+def _normalize_assessment_entries(entries: List[Any]) -> List[dict]:
+    return [
+        {
+            "id": entry.get("id") or "",
+            "evidence_id": entry.get("evidenceId") or "",
+            "evidence_ref_id": entry.get("evidenceRefId") or "",
+            "status": entry.get("status") or "not_assessed",
+            "comments_html": normalize_html(entry.get("commentsHtml")) or "",
+        }
+        for entry in entries
+        if isinstance(entry, dict)
+    ]
+
+
+def _normalize_non_conformity_entries(entries: List[Any]) -> List[dict]:
+    return [
+        {
+            "id": entry.get("id") or "",
+            "requirement_id": entry.get("requirementId") or "",
+            "description": normalize_plain_text(entry.get("description")) or "",
+            "severity": entry.get("severity") or "minor",
+            "corrective_action": normalize_plain_text(entry.get("correctiveAction")) or "",
+        }
+        for entry in entries
+        if isinstance(entry, dict) and (entry.get("id") or entry.get("requirementId") or entry.get("description"))
+    ]
+
+
+def _assessment_payload(state: Dict[str, Any]) -> dict:
+    return {
+        "assessments": _normalize_assessment_entries(_list(state, "assessments")),
+        "overall_verdict": state.get("overallVerdict") or "not_assessed",
+        "summary_of_findings_html": normalize_html(state.get("summaryOfFindingsHtml")) or "",
+        "non_conformities": _normalize_non_conformity_entries(_list(state, "nonConformities")),
+    }
+
+
+def _html_fields(state: Dict[str, Any], mapping: Dict[str, str]) -> Dict[str, Optional[str]]:
+    return {target: normalize_html(state.get(source)) for target, source in mapping.items()}
+
+
+def build_risk_management_payload(state: Dict[str, Any]) -> Optional[dict]:
+    """
+    Build the ``RiskManagementSection`` payload from workspace state.
+
+    Args:
+        state: ``riskManagement`` workspace section
+
+    Returns:
+        Payload dict, or None when no subsection has content
+    """
+    if not state:
+        return None
+
+    payload: Dict[str, Any] = {}
+
+    general_html = normalize_html(state.get("generalApproachHtml"))
+    if general_html:
+        payload["general_approach_html"] = general_html
+
+    html_sections = {
+        "product_context": ("productContext", {
+            "intended_purpose_html": "intendedPurposeHtml",
+            "specific_intended_uses_html": "specificIntendedUsesHtml",
+            "foreseeable_use_html": "foreseeableUseHtml",
+        }),
+        "product_function": ("productFunction", {
+            "primary_functions_html": "primaryFunctionsHtml",
+            "security_functions_html": "securityFunctionsHtml",
+        }),
+        "operational_environment": ("operationalEnvironment", {
+            "physical_environment_html": "physicalEnvironmentHtml",
+            "network_environment_html": "networkEnvironmentHtml",
+            "system_environment_html": "systemEnvironmentHtml",
+            "operational_constraints_html": "operationalConstraintsHtml",
+            "rdps_environment_html": "rdpsEnvironmentHtml",
+        }),
+        "risk_assessment_methodology": ("riskAssessmentMethodology", {
+            "methodology_description_html": "methodologyDescriptionHtml",
+            "justification_html": "justificationHtml",
+            "consistent_application_html": "consistentApplicationHtml",
+            "individual_aggregate_risk_html": "individualAggregateRiskHtml",
+        }),
+        "risk_acceptance_criteria": ("riskAcceptanceCriteria", {
+            "risk_acceptance_criteria_html": "riskAcceptanceCriteriaHtml",
+            "regulatory_factors_html": "regulatoryFactorsHtml",
+            "contractual_factors_html": "contractualFactorsHtml",
+            "nature_of_known_risks_html": "natureOfKnownRisksHtml",
+            "nature_of_users_html": "natureOfUsersHtml",
+            "nature_of_product_html": "natureOfProductHtml",
+            "state_of_the_art_html": "stateOfTheArtHtml",
+        }),
+    }
+    for target_key, (source_key, mapping) in html_sections.items():
+        section_state = _section(state, source_key)
+        fields = _html_fields(section_state, mapping)
+        evidence = normalize_evidence_payload(section_state.get("evidenceEntries"))
+        if any(fields.values()) or evidence:
+            payload[target_key] = {**fields, "evidence_entries": evidence}
+
+    architecture = _section(state, "productArchitecture")
+    arch_fields = _html_fields(architecture, {
+        "architecture_description_html": "architectureDescriptionHtml",
+        "architecture_diagram_html": "architectureDiagramHtml",
+    })
+    hardware = [c for c in _list(architecture, "hardwareComponents") if isinstance(c, dict)]
+    software = [c for c in _list(architecture, "softwareComponents") if isinstance(c, dict)]
+    rdps = [c for c in _list(architecture, "rdpsComponents") if isinstance(c, dict)]
+    interfaces = [c for c in _list(architecture, "componentInterfaces") if isinstance(c, dict)]
+    arch_evidence = normalize_evidence_payload(architecture.get("evidenceEntries"))
+    if any(arch_fields.values()) or hardware or software or rdps or interfaces or arch_evidence:
+        payload["product_architecture"] = {
+            **arch_fields,
+            "no_hardware_components": bool(architecture.get("noHardwareComponents")),
+            "hardware_components": [
+                {
+                    "component_name": c.get("componentName"),
+                    "function": c.get("function"),
+                    "interfaces": c.get("interfaces"),
+                    "security_functions": c.get("securityFunctions"),
+                }
+                for c in hardware
+            ],
+            "software_components": [
+                {
+                    "type": c.get("type"),
+                    "function": c.get("function"),
+                    "third_party": bool(c.get("thirdParty")),
+                    "interfaces": c.get("interfaces"),
+                    "security_functions": c.get("securityFunctions"),
+                }
+                for c in software
+            ],
+            "no_rdps_components": bool(architecture.get("noRdpsComponents")),
+            "rdps_components": [
+                {
+                    "component": c.get("component"),
+                    "provider": c.get("provider"),
+                    "function": c.get("function"),
+                    "location": c.get("location"),
+                    "development_responsibility": c.get("developmentResponsibility"),
+                    "operation_responsibility": c.get("operationResponsibility"),
+                }
+                for c in rdps
+            ],
+            "component_interfaces": [
+                {
+                    "interface": c.get("interface"),
+                    "component_a": c.get("componentA"),
+                    "component_b": c.get("componentB"),
+                    "protocol": c.get("protocol"),
+                    "authentication": c.get("authentication"),
+                    "data_exchanged": c.get("dataExchanged"),
+                }
+                for c in interfaces
+            ],
+            "evidence_entries": arch_evidence,
+        }
+
+    user_description = _section(state, "productUserDescription")
+    user_fields = _html_fields(user_description, {
+        "user_description_html": "userDescriptionHtml",
+        "rdps_considerations_html": "rdpsConsiderationsHtml",
+    })
+    no_rdps = bool(user_description.get("noRdps"))
+    user_evidence = normalize_evidence_payload(user_description.get("evidenceEntries"))
+    if any(user_fields.values()) or no_rdps or user_evidence:
+        payload["product_user_description"] = {
+            **user_fields,
+            "no_rdps": no_rdps,
+            "evidence_entries": user_evidence,
+        }
+
+    for target_key, source_key in (
+        ("product_context_assessment", "productContextAssessment"),
+        ("risk_acceptance_criteria_assessment", "riskAcceptanceCriteriaAssessment"),
+    ):
+        section_state = _section(state, source_key)
+        if _assessment_has_content(section_state):
+            payload[target_key] = _assessment_payload(section_state)
+
+    return payload or None
+
+
+def _normalize_standard_entry(entry: Any) -> Optional[dict]:
+    if not isinstance(entry, dict):
+        return None
+    code = normalize_plain_text(entry.get("code"))
+    description = normalize_plain_text(entry.get("description"))
+    if not code and not description:
+        return None
+    normalized = {}
+    if code:
+        normalized["code"] = code
+    if description:
+        normalized["description"] = description
+    return normalized
+
+
+def build_cover_preview_payload(state: Dict[str, Any], user_id: str) -> dict:
+    """
+    Build a ``CoverPreviewRequest`` payload from a workspace state.
+
+    Args:
+        state: Workspace state (the ``state`` object of a workspace export)
+        user_id: User identifier used for the preview output directory
+
+    Returns:
+        Payload dict ready for ``CoverPreviewRequest.model_validate``
+    """
+    cover = _section(state, "cover")
+    introduction = _section(state, "introduction")
+    purpose_scope = _section(state, "purposeScope")
+    product_identification = _section(state, "productIdentification")
+    product_overview = _section(state, "productOverview")
+    manufacturer_information = _section(state, "manufacturerInformation")
+    conformance_claim = _section(state, "conformanceClaim")
+    document_convention = _section(state, "documentConvention")
+    normalize = normalize_plain_text
+
+    product_title = normalize(introduction.get("productName")) or normalize(cover.get("deviceName")) or "CRA Documentation"
+
+    third_party = _section(product_overview, "thirdPartyComponents")
+    third_party_entries = []
+    for entry in _list(third_party, "entries"):
+        if not isinstance(entry, dict):
+            continue
+        normalized_entry = {
+            "component_name": normalize(entry.get("componentName")),
+            "component_type": normalize(entry.get("componentType")),
+            "version": normalize(entry.get("version")),
+            "supplier": normalize(entry.get("supplier")),
+            "purpose": normalize(entry.get("purpose")),
+            "license": normalize(entry.get("license")),
+        }
+        if any(normalized_entry.values()):
+            third_party_entries.append(normalized_entry)
+
+    standards_state = _section(conformance_claim, "standardsConformance")
+    primary_standard = _normalize_standard_entry(standards_state.get("primaryStandard"))
+    related_standards = [
+        normalized
+        for normalized in (_normalize_standard_entry(e) for e in _list(standards_state, "relatedStandards"))
+        if normalized
+    ]
+    other_notes = normalize(standards_state.get("otherNotes"))
+    include_other = bool(standards_state.get("includeOther") and other_notes)
+    standards_payload = None
+    if primary_standard or related_standards or include_other:
+        standards_payload = {
+            "related_standards": related_standards,
+            "include_other": include_other,
+            "other_notes": other_notes if include_other else None,
+        }
+        if primary_standard:
+            standards_payload["primary_standard"] = primary_standard
+
+    regulatory_html = normalize_html(build_regulatory_html(_section(conformance_claim, "regulatoryConformance")))
+    conformance_level_html = normalize_html(
+        build_conformance_level_html(_section(conformance_claim, "conformanceLevel"))
+    )
+    conformance_payload = None
+    if standards_payload or regulatory_html or conformance_level_html:
+        conformance_payload = {
+            "standards_conformance": standards_payload,
+            "regulatory_conformance_html": regulatory_html,
+            "conformance_level_html": conformance_level_html,
+        }
+
+    terminology_entries = []
+    for entry in _list(document_convention, "terminologyEntries"):
+        if not isinstance(entry, dict):
+            continue
+        normalized_entry = {
+            "term": normalize(entry.get("term")),
+            "definition": normalize(entry.get("definition")),
+            "reference": normalize(entry.get("reference")),
+        }
+        if any(normalized_entry.values()):
+            terminology_entries.append(normalized_entry)
+
+    methodology_html = normalize_html(purpose_scope.get("methodologyHtml"))
+    manufacturer_block = "\n".join(
+        value for value in (normalize(cover.get("labName")), normalize(cover.get("labAddress"))) if value
+    )
+    image_path = cover.get("imagePath")
+    if not (
+        isinstance(image_path, str)
+        and (image_path.startswith(f"/cover/uploads/{user_id}/") or image_path.startswith("asset://"))
+    ):
+        image_path = None
+
+    payload = {
+        "user_id": user_id,
+        "title": product_title,
+        "description": cover.get("deviceDescription"),
+        "version": cover.get("versionNumber"),
+        "revision": cover.get("revisionDate"),
+        "manufacturer": manufacturer_block or None,
+        "date": cover.get("revisionDate"),
+        "image_path": image_path,
+        "introduction": {
+            "product_name": normalize(introduction.get("productName")),
+            "product_version": normalize(introduction.get("productVersion")),
+            "product_type": normalize(introduction.get("productType")),
+            "manufacturer": normalize(introduction.get("manufacturerName")),
+            "manufacturer_address": normalize(introduction.get("manufacturerAddress")),
+            "status": normalize(introduction.get("status")),
+            "prepared_by": normalize(introduction.get("preparedBy")),
+            "reviewed_by": normalize(introduction.get("reviewedBy")),
+            "approved_by": normalize(introduction.get("approvedBy")),
+        },
+        "purpose_scope": {
+            "product_name": product_title,
+            "scope_selections": [s for s in _list(purpose_scope, "scopeSelections") if isinstance(s, str)],
+            "assessment_start": normalize(purpose_scope.get("assessmentStart")),
+            "assessment_end": normalize(purpose_scope.get("assessmentEnd")),
+            "methodology_html": methodology_html,
+        },
+        "product_identification": {
+            "product_description_html": normalize_html(product_identification.get("productDescriptionHtml")),
+            "key_functions_html": normalize_html(product_identification.get("keyFunctionsHtml")),
+            "target_market": normalize(product_identification.get("targetMarket")),
+        },
+        "product_overview": {
+            "product_description_html": normalize_html(product_overview.get("productDescriptionHtml")),
+            "product_architecture_html": normalize_html(product_overview.get("productArchitectureHtml")),
+            "third_party_components": {
+                "entries": third_party_entries,
+                "sbom_id": normalize(third_party.get("sbomId")),
+                "management_approach_html": normalize_html(third_party.get("managementApproachHtml")),
+                "evidence_reference_html": normalize_html(third_party.get("evidenceReferenceHtml")),
+            },
+        },
+        "manufacturer_information": {
+            "legal_entity": normalize(manufacturer_information.get("legalEntity")),
+            "registration_number": normalize(manufacturer_information.get("registrationNumber")),
+            "address": normalize(manufacturer_information.get("address")),
+            "contact_person": normalize(manufacturer_information.get("contactPerson")),
+            "phone": normalize(manufacturer_information.get("phone")),
+        },
+        "conformance_claim": conformance_payload,
+        "document_convention": {
+            "terminology_entries": terminology_entries,
+            "evidence_notation_html": normalize_html(document_convention.get("evidenceNotationHtml")),
+            "requirement_notation_html": normalize_html(document_convention.get("requirementNotationHtml")),
+            "assessment_verdicts_html": normalize_html(document_convention.get("assessmentVerdictsHtml")),
+        },
+    }
+
+    risk_management = build_risk_management_payload(_section(state, "riskManagement"))
+    if risk_management:
+        payload["risk_management"] = risk_management
+
+    return payload
+
+
+_COVER_DATA_KEYS = ("title", "description", "version", "revision", "manufacturer", "date", "image_path")
+
+
+def _document_intro_payload(state: Dict[str, Any], user_id: str) -> dict:
+    cover_payload = build_cover_preview_payload(state, user_id)
+    return {
+        "user_id": user_id,
+        "cover_data": {key: cover_payload[key] for key in _COVER_DATA_KEYS},
+        "toe_overview_html": normalize_html(_section(state, "productOverview").get("productDescriptionHtml")),
+        "toe_description_html": normalize_html(
+            _section(state, "productIdentification").get("productDescriptionHtml")
+        ),
+    }
+
+
+def build_st_intro_preview_payload(state: Dict[str, Any], user_id: str) -> dict:
+    """
+    Build a ``STIntroPreviewRequest`` payload from a workspace state.
+
+    The workspace has no ST/TOE reference sections; the cover fields and
+    the product overview/description stand in for them.
+
+    Args:
+        state: Workspace state (the ``state`` object of a workspace export)
+        user_id: User identifier used for the preview output directory
+
+    Returns:
+        Payload dict ready for ``STIntroPreviewRequest.model_validate``
+    """
+    return _document_intro_payload(state, user_id)
+
+
+def build_final_preview_payload(state: Dict[str, Any], user_id: str) -> dict:
+    """
+    Build a ``FinalPreviewRequest`` payload from a workspace state.
+
+    Only the sections kept in the workspace are filled in: cover,
+    product overview/description and risk management. Requirement and
+    legacy Common Criteria sections are not part of the workspace state.
+
+    Args:
+        state: Workspace state (the ``state`` object of a workspace export)
+        user_id: User identifier used for the preview output directory
+
+    Returns:
+        Payload dict ready for ``FinalPreviewRequest.model_validate``
+    """
+    payload = _document_intro_payload(state, user_id)
+    risk_management = build_risk_management_payload(_section(state, "riskManagement"))
+    if risk_management:
+        payload["risk_management"] = risk_management
+    return payload
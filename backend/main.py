@@ -5,7 +5,11 @@ from tinydb import TinyDB
 from typing import List, Optional
 
 # Import new routes
-from app.routes import health, preview, cover, components
+from app.routes import health, preview, cover, components, workspace, assets, sbom, catalogue
+from app.database import engine
+from app import models  # noqa: F401 - register ORM models before create_all
+from app.utils.catalogue_snapshot import ensure_catalogue_snapshot
+from app.utils.catalogue_storage import ensure_catalogue_storage
 
 app = FastAPI()
 
@@ -23,6 +27,16 @@ app.include_router(health.router, prefix="/api", tags=["health"])
 app.include_router(preview.router, prefix="/api/preview", tags=["preview"])
 app.include_router(cover.router, prefix="/api/cover", tags=["cover"])
 app.include_router(components.router, prefix="/api", tags=["components"])
+app.include_router(workspace.router, prefix="/api", tags=["workspace"])
+app.include_router(assets.router, prefix="/api", tags=["assets"])
+app.include_router(sbom.router, prefix="/api", tags=["sbom"])
+app.include_router(catalogue.router, prefix="/api", tags=["catalogue"])
+
+# Create any missing SQLAlchemy tables (e.g. document_workspaces); former
+# per-family catalogue tables (fau_db …) become views of catalogue_requirements.
+# Runs under a database lock, so concurrently starting workers do not race.
+ensure_catalogue_storage(engine)
+ensure_catalogue_snapshot()
 
 # Database setup
 db = TinyDB('db.json')